@@ -118,101 +118,61 @@ module load qe-7.3 > /dev/null
 # Enable python Virtual Environment
 source ~/venv/bin/activate
 
+# Checkpoint file: a re-run resumes at the first stage that did not complete
+state_file="$output_dir/Si.state.json"
+
+# Timing and resource records of every generator call and QE run (see telemetry.py)
+export PWTK_TELEMETRY="$(realpath $output_dir)/telemetry.jsonl"
+
 # Record start time
 start_time=$(date +%s)
 
 vcrelax () {
-    cp $poscar_filename $subdir_vcrelax/Si.vcrelax_1_in.poscar
+    # Repeat vc-relax passes until the cell has converged (at most max_step passes)
     start_step1=$(date +%s)
     max_step=5
-    step=1
-    while [ $step -le $max_step ]; do
-        # Prepare input files for QE vcrelax calculations
-        python poscar2pwi.py --poscar  $subdir_vcrelax/Si.vcrelax_${step}_in.poscar --template $vcrelax_template --pwi $subdir_vcrelax/Si.vcrelax_${step}.in > /dev/null
-        mpirun -np 4 pw.x < $subdir_vcrelax/Si.vcrelax_${step}.in > $subdir_vcrelax/Si.vcrelax_${step}.out &
-        run_pid=$!
-        echo -n "Step # 1: Running QE vcrelax (pid: $run_pid) sub step: ${step} ... "
-        wait "$run_pid"
-        end_step1=$(date +%s)
-        time_spent_step=$((end_step1 - start_step1))
-        echo "Done (time spent so far: $time_spent_step seconds)"
-        python pwo2poscar.py --pwo $subdir_vcrelax/Si.vcrelax_${step}.out --poscar $subdir_vcrelax/Si.vcrelax_${step}_out.poscar > /dev/null
-        prev=$step
-        step=$((step + 1))
-        cp $subdir_vcrelax/Si.vcrelax_${prev}_out.poscar $subdir_vcrelax/Si.vcrelax_${step}_in.poscar
-    done
-}
-
-bands () {
-    cp $subdir_vcrelax/Si.vcrelax_${max_step}_out.poscar $subdir_bands/Si.scf.poscar
-
-    python gen_bands.py --poscar $subdir_bands/Si.scf.poscar \
-    --template $scf_template \
-    --scf $subdir_bands/Si.scf.in \
-    --nscf $subdir_bands/Si.nscf.in \
-    --bands $subdir_bands/Si.bands.in \
-    --bands-data $subdir_bands/Si.bands.dat > /dev/null
-
-    mpirun -np 4 pw.x < $subdir_bands/Si.scf.in > $subdir_bands/Si.scf.out &
-    run_pid=$!
-    echo -n "Step # 2: Running QE SCF (pid: $run_pid) sub step 1 ... "
-    wait "$run_pid"
-    end_step2=$(date +%s)
-    time_spent_step=$((end_step2 - start_step1))
-    echo "Done (time spent so far: $time_spent_step seconds)"
-
-    mpirun -np 4 pw.x < $subdir_bands/Si.nscf.in > $subdir_bands/Si.nscf.out &
-    run_pid=$!
-    echo -n "Step # 2: Running QE NSCF (pid: $run_pid) sub step 2 ... "
-    wait "$run_pid"
-    end_step2=$(date +%s)
-    time_spent_step=$((end_step2 - start_step1))
+    echo -n "Step # 1: Running QE vcrelax (at most $max_step passes) ... "
+    python relax.py --poscar $poscar_filename \
+    --template $vcrelax_template \
+    --output-dir $subdir_vcrelax \
+    --system-name Si \
+    --max-steps $max_step \
+    --state $state_file --plan > $subdir_vcrelax/relax.log
+    end_step1=$(date +%s)
+    time_spent_step=$((end_step1 - start_step1))
     echo "Done (time spent so far: $time_spent_step seconds)"
+    grep "^Step #" $subdir_vcrelax/relax.log
+    relaxed_poscar=$(grep "Relaxed POSCAR file" $subdir_vcrelax/relax.log | gawk -F': ' '{print $2}')
+}
 
-    mpirun -np 4 bands.x < $subdir_bands/Si.bands.in > $subdir_bands/Si.bands.out &
-    run_pid=$!
-    echo -n "Step # 2: Running QE BANDS (pid: $run_pid) sub step 3 ... "
-    wait "$run_pid"
+run_post_step () {
+    # Usage: run_post_step <binary> <input> <output> <label> <sub step> [<sub step it depends on>]
+    # Runs already completed with the same input are skipped (see state.py)
+    echo -n "Step # 2: Running QE $4 sub step $5 ... "
+    python state.py --state $state_file --run "post_$5" \
+    --binary $1 --input $2 --output $3 --cores 4 --plan \
+    --depends ${6:+post_$6} > /dev/null
     end_step2=$(date +%s)
     time_spent_step=$((end_step2 - start_step1))
     echo "Done (time spent so far: $time_spent_step seconds)"
 }
 
-dos () {
-    cp $subdir_vcrelax/Si.vcrelax_${max_step}_out.poscar $subdir_dos/Si.scf.poscar
+post () {
+    # One SCF run whose charge density is shared by the BANDS, DOS and PDOS runs
+    cp $relaxed_poscar $subdir_scf/Si.scf.poscar
 
-    python gen_dos.py --poscar $subdir_dos/Si.scf.poscar \
+    python gen_post.py --poscar $subdir_scf/Si.scf.poscar \
     --template $scf_template \
-    --scf $subdir_dos/Si.scf.in \
-    --nscf $subdir_dos/Si.nscf.in \
-    --dos $subdir_dos/Si.dos.in \
-    --dos-data $subdir_dos/Si.dos.dat > /dev/null
-
-    mpirun -np 4 pw.x < $subdir_dos/Si.scf.in > $subdir_dos/Si.scf.out &
-    run_pid=$!
-    echo -n "Step # 2: Running QE SCF (pid: $run_pid) sub step 1 ... "
-    wait "$run_pid"
-    end_step2=$(date +%s)
-    time_spent_step=$((end_step2 - start_step1))
-    echo "Done (time spent so far: $time_spent_step seconds)"
-
-    mpirun -np 4 pw.x < $subdir_dos/Si.nscf.in > $subdir_dos/Si.nscf.out &
-    run_pid=$!
-    echo -n "Step # 2: Running QE NSCF (pid: $run_pid) sub step 2 ... "
-    wait "$run_pid"
-    end_step2=$(date +%s)
-    time_spent_step=$((end_step2 - start_step1))
-    echo "Done (time spent so far: $time_spent_step seconds)"
-
-    mpirun -np 4 dos.x < $subdir_dos/Si.dos.in > $subdir_dos/Si.dos.out &
-    run_pid=$!
-    echo -n "Step # 2: Running QE DOS (pid: $run_pid) sub step 3 ... "
-    wait "$run_pid"
-    end_step2=$(date +%s)
-    time_spent_step=$((end_step2 - start_step1))
-    echo "Done (time spent so far: $time_spent_step seconds)"
+    --system-name Si \
+    --output-dir $subdir_scf > /dev/null
+
+    run_post_step pw.x $subdir_scf/Si.scf.in $subdir_scf/Si.scf.out SCF 1
+    run_post_step pw.x $subdir_scf/Si.bands_nscf.in $subdir_scf/Si.bands_nscf.out "NSCF (bands)" 2 1
+    run_post_step bands.x $subdir_scf/Si.bands.in $subdir_scf/Si.bands.out BANDS 3 2
+    run_post_step pw.x $subdir_scf/Si.nscf.in $subdir_scf/Si.nscf.out "NSCF (dos/pdos)" 4 3
+    run_post_step dos.x $subdir_scf/Si.dos.in $subdir_scf/Si.dos.out DOS 5 4
+    run_post_step projwfc.x $subdir_scf/Si.pdos.in $subdir_scf/Si.pdos.out PDOS 6 4
 }
 # step:1
 vcrelax
-bands
-dos
+post
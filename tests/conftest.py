@@ -0,0 +1,96 @@
+###########################################################################
+# Shared pytest setup: the utils/ scripts import each other as top-level
+# modules, so the tests put utils/ on sys.path the way the scripts run.
+###########################################################################
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UTILS_DIR = os.path.join(ROOT_DIR, 'utils')
+POSCARS_DIR = os.path.join(ROOT_DIR, 'assets', 'POSCARS')
+
+sys.path.insert(0, UTILS_DIR)
+
+
+@pytest.fixture
+def poscar(tmp_path):
+    """
+    Write a POSCAR file from its text and return its path.
+    """
+    def write(text, name='POSCAR'):
+        path = tmp_path / name
+        path.write_text(text)
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def si_prim():
+    return os.path.join(POSCARS_DIR, 'Si.prim.poscar')
+
+
+UPF = '<UPF version="2.0.1">\n<PP_HEADER element="{element}" pseudo_type="US" functional="PBE" z_valence="{z_valence}" wfc_cutoff="{ecutwfc}" rho_cutoff="{ecutrho}"/>\n</UPF>\n'
+
+
+@pytest.fixture
+def pseudo_dir(tmp_path, monkeypatch):
+    """
+    Pseudo directory with a Si UPF file (4 valence electrons, 30/240 Ry);
+    the pwtk cache, and so the saved index, lives in tmp_path.
+    """
+    import cache
+    import pseudo
+
+    monkeypatch.setattr(cache, 'DEFAULT_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(pseudo, '_indexes', {})
+    directory = tmp_path / 'pseudo'
+    directory.mkdir()
+    write_upf(str(directory), 'Si', 4.0, 30.0)
+    return str(directory)
+
+
+def write_upf(pseudo_dir, element, z_valence, ecutwfc, ecutrho=None, name=None):
+    path = os.path.join(pseudo_dir, name or element + '.pbe-rrkjus.UPF')
+    with open(path, 'w') as f:
+        f.write(UPF.format(element=element, z_valence=z_valence, ecutwfc=ecutwfc, ecutrho=ecutrho or 8.0 * ecutwfc))
+    return path
+
+
+def scf_template(pseudo_dir, **system):
+    """
+    Return an SCF template for Si in pseudo_dir, with &system values replaced.
+    """
+    template = {
+        'control': {'calculation': 'scf', 'outdir': './output', 'pseudo_dir': pseudo_dir},
+        'system': dict({'ibrav': 0, 'nat': None, 'ntyp': None, 'ecutwfc': 40.0}, **system),
+        'electrons': {'conv_thr': 1.0e-8},
+        'pseudopotentials': {'Si': 'Si.pbe-rrkjus.UPF'},
+        'kspacing': 0.3,
+        'crystal_coordinates': True,
+    }
+    return template
+
+
+@pytest.fixture
+def scf_inputs(tmp_path, si_prim):
+    """
+    Write n SCF inputs of Si (explicit cutoffs, no pseudo directory needed)
+    and return their (input, output) paths.
+    """
+    import json
+
+    from poscar2pwi import convert_poscar_to_pwi
+
+    template = tmp_path / 'scf.json'
+    template.write_text(json.dumps(scf_template(str(tmp_path))))
+
+    def write(n):
+        paths = []
+        for index in range(n):
+            input_path = str(tmp_path / 'Si_{:d}.scf.in'.format(index))
+            convert_poscar_to_pwi(str(template), si_prim, input_path)
+            paths.append((input_path, input_path[:-len('.in')] + '.out'))
+        return paths
+    return write
@@ -19,17 +19,18 @@ for poscar_name in $(ls $ASSETS_DIR/POSCARS/*.poscar);do
     --bands-data $result_dir/$system_name.bands.dat \
     --system-name $system_name > $result_dir/conversion.log
 
+    # pw.x runs get the k-point pools and diagonalization group planned for 4 cores
     # Run first command with status update
     echo " ------------ Running Test # $i ------------ "
     echo -ne "Running scf for test # $i with pid: $pid_code .... "
-    mpirun -np 4 pw.x < $result_dir/$system_name.scf.in > $result_dir/$system_name.scf.out
+    $(python $UTILS_DIR/parallel.py --command --cores 4 --inputs $result_dir/$system_name.scf.in) < $result_dir/$system_name.scf.in > $result_dir/$system_name.scf.out
     pid_code=$!
     wait $pid_code
     echo "Done"
 
     # Run second command with status update
     echo -ne "Running nscf for test # $i with pid: $pid_code .... "
-    mpirun -np 4 pw.x < $result_dir/$system_name.nscf.in > $result_dir/$system_name.nscf.out
+    $(python $UTILS_DIR/parallel.py --command --cores 4 --inputs $result_dir/$system_name.nscf.in) < $result_dir/$system_name.nscf.in > $result_dir/$system_name.nscf.out
     pid_code=$!
     wait $pid_code
     echo "Done"
@@ -0,0 +1,119 @@
+import json
+import os
+
+import f90nml
+import pytest
+
+import cache
+import pwtk
+from conftest import scf_template, write_upf
+
+
+def write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    return str(path)
+
+
+def generate(tmp_path, template, poscar, store):
+    output = str(tmp_path / 'Si.scf.in')
+    status = cache.run_cached('poscar2pwi', store, quiet=True, template=template, poscar=poscar, pwi=output)
+    return status, f90nml.read(output)['system']
+
+
+@pytest.fixture
+def store(tmp_path):
+    return cache.Cache(str(tmp_path / 'cache'))
+
+
+def test_structure_hash_ignores_formatting(poscar, si_prim):
+    with open(si_prim) as f:
+        lines = f.read().splitlines()
+    lines[8] = '  0.25000000   0.25   1.25 Si'
+    assert cache.structure_hash(si_prim) == cache.structure_hash(poscar('\n'.join(lines) + '\n'))
+
+
+def test_structure_hash_keeps_atom_order(poscar, si_prim):
+    with open(si_prim) as f:
+        lines = f.read().splitlines()
+    lines[1:5] = ['1.0', '4.0 0.0 0.0', '0.0 4.0 0.0', '0.0 0.0 4.0']
+    lines[8], lines[9] = lines[9], lines[8]
+    swapped = poscar('\n'.join(lines) + '\n', 'swapped')
+    lines[8], lines[9] = lines[9], lines[8]
+    assert cache.structure_hash(poscar('\n'.join(lines) + '\n')) != cache.structure_hash(swapped)
+
+
+def test_structure_hash_keeps_selective_dynamics(poscar):
+    text = "Si\n1.0\n4 0 0\n0 4 0\n0 0 4\nSi\n2\nSelective dynamics\nDirect\n0 0 0 {:s}\n0.5 0.5 0.5 T T T\n"
+    fixed = cache.structure_hash(poscar(text.format('F F F'), 'fixed'))
+    free = cache.structure_hash(poscar(text.format('T T T'), 'free'))
+    plain = cache.structure_hash(poscar(text.replace('Selective dynamics\n', '').format(''), 'plain'))
+    assert len({fixed, free, plain}) == 3
+
+
+def test_generator_closure_covers_imported_modules():
+    names = {os.path.basename(path) for path in cache.source_closure('poscar2pwi', pwtk.UTILS_DIR)}
+    assert {'poscar2pwi.py', 'pwi_renderer.py', 'pseudo.py', 'occupations.py'} <= names
+    names = {os.path.basename(path) for path in cache.source_closure('gen_post', pwtk.UTILS_DIR)}
+    assert {'gen_post.py', 'gen_bands.py', 'symmetry.py', 'pwi_renderer.py'} <= names
+
+
+def test_generator_hash_follows_imports(tmp_path, monkeypatch):
+    (tmp_path / 'generator.py').write_text("def run():\n    from helper import value\n    return value\n")
+    (tmp_path / 'helper.py').write_text("value = 1\n")
+    monkeypatch.setattr(pwtk, 'UTILS_DIR', str(tmp_path))
+    monkeypatch.setitem(pwtk.COMMANDS, 'generator', ('generator', 'run', [], []))
+    before = cache.generator_hash('generator')
+    (tmp_path / 'helper.py').write_text("value = 2\n")
+    assert cache.generator_hash('generator') != before
+
+
+def test_hit_and_miss_on_template_change(tmp_path, pseudo_dir, si_prim, store):
+    template = write_json(tmp_path / 'scf.json', scf_template(pseudo_dir))
+    assert generate(tmp_path, template, si_prim, store)[0] == 'generated'
+    assert generate(tmp_path, template, si_prim, store)[0] == 'hit'
+    write_json(template, scf_template(pseudo_dir, ecutwfc=45.0))
+    status, system = generate(tmp_path, template, si_prim, store)
+    assert status == 'generated' and system['ecutwfc'] == 45.0
+
+
+def test_miss_when_the_pseudopotential_changes(tmp_path, pseudo_dir, si_prim, store):
+    template = write_json(tmp_path / 'scf.json', scf_template(pseudo_dir, ecutwfc='auto', nbnd='auto'))
+    status, system = generate(tmp_path, template, si_prim, store)
+    assert status == 'generated' and system['ecutwfc'] == 30.0 and system['nbnd'] == 4
+    assert generate(tmp_path, template, si_prim, store)[0] == 'hit'
+
+    write_upf(pseudo_dir, 'Si', 4.0, 60.0)
+    status, system = generate(tmp_path, template, si_prim, store)
+    assert status == 'generated' and system['ecutwfc'] == 60.0
+
+    write_upf(pseudo_dir, 'Si', 3.0, 60.0)
+    status, system = generate(tmp_path, template, si_prim, store)
+    assert status == 'generated' and system['nbnd'] == 3
+
+
+def test_miss_when_the_pseudo_dir_changes(tmp_path, pseudo_dir, si_prim, store, monkeypatch):
+    other = tmp_path / 'other'
+    other.mkdir()
+    write_upf(str(other), 'Si', 4.0, 50.0)
+    template = scf_template(None, ecutwfc='auto')
+    del template['control']['pseudo_dir']
+    template = write_json(tmp_path / 'scf.json', template)
+
+    monkeypatch.setenv('ESPRESSO_PSEUDO', pseudo_dir)
+    assert generate(tmp_path, template, si_prim, store)[1]['ecutwfc'] == 30.0
+    monkeypatch.setenv('ESPRESSO_PSEUDO', str(other))
+    status, system = generate(tmp_path, template, si_prim, store)
+    assert status == 'generated' and system['ecutwfc'] == 50.0
+
+
+def test_completed_runs(tmp_path, store):
+    input_path, output_path = tmp_path / 'Si.in', tmp_path / 'Si.out'
+    input_path.write_text("&control\n/\n")
+    output_path.write_text("unfinished\n")
+    assert not store.record_run('pw.x', str(input_path), str(output_path))
+    output_path.write_text("   JOB DONE.\n")
+    assert store.record_run('pw.x', str(input_path), str(output_path))
+    assert store.run_completed('pw.x', str(input_path), str(output_path))
+    input_path.write_text("&control\n  calculation = 'relax'\n/\n")
+    assert not store.run_completed('pw.x', str(input_path), str(output_path))
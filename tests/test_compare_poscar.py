@@ -0,0 +1,54 @@
+import numpy as np
+
+from compare_poscar import compare_poscars, deduplicate, read_poscar, structures_match
+
+CUBIC = """cubic
+{scale}
+2.0 0.0 0.0
+0.0 2.0 0.0
+0.0 0.0 2.0
+Si
+1
+{mode}
+{position}
+"""
+
+
+def test_negative_scale_is_volume_for_cartesian_positions(poscar):
+    data = read_poscar(poscar(CUBIC.format(scale='-40.0', mode='Cartesian', position='0.5 0.5 0.5')))
+    assert np.isclose(abs(np.linalg.det(data[1])), 40.0)
+    assert np.allclose(data[4], [[0.25, 0.25, 0.25]])
+
+
+def test_three_component_scale_for_cartesian_positions(poscar):
+    data = read_poscar(poscar(CUBIC.format(scale='1.0 2.0 4.0', mode='Cartesian', position='0.5 1.0 1.0')))
+    assert np.allclose(np.diag(data[1]), [2.0, 4.0, 8.0])
+    assert np.allclose(data[4], [[0.25, 0.5, 0.5]])
+
+
+def test_cartesian_and_direct_agree(poscar):
+    cartesian = read_poscar(poscar(CUBIC.format(scale='1.5', mode='Cartesian', position='0.5 0.5 0.5'), 'cartesian'))
+    direct = read_poscar(poscar(CUBIC.format(scale='1.5', mode='Direct', position='0.25 0.25 0.25'), 'direct'))
+    assert all(structures_match(cartesian, direct).values())
+
+
+def test_selective_dynamics_is_skipped(poscar):
+    data = read_poscar(poscar(CUBIC.format(scale='1.0', mode='Selective dynamics\nDirect', position='0.1 0.2 0.3 T T F')))
+    assert np.allclose(data[4], [[0.1, 0.2, 0.3]])
+
+
+def test_atom_order_and_periodic_images_match(poscar, si_prim):
+    with open(si_prim) as f:
+        lines = f.read().splitlines()
+    # Swap the two atoms and move one by a lattice vector
+    lines[8], lines[9] = '1.5 0.5 0.5', '0.25 0.25 0.25'
+    assert compare_poscars(si_prim, poscar('\n'.join(lines) + '\n'))
+
+
+def test_deduplicate_groups_copies(poscar, si_prim):
+    with open(si_prim) as f:
+        text = f.read()
+    copy = poscar(text, 'copy')
+    other = poscar(CUBIC.format(scale='1.0', mode='Direct', position='0 0 0'), 'other')
+    groups = deduplicate([si_prim, copy, other])
+    assert groups == {si_prim: [copy], other: []}
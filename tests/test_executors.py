@@ -0,0 +1,53 @@
+import os
+import subprocess
+
+import pytest
+
+from executors import ArrayExecutor, DryRunExecutor, make_executor
+from workflow import FAKE_BINARIES, FAKE_LAUNCHER, Stage
+
+
+def stages(paths):
+    return [Stage('scf_{:d}'.format(index), binary='pw.x', input_path=input_path, output_path=output_path)
+            for index, (input_path, output_path) in enumerate(paths)]
+
+
+def job_done(path):
+    with open(path) as f:
+        return 'JOB DONE.' in f.read()
+
+
+def test_fake_executor(tmp_path, scf_inputs):
+    batch = stages(scf_inputs(3))
+    statuses = make_executor('fake', str(tmp_path), total_cores=3, poll_interval=0.05)(batch)
+    assert statuses == {stage.name: 'done' for stage in batch}
+    assert all(job_done(stage.output_path) for stage in batch)
+
+
+def test_dry_run_executor(tmp_path, scf_inputs, capsys):
+    batch = stages(scf_inputs(2))
+    capsys.readouterr()
+    assert DryRunExecutor(cores_per_job=8, workdir=str(tmp_path))(batch) == {stage.name: 'skipped' for stage in batch}
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2 and all('mpirun -np 8 pw.x' in line for line in lines)
+
+
+def test_array_script_runs_every_task(tmp_path, scf_inputs):
+    batch = stages(scf_inputs(2))
+    executor = ArrayExecutor(str(tmp_path / 'array'), cores_per_job=1, launcher=FAKE_LAUNCHER, binaries=FAKE_BINARIES, workdir=str(tmp_path),
+                             modules=(), directives=['--partition=short'], submit_command=None)
+    assert executor(batch) == {stage.name: 'submitted' for stage in batch}
+    script_path = str(tmp_path / 'array' / 'pwtk_{:d}_1.sh'.format(os.getpid()))
+    with open(script_path) as f:
+        script = f.read()
+    assert '#SBATCH --array=0-1' in script and '#SBATCH --partition=short' in script
+
+    for task in range(len(batch)):
+        subprocess.run(['bash', script_path, str(task)], check=True)
+    assert executor.collect(batch) == {stage.name: 'done' for stage in batch}
+    assert all(job_done(stage.output_path) for stage in batch)
+
+
+def test_unknown_executor():
+    with pytest.raises(ValueError):
+        make_executor('cloud')
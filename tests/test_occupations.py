@@ -0,0 +1,51 @@
+import copy
+
+import pytest
+
+from conftest import scf_template, write_upf
+from occupations import band_count, valence_electrons, with_bands
+
+
+@pytest.mark.parametrize('calculation_type, system, nbnd', [
+    ('scf', {}, 4),
+    ('bands', {}, 12),
+    ('dos', {}, 10),
+    (['dos', 'pdos'], {}, 10),
+    ('scf', {'occupations': 'smearing'}, 8),
+    ('scf', {'noncolin': True}, 8),
+])
+def test_band_count(calculation_type, system, nbnd):
+    assert band_count(8.0, calculation_type, system) == nbnd
+
+
+def test_policy_override():
+    assert band_count(8.0, 'bands', {}, {'bands': {'factor': 2.0, 'extra': 0}}) == 8
+
+
+def test_with_bands_per_calculation(pseudo_dir):
+    template = scf_template(pseudo_dir, nbnd='auto')
+    assert valence_electrons(template, ['Si', 'Si']) == 8.0
+    assert with_bands(template, ['Si', 'Si'])['system']['nbnd'] == 4
+    assert with_bands(template, ['Si', 'Si'], 'bands')['system']['nbnd'] == 12
+    assert template['system']['nbnd'] == 'auto'
+
+
+def test_odd_electron_count_switches_to_smearing(pseudo_dir):
+    write_upf(pseudo_dir, 'H', 1.0, 40.0)
+    template = scf_template(pseudo_dir, nbnd='auto')
+    template['pseudopotentials']['H'] = 'H.pbe-rrkjus.UPF'
+    system = with_bands(template, ['Si', 'H'])['system']
+    assert system['occupations'] == 'smearing' and system['nbnd'] == 7
+
+
+def test_explicit_nbnd_is_kept(tmp_path):
+    template = scf_template(str(tmp_path / 'missing'), nbnd=20)
+    assert with_bands(template, ['Si']) is template
+
+
+def test_fallback_without_pseudo_dir(tmp_path, capsys):
+    template = scf_template(str(tmp_path / 'missing'), nbnd='auto')
+    assert 'nbnd' not in with_bands(copy.deepcopy(template), ['Si'])['system']
+    template['fallback_nbnd'] = 16
+    assert with_bands(template, ['Si'], 'bands')['system']['nbnd'] == 16
+    assert capsys.readouterr().out.count('Warning') == 2
@@ -0,0 +1,66 @@
+import pytest
+from ase import Atoms
+from ase.build import bulk
+
+from parallel import good_fft_order, irreducible_kpoints, launch_options, plan, read_kpoints, run_size
+
+
+@pytest.fixture
+def si():
+    return bulk('Si', 'diamond', a=5.43)
+
+
+def test_good_fft_order():
+    assert [good_fft_order(n) for n in (7, 11, 36, 37, 49, 97)] == [8, 12, 36, 40, 50, 100]
+
+
+@pytest.mark.parametrize('grid, shift, count', [
+    ((1, 1, 1), (0, 0, 0), 1),
+    ((2, 2, 2), (0, 0, 0), 3),
+    ((4, 4, 4), (0, 0, 0), 8),
+    ((8, 8, 8), (0, 0, 0), 29),
+    ((4, 4, 4), (1, 1, 1), 10),
+])
+def test_irreducible_kpoints_of_si(si, grid, shift, count):
+    # Values printed by pw.x ("number of k points")
+    assert irreducible_kpoints(si, grid, shift) == count
+
+
+def test_time_reversal_only_without_symmetry():
+    atoms = Atoms('Si3', scaled_positions=[[0, 0, 0], [0.21, 0.33, 0.12], [0.52, 0.11, 0.71]], cell=[4.0, 4.5, 5.0, 80, 85, 95], pbc=True)
+    # k and -k coincide for 8 of the 64 points
+    assert irreducible_kpoints(atoms, (4, 4, 4)) == 36
+    assert irreducible_kpoints(atoms, (4, 4, 4), time_reversal=False) == 64
+
+
+def test_read_kpoints():
+    assert read_kpoints("K_POINTS automatic\n 4 4 4 1 1 1\n") == ('automatic', [4, 4, 4], [1, 1, 1])
+    assert read_kpoints("K_POINTS {gamma}\n") == ('gamma',)
+    assert read_kpoints("ATOMIC_POSITIONS crystal\n") == ('gamma',)
+    path = "K_POINTS crystal_b\n3\n0 0 0 20\n0.5 0 0.5 10\n0.5 0.25 0.75 1\n"
+    assert read_kpoints(path) == ('list', 31)
+
+
+def test_run_size_uses_a_pinned_grid(si):
+    system = {'ecutwfc': 30.0, 'nbnd': 8}
+    estimated = run_size(si, system, ('automatic', (4, 4, 4), (0, 0, 0)))
+    assert estimated['nks'] == 8 and estimated['nbnd'] == 8
+    pinned = run_size(si, dict(system, nr1=48, nr2=48, nr3=48), ('gamma',))
+    assert pinned['fft'] == [48, 48, 48] and pinned['nks'] == 1
+
+
+@pytest.mark.parametrize('nks, cores', [(1, 16), (8, 16), (29, 32), (3, 7), (100, 4)])
+def test_plan_is_consistent(nks, cores):
+    choice = plan({'nks': nks, 'fft': [36, 36, 36], 'nbnd': 64, 'npw': 500, 'ngm': 4000}, cores)
+    assert choice['ranks'] <= cores and choice['ranks'] % choice['pools'] == 0
+    assert choice['pools'] <= nks and choice['ranks_per_pool'] == choice['ranks'] // choice['pools']
+    assert int(choice['diag'] ** 0.5) ** 2 == choice['diag'] and choice['diag'] <= choice['ranks_per_pool']
+
+
+def test_pools_follow_the_kpoints():
+    assert plan({'nks': 8, 'fft': [36, 36, 36], 'nbnd': 8}, 16)['pools'] == 8
+    assert plan({'nks': 1, 'fft': [36, 36, 36], 'nbnd': 8}, 16)['pools'] == 1
+
+
+def test_unplanned_binaries_keep_their_cores():
+    assert launch_options('dos.x', 'Si.dos.in', 6) == (6, [])
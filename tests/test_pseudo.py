@@ -0,0 +1,48 @@
+import copy
+
+import pytest
+
+import pseudo
+from conftest import scf_template, write_upf
+
+
+def test_read_upf_header(pseudo_dir):
+    header = pseudo.read_upf_header(write_upf(pseudo_dir, 'O', 6.0, 45.0, 360.0))
+    assert header == {'element': 'O', 'functional': 'PBE', 'pseudo_type': 'US', 'z_valence': 6.0, 'ecutwfc': 45.0, 'ecutrho': 360.0}
+
+
+def test_index_notices_edits_in_place(pseudo_dir, tmp_path):
+    index_file = str(tmp_path / 'index.json')
+    assert pseudo.build_index(pseudo_dir, index_file)['Si.pbe-rrkjus.UPF']['ecutwfc'] == 30.0
+    write_upf(pseudo_dir, 'Si', 4.0, 60.0)
+    assert pseudo.build_index(pseudo_dir, index_file)['Si.pbe-rrkjus.UPF']['ecutwfc'] == 60.0
+    # A fresh process reads the saved index
+    pseudo._indexes.clear()
+    assert pseudo.build_index(pseudo_dir, index_file)['Si.pbe-rrkjus.UPF']['ecutwfc'] == 60.0
+
+
+def test_resolve_fills_species_and_cutoffs(pseudo_dir):
+    write_upf(pseudo_dir, 'O', 6.0, 45.0, 300.0)
+    write_upf(pseudo_dir, 'O', 6.0, 70.0, name='O.pbe-hard.UPF')
+    template = pseudo.resolve_template(scf_template(pseudo_dir, ecutwfc='auto'), ['Si', 'O', 'O'])
+    assert template['pseudopotentials'] == {'Si': 'Si.pbe-rrkjus.UPF', 'O': 'O.pbe-rrkjus.UPF'}
+    assert (template['system']['ecutwfc'], template['system']['ecutrho']) == (45.0, 300.0)
+
+
+def test_explicit_template_needs_no_index(tmp_path):
+    template = scf_template(str(tmp_path / 'missing'))
+    assert pseudo.resolve_template(copy.deepcopy(template), ['Si']) == template
+
+
+def test_fallback_without_pseudo_dir(tmp_path, capsys):
+    template = scf_template(str(tmp_path / 'missing'), ecutwfc='auto')
+    assert pseudo.resolve_template(copy.deepcopy(template), ['Si'])['system']['ecutwfc'] == pseudo.DEFAULT_ECUTWFC
+    template['fallback_ecutwfc'] = 35
+    system = pseudo.resolve_template(template, ['Si'])['system']
+    assert (system['ecutwfc'], system['ecutrho']) == (35.0, 140.0)
+    assert capsys.readouterr().out.count('Warning') == 2
+
+
+def test_no_fallback_for_unmapped_species(tmp_path):
+    with pytest.raises(ValueError, match='no pseudopotential for O'):
+        pseudo.resolve_template(scf_template(str(tmp_path / 'missing'), ecutwfc='auto'), ['Si', 'O'])
@@ -0,0 +1,21 @@
+import json
+
+import pwi_renderer
+from conftest import scf_template
+
+
+def test_benchmark_times_resolved_inputs(tmp_path, pseudo_dir, si_prim, monkeypatch):
+    template = tmp_path / 'scf.json'
+    template.write_text(json.dumps(scf_template(pseudo_dir, ecutwfc='auto', nbnd='auto')))
+    compiled = []
+
+    def from_template(template, *args, **kwargs):
+        compiled.append(template)
+        return original(template, *args, **kwargs)
+    original = pwi_renderer.from_template
+    monkeypatch.setattr(pwi_renderer, 'from_template', from_template)
+
+    assert pwi_renderer.benchmark(str(template), si_prim, count=5)['mismatches'] == 0
+    system = compiled[0]['system']
+    assert (system['ecutwfc'], system['ecutrho'], system['nbnd']) == (30.0, 240.0, 4)
+    assert (system['nat'], system['ntyp']) == (2, 1)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from ase.units import Bohr
+
+from pwo_reader import PwoReader, iter_ionic_steps, read_last_structure
+
+ALAT = 10.2
+
+HEADER = """
+     lattice parameter (alat)  =      10.2000  a.u.
+     number of atoms/cell      =            2
+     crystal axes: (cart. coord. in units of alat)
+               a(1) = (  -0.500000   0.000000   0.500000 )
+               a(2) = (   0.000000   0.500000   0.500000 )
+               a(3) = (  -0.500000   0.500000   0.000000 )
+
+     site n.     atom                  positions (alat units)
+         1           Si  tau(   1) = (   0.0000000   0.0000000   0.0000000  )
+         2           Si  tau(   2) = (  -0.2500000   0.2500000   0.2500000  )
+"""
+
+STEP = """
+CELL_PARAMETERS (alat= 10.20000000)
+  -{half:.9f}   0.000000000   {half:.9f}
+   0.000000000   {half:.9f}   {half:.9f}
+  -{half:.9f}   {half:.9f}   0.000000000
+
+ATOMIC_POSITIONS (crystal)
+Si            0.0000000000        0.0000000000        0.0000000000
+Si            {x:.10f}        0.2500000000        0.2500000000
+"""
+
+
+def step(half, x):
+    return STEP.format(half=half, x=x)
+
+
+def volume(half):
+    # fcc cell with the lattice vectors of a(1..3) scaled by 2 half
+    return (2 * half * ALAT * Bohr) ** 3 / 4
+
+
+@pytest.fixture
+def pwo(tmp_path):
+    path = tmp_path / 'Si.vcrelax.out'
+    path.write_text(HEADER + step(0.51, 0.26) + step(0.52, 0.25) + "\n   JOB DONE.\n")
+    return str(path)
+
+
+def test_iter_ionic_steps(pwo):
+    steps = list(iter_ionic_steps(pwo))
+    assert len(steps) == 3
+    assert np.allclose([atoms.get_volume() for atoms in steps], [volume(0.5), volume(0.51), volume(0.52)])
+    assert np.allclose(steps[1].get_scaled_positions()[1], [0.26, 0.25, 0.25])
+    assert steps[0].get_chemical_symbols() == ['Si', 'Si']
+
+
+def test_read_last_structure(pwo):
+    atoms = read_last_structure(pwo)
+    assert np.isclose(atoms.get_volume(), volume(0.52))
+    assert np.allclose(atoms.get_scaled_positions()[1], [0.25, 0.25, 0.25])
+
+
+def test_last_structure_skips_an_incomplete_block(tmp_path):
+    path = tmp_path / 'Si.vcrelax.out'
+    path.write_text(HEADER + step(0.51, 0.26) + step(0.52, 0.25)[:-60])
+    assert np.isclose(read_last_structure(str(path)).get_volume(), volume(0.51))
+
+
+def test_reader_resumes(tmp_path):
+    path = tmp_path / 'Si.vcrelax.out'
+    path.write_text(HEADER + step(0.51, 0.26) + step(0.52, 0.25)[:-60])
+    reader = PwoReader(str(path))
+    assert len(list(reader.steps())) == 2
+
+    with open(path, 'a') as f:
+        f.write(step(0.52, 0.25)[-60:])
+    resumed = PwoReader(**reader.state())
+    steps = list(resumed.steps())
+    assert len(steps) == 1 and np.isclose(steps[0].get_volume(), volume(0.52))
+    assert list(resumed.steps()) == []
+
+
+def test_not_a_pw_output(tmp_path):
+    path = tmp_path / 'other.out'
+    path.write_text("nothing here\n")
+    with pytest.raises(ValueError):
+        read_last_structure(str(path))
+    assert list(iter_ionic_steps(str(path))) == []
@@ -0,0 +1,42 @@
+from relax import check_convergence, parse_relax_output
+
+PASS = """\
+     unit-cell volume          =     270.0114 (a.u.)^3
+!    total energy              =     -15.84312233 Ry
+          total   stress  (Ry/bohr**3)                   (kbar)     P=       12.50
+     unit-cell volume          =     269.8000 (a.u.)^3
+!    total energy              =     -15.84318000 Ry
+          total   stress  (Ry/bohr**3)                   (kbar)     P=        0.20
+     JOB DONE.
+"""
+
+
+def test_parse_relax_output(tmp_path):
+    pwo = tmp_path / 'Si.vcrelax_1.pwo'
+    pwo.write_text(PASS)
+    result = parse_relax_output(str(pwo))
+    assert result['energies'] == [-15.84312233, -15.84318]
+    assert result['volumes'] == [270.0114, 269.8]
+    assert result['pressures'] == [12.5, 0.2]
+    assert result['job_done']
+
+
+def test_missing_and_empty_outputs_are_not_done(tmp_path):
+    empty = tmp_path / 'empty.pwo'
+    empty.write_text('')
+    for path in (tmp_path / 'missing.pwo', empty):
+        result = parse_relax_output(str(path))
+        assert result == {'energies': [], 'volumes': [], 'pressures': [], 'job_done': False}
+        converged, metrics = check_convergence(result)
+        assert not converged
+        assert metrics == {'energy_change': None, 'volume_change': None, 'pressure': None}
+
+
+def test_check_convergence(tmp_path):
+    pwo = tmp_path / 'Si.vcrelax_1.pwo'
+    pwo.write_text(PASS)
+    result = parse_relax_output(str(pwo))
+    # The cell moved by 0.08 %, below the default tolerances
+    assert check_convergence(result)[0]
+    assert not check_convergence(result, volume_tol=1.0E-4)[0]
+    assert not check_convergence(dict(result, job_done=False))[0]
@@ -0,0 +1,77 @@
+import pytest
+
+from state import StateStore
+from workflow import Stage, Workflow
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """
+    Two chained action stages (prepare -> compute) checkpointed in one file;
+    calling the fixture's result runs a fresh workflow and returns the
+    names of the stages that actually ran.
+    """
+    source, prepared, result = tmp_path / 'source', tmp_path / 'prepared', tmp_path / 'result'
+    source.write_text('1')
+
+    def run(force=False):
+        ran = []
+
+        def prepare():
+            ran.append('prepare')
+            prepared.write_text(source.read_text() + '0')
+
+        def compute():
+            ran.append('compute')
+            result.write_text(str(int(prepared.read_text()) * 2))
+
+        workflow = Workflow(workdir=str(tmp_path), state=StateStore(str(tmp_path / 'Si.state.json')), force=force)
+        workflow.add(Stage('prepare', action=prepare, inputs=[str(source)], outputs=[str(prepared)]))
+        workflow.add(Stage('compute', action=compute, depends=['prepare'], inputs=[str(prepared)], outputs=[str(result)]))
+        assert set(workflow.run().values()) == {'done'}
+        return ran
+
+    run.source, run.result = source, result
+    return run
+
+
+def test_completed_stages_are_resumed(pipeline):
+    assert pipeline() == ['prepare', 'compute']
+    assert pipeline() == []
+    assert pipeline.result.read_text() == '20'
+
+
+def test_changed_input_reruns_the_stage_and_its_dependents(pipeline):
+    pipeline()
+    pipeline.source.write_text('2')
+    assert pipeline() == ['prepare', 'compute']
+    assert pipeline.result.read_text() == '40'
+
+
+def test_changed_output_reruns_the_stage(pipeline):
+    pipeline()
+    pipeline.result.write_text('edited')
+    assert pipeline() == ['compute']
+
+
+def test_force_and_forget(pipeline, tmp_path):
+    pipeline()
+    assert pipeline(force=True) == ['prepare', 'compute']
+    store = StateStore(str(tmp_path / 'Si.state.json'))
+    assert set(store.stages) == {'prepare', 'compute'}
+    store.forget(['compute'])
+    assert pipeline() == ['compute']
+
+
+def test_failed_stage_is_not_resumed(tmp_path):
+    store = StateStore(str(tmp_path / 'Si.state.json'))
+
+    def fail():
+        raise RuntimeError('no convergence')
+
+    workflow = Workflow(workdir=str(tmp_path), state=store)
+    workflow.add(Stage('relax', action=fail))
+    assert workflow.run() == {'relax': 'failed'}
+    record = StateStore(store.state_path).stages['relax']
+    assert record['status'] == 'failed' and 'no convergence' in record['error']
+    assert not store.completed(Stage('relax', action=fail))
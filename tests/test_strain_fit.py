@@ -0,0 +1,99 @@
+import json
+
+import numpy as np
+import pytest
+
+import strain_fit
+from conftest import scf_template
+from gen_strain import strain_sweep
+from workflow import FAKE_BINARIES, FAKE_LAUNCHER
+
+# E0 (eV), V0 (Angstrom^3), B0 (eV/Angstrom^3), B0' of two materials
+PARAMETERS = np.array([[-10.0, 40.0, 0.6, 4.5], [-3.0, 16.5, 1.2, 3.8]])
+
+
+def sampled(model, counts):
+    """
+    Energies of the materials at +-6 % of V0, padded with zero weights.
+    """
+    volumes = np.ones((len(PARAMETERS), max(counts)))
+    weights = np.zeros_like(volumes)
+    for index, count in enumerate(counts):
+        volumes[index, :count] = PARAMETERS[index, 1] * np.linspace(0.94, 1.06, count)
+        weights[index, :count] = 1.0
+    return volumes, model(volumes, *PARAMETERS.T[..., None]), weights
+
+
+def test_birch_murnaghan_recovers_parameters():
+    volumes, energies, weights = sampled(strain_fit.birch_murnaghan, [9, 6])
+    assert np.allclose(strain_fit.fit_birch_murnaghan(volumes, energies, weights), PARAMETERS, rtol=1e-8)
+
+
+def test_vinet_recovers_parameters():
+    volumes, energies, weights = sampled(strain_fit.vinet, [11, 7])
+    start = strain_fit.fit_birch_murnaghan(volumes, energies, weights)
+    assert np.allclose(strain_fit.fit_vinet(volumes, energies, weights, start), PARAMETERS, rtol=1e-6)
+
+
+def test_too_few_points():
+    volumes, energies, weights = sampled(strain_fit.birch_murnaghan, [9, 4])
+    parameters = strain_fit.fit_birch_murnaghan(volumes, energies, weights)
+    assert np.all(np.isfinite(parameters[0])) and np.all(np.isnan(parameters[1]))
+
+
+def test_elastic_tensor_of_a_cubic_material():
+    c11, c12, c44 = 165.0, 64.0, 79.0
+    elastic = np.full((6, 6), 0.0)
+    elastic[:3, :3] = c12
+    elastic[np.arange(3), np.arange(3)] = c11
+    elastic[np.arange(3, 6), np.arange(3, 6)] = c44
+    strains = []
+    for i, j in [(0, 0), (1, 1), (2, 2), (1, 2), (0, 2), (0, 1)]:
+        for value in (-0.01, -0.005, 0.005, 0.01):
+            strain = np.zeros((3, 3))
+            strain[i, j] = strain[j, i] = value
+            strains.append(strain)
+    strains = np.array(strains)
+    voigt = strains[:, [0, 1, 2, 1, 0, 0], [0, 1, 2, 2, 2, 1]] * [1, 1, 1, 2, 2, 2]
+    sigma = voigt @ elastic.T + 0.5
+    stresses = np.zeros_like(strains)
+    for k, (i, j) in enumerate([(0, 0), (1, 1), (2, 2), (1, 2), (0, 2), (0, 1)]):
+        stresses[:, i, j] = stresses[:, j, i] = sigma[:, k]
+
+    fitted, residual, _ = strain_fit.fit_elastic(strains[None], stresses[None], np.ones((1, len(strains))))
+    assert np.allclose(fitted[0], elastic) and np.allclose(residual[0], 0.5)
+
+    # Without shear runs the shear constants are unknown
+    normal = np.arange(12)
+    fitted = strain_fit.fit_elastic(strains[None, normal], stresses[None, normal], np.ones((1, 12)))[0][0]
+    assert np.allclose(fitted[:3, :3], elastic[:3, :3]) and np.all(np.isnan(fitted[3:, 3:]))
+
+
+def test_fake_sweep(tmp_path, si_prim):
+    from warm_start import sweep_workflow
+
+    template = tmp_path / 'scf.json'
+    template.write_text(json.dumps(scf_template(str(tmp_path))))
+    strain_sweep(si_prim, str(tmp_path / 'sweep'), [-4, -3, -2, -1, 0, 1, 2], mode='hydrostatic', template=str(template), system_name='Si')
+    workflow, _ = sweep_workflow(str(tmp_path / 'sweep' / 'Si_hydrostatic.strain.json'), total_cores=4, launcher=FAKE_LAUNCHER,
+                                 binaries=FAKE_BINARIES, poll_interval=0.05)
+    assert set(workflow.run().values()) == {'done'}
+
+    result, = strain_fit.fit_materials([str(tmp_path / 'sweep')])
+    assert result['runs'] == 7 and result['eos']['points'] == 7
+    # fake_qe.FAKE_EOS (Birch-Murnaghan): 20 Angstrom^3 per atom, 100 GPa, B0' = 4.5
+    eos = result['eos']['birch_murnaghan']
+    assert (eos['V0'], eos['B0'], eos['B0_prime']) == pytest.approx((40.0, 100.0, 4.5), rel=1e-5)
+    assert eos['in_range'] and eos['r2'] == pytest.approx(1.0)
+    # Vinet only approximates that curve
+    eos = result['eos']['vinet']
+    assert (eos['V0'], eos['B0'], eos['B0_prime']) == pytest.approx((40.0, 100.0, 4.5), rel=2e-2)
+
+
+def test_sweep_labels_are_lossless(tmp_path, si_prim):
+    written = strain_sweep(si_prim, str(tmp_path), [0.125, 0.12, -0.001, 0.001], system_name='Si')
+    assert [label for label, _, _ in written] == ['x_+0.125', 'x_+0.12', 'x_-0.001', 'x_+0.001']
+    assert len({poscar for _, poscar, _ in written}) == 4
+
+    with pytest.raises(ValueError, match='x_\\+0.0'):
+        strain_sweep(si_prim, str(tmp_path), [-0.0, 0.0, 1], system_name='Si')
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from ase.build import bulk
+
+import symmetry
+
+
+@pytest.mark.parametrize('atoms, operations, equivalent, lattice', [
+    (bulk('Si', 'diamond', a=5.43), 48, [0, 0], 'FCC'),
+    (bulk('Si', 'diamond', a=5.43, cubic=True), 192, [0] * 8, 'CUB'),
+    (bulk('NaCl', 'rocksalt', a=5.64), 48, [0, 1], 'FCC'),
+    (bulk('Mg', 'hcp', a=3.21, c=5.21), 24, [0, 0], 'HEX'),
+    (bulk('ZnO', 'wurtzite', a=3.25, c=5.2), 12, [0, 1, 0, 1], 'HEX'),
+])
+def test_symmetry_operations(atoms, operations, equivalent, lattice):
+    rotations, permutations = symmetry.symmetry_operations(atoms)
+    assert len(rotations) == operations
+    assert symmetry.equivalent_atoms(atoms).tolist() == equivalent
+    assert symmetry.band_path(atoms.cell)[0].name == lattice
+    # Every operation maps each atom onto an atom of the same species
+    assert np.all(atoms.numbers[permutations] == atoms.numbers)
+    # and preserves the metric of the cell
+    cell = np.asarray(atoms.cell)
+    metric = cell @ cell.T
+    assert np.allclose(np.einsum('nji,jk,nkl->nil', rotations, metric, rotations), metric, atol=1e-6)
+
+
+def test_operations_are_cached():
+    symmetry.clear()
+    atoms = bulk('Si', 'diamond', a=5.43)
+    assert symmetry.symmetry_operations(atoms) is symmetry.symmetry_operations(atoms.copy())
+
+
+def test_analyzer_is_shared_between_files(poscar, si_prim):
+    pytest.importorskip('pymatgen')
+    with open(si_prim) as f:
+        copy = poscar(f.read().replace('    ', ' '))
+    symmetry.clear()
+    assert symmetry.get_analyzer(si_prim) is symmetry.get_analyzer(copy)
+    assert symmetry.symmetry_dataset(si_prim)['number'] == 227
+
+
+def test_convert_cells(tmp_path, si_prim):
+    pytest.importorskip('pymatgen')
+    from ase.io import read
+    from convert_crystal import convert_cells
+
+    results = convert_cells([si_prim], 'pc', str(tmp_path))
+    assert [result['status'] for result in results] == ['success', 'success']
+    assert [len(read(result['output'], format='vasp')) for result in results] == [2, 8]
+
+
+def test_convert_cells_rejects_unknown_cell_types(tmp_path, si_prim):
+    from convert_crystal import convert_cells
+
+    with pytest.raises(ValueError):
+        convert_cells([si_prim], 'x', str(tmp_path))
@@ -0,0 +1,35 @@
+import collections
+
+import pytest
+
+import monitor
+import telemetry
+from workflow import Stage
+
+Rusage = collections.namedtuple('Rusage', 'ru_utime ru_stime ru_maxrss')
+
+
+@pytest.mark.parametrize('text, seconds', [('0.52s', 0.52), ('3m45.67s', 225.67), ('1h 2m', 3720.0), ('1d 2h 3m', 93780.0)])
+def test_parse_qe_time(text, seconds):
+    assert telemetry.parse_qe_time(text) == pytest.approx(seconds)
+    assert monitor.parse_qe_time is telemetry.parse_qe_time
+
+
+def test_record_stage(tmp_path, monkeypatch):
+    monkeypatch.setenv(telemetry.TELEMETRY_ENV, str(tmp_path / 'log.jsonl'))
+    output_path = tmp_path / 'Si.scf.out'
+    output_path.write_text("     PWSCF        :   1m2.50s CPU   1m4.00s WALL\n\n   JOB DONE.\n")
+    stage = Stage('scf', binary='pw.x', input_path=str(tmp_path / 'Si.scf.in'), output_path=str(output_path))
+    stage.status, stage.returncode, stage.cores, stage.start_time, stage.end_time = 'done', 0, 4, 100.0, 165.0
+
+    inherited = telemetry.max_rss() // 1024
+    peak = inherited + (1 << 20)
+    telemetry.record_stage(stage, Rusage(50.0, 10.0, inherited))
+    telemetry.record_stage(stage, Rusage(50.0, 10.0, peak))
+    bound, measured = telemetry.read_log(str(tmp_path / 'log.jsonl'))
+
+    assert bound['max_rss'] is None and bound['max_rss_bound'] == inherited * 1024
+    assert measured['max_rss'] == peak * 1024
+    assert measured['cpu_time'] == 60.0 and measured['program'] == 'PWSCF'
+    assert (measured['qe_cpu_time'], measured['qe_wall_time']) == (62.5, 64.0)
+    assert telemetry.summarize([bound, measured])['scf']['max_rss'] == measured['max_rss']
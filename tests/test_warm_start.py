@@ -0,0 +1,51 @@
+import json
+
+import f90nml
+
+import warm_start
+from conftest import scf_template
+from gen_strain import strain_sweep
+from workflow import FAKE_BINARIES, FAKE_LAUNCHER
+
+
+def sweep(tmp_path, si_prim, strains, **system):
+    template = tmp_path / 'scf.json'
+    template.write_text(json.dumps(scf_template(str(tmp_path), **system)))
+    strain_sweep(si_prim, str(tmp_path / 'sweep'), strains, mode='hydrostatic', template=str(template), system_name='Si', warm_start=True)
+    return str(tmp_path / 'sweep' / 'Si_hydrostatic.strain.json')
+
+
+def test_seed_tree_runs_outwards():
+    strains = [[[value, 0, 0], [0, value, 0], [0, 0, value]] for value in (-0.02, -0.01, 0.0, 0.01, 0.02)]
+    assert warm_start.seed_tree(strains) == [1, 2, None, 2, 3]
+
+
+def test_sweep_shares_the_grid_of_the_largest_cell(tmp_path, si_prim):
+    manifest = sweep(tmp_path, si_prim, [-3, 0, 3])
+    with open(manifest) as f:
+        structures = json.load(f)['structures']
+    grids = {tuple(warm_start.input_fft_grid(structure['pwi'])) for structure in structures}
+    assert len(grids) == 1
+    assert 'startingwfc' not in f90nml.read(structures[1]['pwi'])['electrons']
+    assert f90nml.read(structures[0]['pwi'])['electrons']['startingwfc'] == 'file'
+
+
+def test_explicit_grid_is_kept(tmp_path, si_prim):
+    manifest = sweep(tmp_path, si_prim, [-1, 0, 1], nr1=48, nr2=48, nr3=48)
+    with open(manifest) as f:
+        structures = json.load(f)['structures']
+    assert all(warm_start.input_fft_grid(structure['pwi']) == [48, 48, 48] for structure in structures)
+
+
+def test_fake_sweep_starts_warm(tmp_path, si_prim):
+    workflow, starts = warm_start.sweep_workflow(sweep(tmp_path, si_prim, [-2, -1, 0, 1, 2]), total_cores=2, launcher=FAKE_LAUNCHER, binaries=FAKE_BINARIES)
+    assert set(workflow.run().values()) == {'done'}
+    assert starts == {'warm': 4, 'cold': 0}
+
+
+def test_cold_start_without_a_converged_seed(tmp_path, si_prim):
+    with open(sweep(tmp_path, si_prim, [0, 1])) as f:
+        seed_pwi, pwi = [structure['pwi'] for structure in json.load(f)['structures']]
+    warm, reason = warm_start.seed(seed_pwi, seed_pwi[:-len('.in')] + '.out', pwi, str(tmp_path / 'sweep'))
+    assert not warm and 'did not converge' in reason
+    assert 'startingwfc' not in f90nml.read(pwi)['electrons']
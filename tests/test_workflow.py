@@ -0,0 +1,78 @@
+import json
+import sys
+
+import pytest
+
+import executors
+import workflow
+from conftest import scf_template
+from state import StateStore
+from workflow import FAKE_BINARIES, FAKE_LAUNCHER, Stage, Workflow, build_pipeline
+
+
+def fake_pipeline(tmp_path, si_prim, vcrelax=False):
+    template = tmp_path / 'scf.json'
+    template.write_text(json.dumps(scf_template(str(tmp_path))))
+    vcrelax_template = None
+    if vcrelax:
+        data = scf_template(str(tmp_path))
+        data['control']['calculation'] = 'vc-relax'
+        vcrelax_template = tmp_path / 'vcrelax.json'
+        vcrelax_template.write_text(json.dumps(data))
+        vcrelax_template = str(vcrelax_template)
+    state = StateStore(str(tmp_path / 'run' / 'Si.state.json'))
+    return build_pipeline(si_prim, str(tmp_path / 'run'), 'Si', str(template), vcrelax_template, total_cores=4, launcher=FAKE_LAUNCHER,
+                          binaries=FAKE_BINARIES, state=state, poll_interval=0.05)
+
+
+def test_dependency_errors():
+    flow = Workflow()
+    flow.add(Stage('scf', action=lambda: None, depends=['relax']))
+    with pytest.raises(ValueError):
+        flow.run()
+    with pytest.raises(ValueError):
+        flow.add(Stage('scf', action=lambda: None))
+
+
+def test_failure_skips_dependents(tmp_path):
+    def fail():
+        raise RuntimeError('failed')
+
+    flow = Workflow(workdir=str(tmp_path))
+    flow.add(Stage('scf', action=fail))
+    flow.add(Stage('nscf', action=lambda: None, depends=['scf']))
+    flow.add(Stage('cleanup', action=lambda: None, after=['nscf']))
+    assert flow.run() == {'scf': 'failed', 'nscf': 'skipped', 'cleanup': 'done'}
+
+
+def test_fake_pipeline_resumes(tmp_path, si_prim, capsys):
+    statuses = fake_pipeline(tmp_path, si_prim).run()
+    assert set(statuses) == {'gen_post', 'scf', 'copy_bands', 'copy_dos', 'bands_nscf', 'bands', 'nscf', 'dos', 'pdos'}
+    assert set(statuses.values()) == {'done'}
+    first = capsys.readouterr().out
+    assert first.count('Started') == 6
+
+    assert set(fake_pipeline(tmp_path, si_prim).run().values()) == {'done'}
+    second = capsys.readouterr().out
+    assert 'Started' not in second and second.count('Resumed') == len(statuses)
+
+
+def test_fake_pipeline_with_vcrelax(tmp_path, si_prim):
+    statuses = fake_pipeline(tmp_path, si_prim, vcrelax=True).run()
+    assert statuses['vcrelax'] == 'done' and set(statuses.values()) == {'done'}
+    assert (tmp_path / 'run' / 'Si.vcrelax_out.poscar').exists()
+
+
+def test_array_executor_keeps_plan(tmp_path, si_prim, monkeypatch):
+    captured = {}
+
+    def make_executor(*args, **options):
+        captured.update(options)
+        raise SystemExit(0)
+
+    monkeypatch.setattr(executors, 'make_executor', make_executor)
+    monkeypatch.setattr(sys, 'argv', ['workflow.py', '-p', si_prim, '-o', str(tmp_path), '-sn', 'Si', '-t', 'scf.json',
+                                      '--executor', 'array', '--plan', '--directive=--partition=short'])
+    with pytest.raises(SystemExit):
+        workflow.main()
+    assert captured['plan'] is True and captured['directives'] == ['--partition=short']
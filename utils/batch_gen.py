@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 11:02:18 AM IST 2026
+###########################################################################
+# Purpose : This script generates Quantum Espresso input files for many
+#           POSCAR files at once, spread over a pool of worker processes.
+###########################################################################
+
+import argparse
+import glob
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pwtk
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+# kind -> (pwtk command, {argument: file suffix}) for the files of one structure
+KINDS = {
+    'pwi': ('poscar2pwi', {'pwi': '.in'}),
+    'bands': ('gen_bands', {'scf': '.scf.in', 'nscf': '.nscf.in', 'bands': '.bands.in', 'bands_data': '.bands.dat'}),
+    'dos': ('gen_dos', {'scf': '.scf.in', 'nscf': '.nscf.in', 'dos': '.dos.in', 'dos_data': '.dos.dat'}),
+    'pdos': ('gen_pdos', {'scf': '.scf.in', 'nscf': '.nscf.in', 'pdos': '.pdos.in', 'pdos_data': '.pdos.dat'}),
+    # gen_post names its own files (see gen_post.SUFFIXES) inside output_dir
+    'post': ('gen_post', {}),
+}
+
+
+def find_poscars(sources):
+    """
+    Expand directories and glob patterns into a sorted list of POSCAR files.
+
+    Parameters:
+        sources (list): Directories (all *.poscar and POSCAR* files inside),
+            glob patterns or plain file paths.
+
+    Returns:
+        list: Unique POSCAR file paths.
+    """
+    poscars = set()
+    for source in sources:
+        if os.path.isdir(source):
+            poscars.update(glob.glob(os.path.join(source, '*.poscar')))
+            poscars.update(glob.glob(os.path.join(source, 'POSCAR*')))
+        else:
+            poscars.update(path for path in glob.glob(source) if os.path.isfile(path))
+    return sorted(poscars)
+
+
+def system_name_of(poscar_path):
+    """
+    Derive the system name of a POSCAR file from its file name.
+
+    Parameters:
+        poscar_path (str): Path to the POSCAR file.
+
+    Returns:
+        str: File name without directory and '.poscar' extension.
+    """
+    name = os.path.basename(poscar_path)
+    if name.endswith('.poscar'):
+        name = name[:-len('.poscar')]
+    return name
+
+
+def build_jobs(kind, template_path, poscars, output_dir):
+    """
+    Build one pwtk job per POSCAR file.
+
+    Output files are named <output_dir>/<system_name><suffix>, following the
+    naming used by tests/run_gen_bands.sh.
+
+    Parameters:
+        kind (str): One of 'pwi', 'bands', 'dos', 'pdos' or 'post'.
+        template_path (str): Path to the template file.
+        poscars (list): POSCAR file paths.
+        output_dir (str): Directory receiving the generated files.
+
+    Returns:
+        list: Job dictionaries understood by pwtk.run.
+    """
+    if kind not in KINDS:
+        raise ValueError("Invalid kind '{:s}'. Choose from: {:s}".format(kind, ', '.join(KINDS)))
+    command, suffixes = KINDS[kind]
+
+    jobs = []
+    for poscar_path in poscars:
+        system_name = system_name_of(poscar_path)
+        job = {'command': command, 'template': template_path, 'poscar': poscar_path}
+        for argument, suffix in suffixes.items():
+            job[argument] = os.path.join(output_dir, system_name + suffix)
+        if command == 'gen_post':
+            job['output_dir'] = output_dir
+        if command != 'poscar2pwi':
+            job['system_name'] = system_name
+        jobs.append(job)
+    return jobs
+
+
+def run_job(job, cache_dir=None, force=False):
+    """
+    Run a single job and capture its outcome instead of raising.
+
+    Parameters:
+        job (dict): Job dictionary understood by pwtk.run.
+        cache_dir (str): Use the cache of generated inputs in this directory
+            ('' for the default directory, None for no cache).
+        force (bool): Regenerate even on a cache hit.
+
+    Returns:
+        dict: The POSCAR path, 'success' or 'failed' status, whether the files
+        came from the cache, and the error message.
+    """
+    kwargs = dict(job)
+    command = kwargs.pop('command')
+    cached = False
+    try:
+        if cache_dir is None:
+            pwtk.run(command, quiet=True, **kwargs)
+        else:
+            from cache import Cache, run_cached
+            cached = run_cached(command, cache=Cache(cache_dir or None), force=force, quiet=True, **kwargs) == 'hit'
+    except Exception as error:
+        return {'poscar': job['poscar'], 'status': 'failed', 'cached': False, 'error': '{:s}: {:s}'.format(type(error).__name__, str(error))}
+    return {'poscar': job['poscar'], 'status': 'success', 'cached': cached, 'error': None}
+
+
+def run_jobs(jobs, workers=None, chunksize=None, cache_dir=None, force=False):
+    """
+    Run jobs over a pool of worker processes.
+
+    Each worker imports ASE/f90nml once and then serves many jobs, so the
+    import cost is paid per worker, not per structure.
+
+    Parameters:
+        jobs (list): Job dictionaries understood by pwtk.run.
+        workers (int): Number of worker processes (default: CPU count).
+            With workers=1 the jobs run in the current process.
+        chunksize (int): Jobs handed to a worker at a time (default: an even
+            split into about four chunks per worker).
+        cache_dir (str): See run_job.
+        force (bool): See run_job.
+
+    Returns:
+        list: One result dictionary per job, in job order.
+    """
+    if not jobs:
+        return []
+    workers = workers or os.cpu_count() or 1
+    run = functools.partial(run_job, cache_dir=cache_dir, force=force)
+    if workers == 1:
+        return [run(job) for job in jobs]
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, jobs, chunksize=chunksize))
+
+
+def generate_batch(kind, template_path, sources, output_dir, workers=None, cache_dir=None, force=False):
+    """
+    Generate Quantum Espresso input files for every POSCAR in sources.
+
+    Parameters:
+        kind (str): One of 'pwi', 'bands', 'dos', 'pdos' or 'post'.
+        template_path (str): Path to the template file.
+        sources (list): Directories, glob patterns or POSCAR file paths.
+        output_dir (str): Directory receiving the generated files.
+        workers (int): Number of worker processes (default: CPU count).
+        cache_dir (str): See run_job.
+        force (bool): See run_job.
+
+    Returns:
+        list: One result dictionary per POSCAR file.
+    """
+    poscars = find_poscars(sources)
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = build_jobs(kind, template_path, poscars, output_dir)
+    return run_jobs(jobs, workers=workers, cache_dir=cache_dir, force=force)
+
+
+def main():
+    """
+    Main function to parse command line arguments and execute the batch generation.
+    """
+    parser = argparse.ArgumentParser(description="Generate Quantum ESPRESSO input files for many POSCAR files in parallel.")
+    parser.add_argument("-k", "--kind", choices=list(KINDS), help="Kind of input files to generate", required=True)
+    parser.add_argument("-t", "--template", help="Path to the template file", metavar="Template_filename", required=True)
+    parser.add_argument("-p", "--poscars", nargs="+", help="POSCAR files, directories or glob patterns", metavar="POSCAR", required=True)
+    parser.add_argument("-o", "--output-dir", help="Directory for the generated files", metavar="Output_dir", required=True)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("-c", "--cache", nargs="?", const="", default=None, metavar="Cache_dir", help="Reuse previously generated inputs (default directory: $PWTK_CACHE_DIR or ~/.cache/pwtk)")
+    parser.add_argument("-f", "--force", action="store_true", help="Regenerate all inputs even on a cache hit")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    results = generate_batch(args.kind, args.template, args.poscars, args.output_dir, workers=args.workers, cache_dir=args.cache, force=args.force)
+    failed = [result for result in results if result['status'] != 'success']
+
+    print("-----------------------------------------------------------")
+    print("POSCAR files processed              : {:d}".format(len(results)))
+    print("Succeeded                           : {:d}".format(len(results) - len(failed)))
+    print("Taken from the cache                : {:d}".format(sum(result['cached'] for result in results)))
+    print("Failed                              : {:d}".format(len(failed)))
+    for result in failed:
+        print("  {:s}: {:s}".format(result['poscar'], result['error']))
+    print("-----------------------------------------------------------")
+
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 10:41:09 PM IST 2026
+###########################################################################
+# Purpose : Benchmark suite of the pwtk generators and parsers: latency,
+#           throughput and peak memory of each utility on the assets/POSCARS
+#           structures, synthetic supercells and synthetic pw.x outputs,
+#           compared against a saved baseline.
+###########################################################################
+#
+# Every case is a utility called on one structure. Each case is run once to
+# warm up, then timed repeatedly (at least once, at most --rounds times,
+# until --max-time seconds are spent), then run once more under tracemalloc
+# for the peak memory. Results are keyed '<utility>[<structure>]', so a
+# baseline saved with --save can be checked later with --compare; a case
+# whose fastest call got slower by more than --threshold is reported as a
+# regression and makes the script exit with status 1.
+#
+# Nothing here needs Quantum Espresso: the pw.x outputs are written by
+# fake_qe.py with extra ionic steps spliced in.
+###########################################################################
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(os.path.dirname(UTILS_DIR), 'assets', 'POSCARS')
+TEMPLATE_PATH = os.path.join(os.path.dirname(UTILS_DIR), 'templates', 'template.scf.dat')
+
+# Atom counts of the synthetic supercells (repeats of the conventional Si cell)
+SUPERCELL_SIZES = [1000, 10000, 100000]
+SUPERCELL_BASE = 'Si.conv.poscar'
+
+# Ionic steps written into each synthetic pw.x output
+PWO_STEPS = 20
+
+# Allowed growth of the fastest call time before a case counts as a regression
+THRESHOLD = 0.2
+
+# compare_poscars matches atoms pairwise: its memory grows as atoms^2
+COMPARE_MAX_ATOMS = 2000
+
+
+def quiet_call(function, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args)
+
+
+def measure(function, rounds=100, max_time=2.0):
+    """
+    Time a function and measure its peak memory.
+
+    Parameters:
+        function (callable): Function without arguments.
+        rounds (int): Largest number of timed calls.
+        max_time (float): Stop timing once this many seconds are spent.
+
+    Returns:
+        dict: 'rounds', 'min', 'median', 'mean' and 'stdev' of the call time
+        in seconds, and 'peak_bytes' allocated during one call.
+    """
+    function()
+    times = []
+    while len(times) < rounds and sum(times) < max_time:
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'rounds': len(times),
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.mean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'peak_bytes': peak,
+    }
+
+
+def write_template(poscars, template_path, workdir):
+    """
+    Copy a template, adding a pseudopotential name for every element of the
+    structures and pointing outdir into the work directory.
+
+    Returns:
+        str: Path of the new template.
+    """
+    from ase.io import read
+
+    with open(template_path, 'r') as f:
+        template = json.load(f)
+    for poscar_path in poscars:
+        for symbol in set(read(poscar_path).get_chemical_symbols()):
+            template['pseudopotentials'].setdefault(symbol, symbol + '.UPF')
+    # No pseudopotential files to take cutoffs from
+    from pseudo import DEFAULT_ECUTWFC
+    for key in ('ecutwfc', 'ecutrho'):
+        if key in template['system'] and template['system'][key] in ('auto', None):
+            template['system'][key] = DEFAULT_ECUTWFC * (1 if key == 'ecutwfc' else 4)
+    template['control']['outdir'] = os.path.join(workdir, 'outdir')
+    path = os.path.join(workdir, 'template.json')
+    with open(path, 'w') as f:
+        json.dump(template, f, indent=2)
+    return path
+
+
+def write_supercell(poscar_path, natoms, workdir):
+    """
+    Repeat a structure into a cubic-ish supercell of about natoms atoms.
+
+    Returns:
+        str: Path of the supercell POSCAR file.
+    """
+    from ase.io import read, write
+
+    atoms = read(poscar_path)
+    repeat = max(1, int(round((natoms / len(atoms)) ** (1.0 / 3.0))))
+    supercell = atoms.repeat(repeat)
+    name = os.path.basename(poscar_path)[:-len('.poscar')]
+    path = os.path.join(workdir, '{:s}_{:d}x{:d}x{:d}.poscar'.format(name, repeat, repeat, repeat))
+    write(path, supercell, format='vasp', direct=True)
+    return path
+
+
+def write_pwo(poscar_path, template_path, steps, workdir):
+    """
+    Write a vc-relax pw.x output of a structure with a number of ionic steps,
+    using fake_qe.py for the header and the final coordinates.
+
+    Returns:
+        str: Path of the output file.
+    """
+    from ase.io import read
+    from fake_qe import run
+    from pwi_renderer import from_template
+
+    with open(template_path, 'r') as f:
+        template = json.load(f)
+    template['control']['calculation'] = 'vc-relax'
+    template['crystal_coordinates'] = False
+    atoms = read(poscar_path)
+    output = io.StringIO()
+    run('pw.x', from_template(template).render(atoms), output)
+
+    text = output.getvalue()
+    begin = text.index('Begin final coordinates\n')
+    end = text.index('End final coordinates')
+    step = "!    total energy              =     -10.00000000 Ry\n\n" + text[begin + len('Begin final coordinates\n'):end]
+    path = os.path.join(workdir, os.path.basename(poscar_path)[:-len('.poscar')] + '.vcrelax.out')
+    with open(path, 'w') as f:
+        f.write(text[:begin])
+        for _ in range(steps):
+            f.write(step)
+        f.write(text[begin:])
+    return path
+
+
+def structure_cases(poscar_path, template_path, workdir, pwo_steps=PWO_STEPS):
+    """
+    Build the benchmark cases of one structure.
+
+    Returns:
+        list: (case name, atom count, input bytes, function) tuples.
+    """
+    from ase.io import read
+
+    import gen_bands
+    import gen_dos
+    import gen_pdos
+    import gen_post
+    from compare_poscar import compare_poscars
+    from gen_strain import apply_strain
+    from poscar2pwi import convert_poscar_to_pwi
+    from pwo2poscar import convert_pwo_to_poscar
+
+    name = os.path.basename(poscar_path)[:-len('.poscar')]
+    out = os.path.join(workdir, 'out', name)
+    os.makedirs(out, exist_ok=True)
+    atoms = read(poscar_path)
+    size = os.path.getsize(poscar_path)
+
+    def path(suffix):
+        return os.path.join(out, name + suffix)
+
+    cases = [
+        ('convert_poscar_to_pwi', lambda: quiet_call(convert_poscar_to_pwi, template_path, poscar_path, path('.in'))),
+        ('gen_bands.generate_input', lambda: quiet_call(gen_bands.generate_input, template_path, poscar_path, path('.scf.in'), path('.nscf.in'),
+                                                        path('.bands.in'), path('.bands.dat'), name)),
+        ('gen_dos.generate_input', lambda: quiet_call(gen_dos.generate_input, template_path, poscar_path, path('.scf.in'), path('.nscf.in'),
+                                                      path('.dos.in'), path('.dos.dat'), name)),
+        ('gen_pdos.generate_input', lambda: quiet_call(gen_pdos.generate_input, template_path, poscar_path, path('.scf.in'), path('.nscf.in'),
+                                                       path('.pdos.in'), path('.pdos.dat'), name)),
+        ('gen_post.generate_input', lambda: quiet_call(gen_post.generate_input, template_path, poscar_path, out, name)),
+        ('apply_strain', lambda: apply_strain(atoms.copy(), 'x', 1.0)),
+    ]
+    if len(atoms) <= COMPARE_MAX_ATOMS:
+        cases.append(('compare_poscars', lambda: quiet_call(compare_poscars, poscar_path, poscar_path)))
+    cases = [('{:s}[{:s}]'.format(utility, name), len(atoms), size, function) for utility, function in cases]
+
+    pwo_path = write_pwo(poscar_path, template_path, pwo_steps, workdir)
+    cases.append(('convert_pwo_to_poscar[{:s}]'.format(name), len(atoms), os.path.getsize(pwo_path),
+                  lambda: quiet_call(convert_pwo_to_poscar, pwo_path, path('.relaxed.poscar'))))
+    return cases
+
+
+def run_suite(poscars=None, sizes=SUPERCELL_SIZES, rounds=100, max_time=2.0, pwo_steps=PWO_STEPS, select=None, template_path=TEMPLATE_PATH):
+    """
+    Run the benchmark suite.
+
+    Parameters:
+        poscars (list): Structures to benchmark (default: assets/POSCARS).
+        sizes (list): Atom counts of the synthetic supercells.
+        rounds (int): Largest number of timed calls per case.
+        max_time (float): Timing budget per case in seconds.
+        pwo_steps (int): Ionic steps of the synthetic pw.x outputs.
+        select (str): Only run cases whose name contains this text.
+        template_path (str): Template the inputs are generated from.
+
+    Returns:
+        dict: Benchmark results per case name (see measure), with 'atoms',
+        'bytes', 'atoms_per_second' and 'megabytes_per_second' added.
+    """
+    import batch_gen
+
+    poscars = poscars or batch_gen.find_poscars([ASSETS_DIR])
+    workdir = tempfile.mkdtemp(prefix='pwtk-benchmark-')
+    try:
+        supercells = [write_supercell(os.path.join(ASSETS_DIR, SUPERCELL_BASE), natoms, workdir) for natoms in sizes]
+        template = write_template(poscars + supercells, template_path, workdir)
+        results = {}
+        for poscar_path in poscars + supercells:
+            for name, natoms, nbytes, function in structure_cases(poscar_path, template, workdir, pwo_steps):
+                if select and select not in name:
+                    continue
+                result = measure(function, rounds, max_time)
+                result.update({'atoms': natoms, 'bytes': nbytes, 'atoms_per_second': natoms / result['median'],
+                               'megabytes_per_second': nbytes / result['median'] / 1e6})
+                results[name] = result
+                print("{:<48s} {:>9.4f} s {:>12.0f} atoms/s {:>9.1f} MB peak".format(
+                    name, result['median'], result['atoms_per_second'], result['peak_bytes'] / 1e6), flush=True)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Compare results with a baseline.
+
+    The fastest call is compared, as the least disturbed by other load.
+
+    Returns:
+        list: (case name, time ratio) of the regressions.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name in baseline:
+            ratio = result['min'] / baseline[name]['min']
+            if ratio > 1.0 + threshold:
+                regressions.append((name, ratio))
+    return regressions
+
+
+def main():
+    """
+    Main function to parse command line arguments and run the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the pwtk generators and parsers.")
+    parser.add_argument("-p", "--poscars", nargs="+", default=None, help="POSCAR files, directories or glob patterns (default: assets/POSCARS)", metavar="POSCAR")
+    parser.add_argument("-n", "--sizes", type=int, nargs="*", default=SUPERCELL_SIZES, help="Atom counts of the synthetic supercells (default: %(default)s)")
+    parser.add_argument("-r", "--rounds", type=int, default=100, help="Largest number of timed calls per case (default: 100)")
+    parser.add_argument("--max-time", type=float, default=2.0, help="Timing budget per case in seconds (default: 2.0)")
+    parser.add_argument("--pwo-steps", type=int, default=PWO_STEPS, help="Ionic steps of the synthetic pw.x outputs (default: %(default)s)")
+    parser.add_argument("-k", "--select", default=None, help="Only run cases whose name contains this text")
+    parser.add_argument("-s", "--save", default=None, help="Save the results as a baseline JSON file", metavar="Baseline_filename")
+    parser.add_argument("-c", "--compare", default=None, help="Compare with a baseline JSON file", metavar="Baseline_filename")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Allowed relative growth of the fastest call time (default: %(default)s)")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    poscars = None
+    if args.poscars:
+        from batch_gen import find_poscars
+        poscars = find_poscars(args.poscars)
+
+    print("-----------------------------------------------------------")
+    results = run_suite(poscars, args.sizes, args.rounds, args.max_time, args.pwo_steps, args.select)
+    print("-----------------------------------------------------------")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'version': VERSION, 'machine': platform.node(), 'python': platform.python_version(),
+                       'numpy': np.__version__, 'time': time.time(), 'results': results}, f, indent=2)
+        print("Baseline saved to                   : {:s}".format(args.save))
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        print("Cases compared with the baseline    : {:d}".format(len(set(results) & set(baseline))))
+        print("Regressions (> {:.0f}% slower)          : {:d}".format(100 * args.threshold, len(regressions)))
+        for name, ratio in regressions:
+            print("  {:<46s} {:.2f}x".format(name, ratio))
+        print("-----------------------------------------------------------")
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
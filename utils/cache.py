@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 04:52:33 PM IST 2026
+###########################################################################
+# Purpose : Content-addressed cache of generated Quantum Espresso inputs and
+#           of completed Quantum Espresso runs.
+###########################################################################
+#
+# Generated inputs are keyed by a hash of the normalised structure, the
+# template content, the source of the generator module and of every pwtk
+# module it imports, the remaining arguments (output paths, system name)
+# and, when the template leaves pseudopotentials, cutoffs or nbnd to the
+# pseudopotential index, the pseudo directory and the headers of its UPF
+# files. A hit copies the cached files into place instead of running the
+# generator.
+#
+# Completed runs are keyed by the binary and the content of its input file.
+# A run is skipped when its output file is still on disk, finished with
+# JOB DONE and is the very file recorded when the run completed; the outdir
+# of that run is then assumed to be in place as well.
+###########################################################################
+
+import argparse
+import ast
+import functools
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+import pwtk
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+DEFAULT_CACHE_DIR = os.environ.get('PWTK_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'pwtk'))
+DEFAULT_MAX_BYTES = 1024 ** 3
+
+# Arguments of each pwtk command that are read rather than written
+INPUT_ARGUMENTS = ('template', 'poscar')
+
+# Files written by each cacheable pwtk command, as a function of its arguments
+OUTPUT_FILES = {
+    'poscar2pwi': lambda kwargs: [kwargs['pwi']],
+    'gen_bands': lambda kwargs: [kwargs['scf'], kwargs['nscf'], kwargs['bands']],
+    'gen_dos': lambda kwargs: [kwargs['scf'], kwargs['nscf'], kwargs['dos']],
+    'gen_pdos': lambda kwargs: [kwargs['scf'], kwargs['nscf'], kwargs['pdos']],
+}
+
+
+def _gen_post_outputs(kwargs):
+    import gen_post
+    paths = gen_post.get_paths(kwargs['output_dir'], kwargs['system_name'])
+    return [path for key, path in paths.items() if not key.endswith('_data')]
+
+
+OUTPUT_FILES['gen_post'] = _gen_post_outputs
+
+
+def file_hash(path):
+    """
+    Return the SHA-256 digest of a file.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def structure_hash(poscar_path, decimals=6):
+    """
+    Hash a POSCAR structure independently of formatting.
+
+    The cell and the wrapped fractional positions are rounded to the given
+    number of decimals. The atoms keep the order of the file, which is the
+    order of the generated inputs, with their Selective dynamics flags.
+    Files that cannot be parsed are hashed byte for byte.
+
+    Parameters:
+        poscar_path (str): Path to the POSCAR file.
+        decimals (int): Rounding applied before hashing.
+
+    Returns:
+        str: Hexadecimal SHA-256 digest.
+    """
+    from compare_poscar import read_poscar, read_selective_dynamics, species_of
+    try:
+        data = read_poscar(poscar_path)
+        flags = read_selective_dynamics(poscar_path)
+    except (ValueError, IndexError):
+        return file_hash(poscar_path)
+    cell = np.round(data[1], decimals) + 0.0
+    positions = np.round(data[4], decimals) % 1.0 + 0.0
+    atoms = list(zip(species_of(data).tolist(), map(tuple, positions.tolist())))
+    return hashlib.sha256(repr((cell.tolist(), atoms, flags)).encode()).hexdigest()
+
+
+def template_hash(template_path):
+    """
+    Hash the content of a JSON template independently of its formatting.
+    """
+    with open(template_path, 'r') as f:
+        template = json.load(f)
+    return hashlib.sha256(json.dumps(template, sort_keys=True).encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def source_closure(module_name, utils_dir=pwtk.UTILS_DIR):
+    """
+    Return the source files of a pwtk module and of the pwtk modules it
+    imports, directly or not (imports inside functions included).
+
+    Parameters:
+        module_name (str): Module of utils_dir.
+        utils_dir (str): Directory of the pwtk modules.
+
+    Returns:
+        tuple: Sorted paths of the source files.
+    """
+    paths, pending = set(), [module_name]
+    while pending:
+        path = os.path.join(utils_dir, pending.pop() + '.py')
+        if path in paths or not os.path.exists(path):
+            continue
+        paths.add(path)
+        with open(path, 'r') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module)
+    return tuple(sorted(paths))
+
+
+def generator_hash(command):
+    """
+    Hash the source of the module implementing a pwtk command and of the
+    pwtk modules it imports (its version).
+    """
+    digest = hashlib.sha256()
+    for path in source_closure(pwtk.COMMANDS[command][0], pwtk.UTILS_DIR):
+        digest.update('{:s}\n{:s}\n'.format(os.path.basename(path), file_hash(path)).encode())
+    return digest.hexdigest()
+
+
+def pseudo_hash(template_path, poscar_path):
+    """
+    Hash the pseudopotential index a template is resolved with (see
+    pseudo.resolve_template and occupations.with_bands): the pseudo
+    directory and the UPF headers it holds, or '' when the template gives
+    everything explicitly.
+
+    Parameters:
+        template_path (str): Path to the JSON template.
+        poscar_path (str): Path to the POSCAR file (its species).
+
+    Returns:
+        str: Hexadecimal SHA-256 digest, or ''.
+    """
+    from compare_poscar import read_poscar, species_of
+    from pseudo import build_index, default_pseudo_dir, needs_index
+
+    with open(template_path, 'r') as f:
+        template = json.load(f)
+    try:
+        symbols = species_of(read_poscar(poscar_path)).tolist()
+    except (ValueError, IndexError):
+        symbols = None
+    if symbols is not None and not needs_index(template, symbols) and template.get('system', {}).get('nbnd') != 'auto':
+        return ''
+
+    pseudo_dir = os.path.abspath(os.path.expanduser(template.get('control', {}).get('pseudo_dir') or default_pseudo_dir()))
+    try:
+        index = build_index(pseudo_dir)
+    except ValueError:
+        index = None
+    # The metadata only: a file touched without changes keeps the key
+    headers = index and {name: {field: entry[field] for field in entry if field not in ('size', 'mtime')} for name, entry in index.items()}
+    return hashlib.sha256(json.dumps([pseudo_dir, headers], sort_keys=True).encode()).hexdigest()
+
+
+class Cache:
+    """
+    Directory of cached generated inputs and completed-run records.
+
+    Parameters:
+        cache_dir (str): Cache directory (default: $PWTK_CACHE_DIR or ~/.cache/pwtk).
+        max_bytes (int): Size above which the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(self.cache_dir, 'inputs'), exist_ok=True)
+        os.makedirs(os.path.join(self.cache_dir, 'runs'), exist_ok=True)
+
+    def input_key(self, command, kwargs):
+        """
+        Return the cache key of a generator call.
+        """
+        parts = [command, generator_hash(command)]
+        for name in sorted(kwargs):
+            if name == 'poscar':
+                parts.append('poscar=' + structure_hash(kwargs[name]))
+            elif name == 'template':
+                parts.append('template=' + template_hash(kwargs[name]))
+            else:
+                parts.append('{:s}={:s}'.format(name, str(kwargs[name])))
+        if 'template' in kwargs and 'poscar' in kwargs:
+            parts.append('pseudo=' + pseudo_hash(kwargs['template'], kwargs['poscar']))
+        return hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, 'inputs', key)
+
+    def get_files(self, key, destinations):
+        """
+        Copy the cached files of an entry to their destinations.
+
+        Returns:
+            bool: False if the entry does not exist.
+        """
+        entry = self._entry(key)
+        if not os.path.isdir(entry):
+            return False
+        for index, destination in enumerate(destinations):
+            source = os.path.join(entry, str(index))
+            if not os.path.exists(source):
+                return False
+            if os.path.dirname(destination):
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copyfile(source, destination)
+        # Touch the entry so eviction sees it as recently used
+        os.utime(entry)
+        return True
+
+    def put_files(self, key, sources):
+        """
+        Store files under a key. Concurrent writers of the same key are fine:
+        the entry is assembled aside and moved into place atomically.
+        """
+        entry = self._entry(key)
+        if os.path.isdir(entry):
+            return
+        staging = tempfile.mkdtemp(dir=os.path.join(self.cache_dir, 'inputs'), prefix='.tmp-')
+        for index, source in enumerate(sources):
+            shutil.copyfile(source, os.path.join(staging, str(index)))
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def _run_record(self, binary, input_path):
+        key = hashlib.sha256('{:s}\n{:s}'.format(binary, file_hash(input_path)).encode()).hexdigest()
+        return os.path.join(self.cache_dir, 'runs', key + '.json')
+
+    def run_completed(self, binary, input_path, output_path):
+        """
+        Tell whether a run with this binary and input already completed
+        and its output file is still the one recorded at completion.
+        """
+        record_path = self._run_record(binary, input_path)
+        if not os.path.exists(record_path) or not os.path.exists(output_path):
+            return False
+        with open(record_path, 'r') as f:
+            record = json.load(f)
+        return record['output_path'] == os.path.abspath(output_path) and record['output_hash'] == file_hash(output_path)
+
+    def record_run(self, binary, input_path, output_path):
+        """
+        Record a completed run (its output file must end with JOB DONE).
+
+        Returns:
+            bool: True if the run was recorded.
+        """
+        with open(output_path, 'rb') as f:
+            f.seek(max(0, os.path.getsize(output_path) - 4096))
+            if b'JOB DONE.' not in f.read():
+                return False
+        record = {'binary': binary, 'input_path': os.path.abspath(input_path), 'output_path': os.path.abspath(output_path),
+                  'output_hash': file_hash(output_path), 'time': time.time()}
+        with open(self._run_record(binary, input_path), 'w') as f:
+            json.dump(record, f)
+        return True
+
+    def size(self):
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
+
+    def evict(self):
+        """
+        Remove least recently used input entries until the cache fits max_bytes.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        inputs_dir = os.path.join(self.cache_dir, 'inputs')
+        entries = []
+        total = 0
+        for name in os.listdir(inputs_dir):
+            path = os.path.join(inputs_dir, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, item)) for item in os.listdir(path))
+            entries.append((os.path.getmtime(path), size, path))
+            total += size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+def run_cached(command, cache=None, force=False, quiet=False, **kwargs):
+    """
+    Run a pwtk generator through the cache.
+
+    Parameters:
+        command (str): pwtk command (a key of OUTPUT_FILES).
+        cache (Cache): Cache to use (default: Cache()).
+        force (bool): Regenerate even on a cache hit (the cache is refreshed).
+        quiet (bool): Suppress the banner printed by the generator.
+        **kwargs: Arguments of the command, as for pwtk.run.
+
+    Returns:
+        str: 'hit' if the files came from the cache, 'generated' otherwise.
+    """
+    if command not in OUTPUT_FILES:
+        raise ValueError("Command '{:s}' cannot be cached".format(command))
+    cache = cache or Cache()
+    key = cache.input_key(command, kwargs)
+    outputs = OUTPUT_FILES[command](kwargs)
+
+    if not force and cache.get_files(key, outputs):
+        if not quiet:
+            print("Cache hit for {:s}: {:s}".format(command, ', '.join(outputs)))
+        return 'hit'
+
+    if force:
+        shutil.rmtree(cache._entry(key), ignore_errors=True)
+    pwtk.run(command, quiet=quiet, **kwargs)
+    cache.put_files(key, outputs)
+    return 'generated'
+
+
+def main():
+    """
+    Main function to inspect or trim the cache.
+    """
+    parser = argparse.ArgumentParser(description="Inspect or trim the pwtk cache of generated inputs and completed runs.")
+    parser.add_argument("-c", "--cache-dir", default=None, help="Cache directory (default: $PWTK_CACHE_DIR or ~/.cache/pwtk)")
+    parser.add_argument("-m", "--max-bytes", type=int, default=DEFAULT_MAX_BYTES, help="Evict least recently used inputs above this size (default: 1 GiB)")
+    parser.add_argument("--clear", action="store_true", help="Remove the whole cache")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    cache = Cache(args.cache_dir, args.max_bytes)
+    if args.clear:
+        shutil.rmtree(cache.cache_dir)
+        print("Removed cache directory {:s}".format(cache.cache_dir))
+        return
+    removed = cache.evict()
+    print("-----------------------------------------------------------")
+    print("Cache directory                     : {:s}".format(cache.cache_dir))
+    print("Cached inputs                       : {:d}".format(len([name for name in os.listdir(os.path.join(cache.cache_dir, 'inputs')) if not name.startswith('.')])))
+    print("Completed runs recorded             : {:d}".format(len(os.listdir(os.path.join(cache.cache_dir, 'runs')))))
+    print("Entries evicted                     : {:d}".format(removed))
+    print("Size                                : {:d} bytes".format(cache.size()))
+    print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
@@ -4,82 +4,259 @@
 # Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
 # Written on Thu Apr  4 07:20:42 PM IST 2024
 ############################################################################
-# Purpose : This script compares two poscar files.
+# Purpose : This script compares two poscar files, or removes duplicates
+#           from a set of poscar files.
 ############################################################################
 import argparse
+import json
 
-def read_poscar(filename):
+import numpy as np
+
+# Default tolerances
+LATTICE_TOL = 1.0E-3    # Angstrom, on each lattice vector component
+POSITION_TOL = 1.0E-3   # Angstrom, on the periodic distance between atoms
+VOLUME_BIN = 0.05       # Angstrom^3 per atom, bin width of the fingerprint index
+
+
+def _coordinate_header(lines):
+    """
+    Skip the 'Selective dynamics' and 'Direct'/'Cartesian' lines of a POSCAR.
+
+    Returns:
+        tuple: (index of the first position line, Cartesian flag, selective dynamics flag).
+    """
+    start_index = 7
+    cartesian = selective = False
+    for line in lines[7:]:
+        keyword = line.strip().lower()
+        if keyword.startswith('s'):
+            selective = True
+            start_index += 1
+        elif keyword.startswith(('d', 'c', 'k')):
+            cartesian = not keyword.startswith('d')
+            start_index += 1
+            break
+        else:
+            break
+    return start_index, cartesian, selective
+
+
+def read_poscar(filename, verbose=False):
     with open(filename, 'r') as f:
         lines = f.readlines()
+    if verbose:
         print("Contents of the POSCAR file:")
         for line in lines:
             print(line.strip())
 
-    # Extract lattice parameters
+    # Extract lattice parameters (universal scaling factor)
     lattice_parameters = [float(x) for x in lines[1].split()]
 
     # Extract lattice vectors
-    lattice_vectors = [[float(x) for x in line.split()] for line in lines[2:5]]
+    lattice_vectors = np.array([[float(x) for x in line.split()[:3]] for line in lines[2:5]])
+    if len(lattice_parameters) == 1 and lattice_parameters[0] < 0:
+        # A negative scaling factor is the cell volume
+        scale = (-lattice_parameters[0] / abs(np.linalg.det(lattice_vectors))) ** (1.0 / 3.0)
+    else:
+        scale = np.array(lattice_parameters)
+    lattice_vectors *= scale
 
     # Extract atom types and numbers
     atom_types = lines[5].split()
     atom_numbers = [int(x) for x in lines[6].split()]
 
-    # Skip header lines and then extract atomic positions
-    start_index = 7
-    for line in lines[7:]:
-        if line.strip().lower() in ['direct', 'cartesian']:
-            start_index += 1
-        else:
-            break
+    start_index, cartesian, _ = _coordinate_header(lines)
+    natoms = sum(atom_numbers)
+    atomic_positions = np.array([[float(x) for x in line.split()[:3]] for line in lines[start_index:start_index + natoms]])
+    if cartesian:
+        # Cartesian positions take the same scaling as the lattice vectors
+        atomic_positions = np.linalg.solve(lattice_vectors.T, (atomic_positions * scale).T).T
 
-    atomic_positions = []
-    for line in lines[start_index:]:
-        atomic_positions.append([float(x) for x in line.split()[:3]])
+    # Wrap fractional positions into [0, 1)
+    atomic_positions -= np.floor(atomic_positions)
 
     return lattice_parameters, lattice_vectors, atom_types, atom_numbers, atomic_positions
 
 
-def compare_poscars(poscar1, poscar2):
+def read_selective_dynamics(filename):
+    """
+    Return the Selective dynamics flags of every atom of a POSCAR file.
+
+    Returns:
+        list: One (x, y, z) tuple of 'T'/'F' per atom, or None without Selective dynamics.
+    """
+    with open(filename, 'r') as f:
+        lines = f.readlines()
+    start_index, _, selective = _coordinate_header(lines)
+    if not selective:
+        return None
+    natoms = sum(int(x) for x in lines[6].split())
+    return [tuple(flag.upper()[:1] for flag in line.split()[3:6]) for line in lines[start_index:start_index + natoms]]
+
+
+def species_of(poscar_data):
+    """
+    Return the species label of every atom of a read_poscar result.
+    """
+    return np.repeat(poscar_data[2], poscar_data[3])
+
+
+def match_positions(positions1, positions2, cell, tol=POSITION_TOL):
+    """
+    Match two sets of fractional positions of one species under periodicity.
+
+    The atoms may be listed in any order; every atom of the first set must
+    have a distinct partner in the second set within tol.
+
+    Parameters:
+        positions1 (ndarray): n x 3 fractional positions.
+        positions2 (ndarray): n x 3 fractional positions.
+        cell (ndarray): 3 x 3 lattice vectors (rows) in Angstrom.
+        tol (float): Distance tolerance in Angstrom.
+
+    Returns:
+        bool: True if the two sets coincide.
+    """
+    if len(positions1) != len(positions2):
+        return False
+    if len(positions1) == 0:
+        return True
+    # All pairwise minimum-image displacements at once
+    delta = positions1[:, None, :] - positions2[None, :, :]
+    delta -= np.round(delta)
+    distances = np.linalg.norm(delta @ cell, axis=-1)
+    partners = np.argmin(distances, axis=1)
+    return bool(np.all(distances[np.arange(len(partners)), partners] < tol)) and len(set(partners.tolist())) == len(partners)
+
+
+def structures_match(poscar1_data, poscar2_data, lattice_tol=LATTICE_TOL, position_tol=POSITION_TOL):
+    """
+    Tolerance-aware comparison of two read_poscar results.
+
+    Parameters:
+        poscar1_data (tuple): Output of read_poscar.
+        poscar2_data (tuple): Output of read_poscar.
+        lattice_tol (float): Tolerance on lattice vector components (Angstrom).
+        position_tol (float): Tolerance on atomic distances (Angstrom).
+
+    Returns:
+        dict: Boolean 'lattice', 'species' and 'positions' checks.
+    """
+    result = {'lattice': bool(np.allclose(poscar1_data[1], poscar2_data[1], rtol=0.0, atol=lattice_tol))}
+    species1, species2 = species_of(poscar1_data), species_of(poscar2_data)
+    result['species'] = sorted(species1.tolist()) == sorted(species2.tolist())
+    result['positions'] = result['species'] and all(
+        match_positions(poscar1_data[4][species1 == label], poscar2_data[4][species2 == label], poscar1_data[1], position_tol)
+        for label in set(species1.tolist()))
+    return result
+
+
+def compare_poscars(poscar1, poscar2, lattice_tol=LATTICE_TOL, position_tol=POSITION_TOL):
     poscar1_data = read_poscar(poscar1)
     poscar2_data = read_poscar(poscar2)
-
-    # Compare lattice parameters
-    if poscar1_data[0] != poscar2_data[0]:
-        print("Lattice parameters are different:")
-        print("POSCAR 1:", poscar1_data[0])
-        print("POSCAR 2:", poscar2_data[0])
+    result = structures_match(poscar1_data, poscar2_data, lattice_tol, position_tol)
 
     # Compare lattice vectors
-    for i in range(3):
-        if poscar1_data[1][i] != poscar2_data[1][i]:
-            print("Lattice vectors are different:")
-            print("POSCAR 1:", poscar1_data[1][i])
-            print("POSCAR 2:", poscar2_data[1][i])
+    if not result['lattice']:
+        print("Lattice vectors are different:")
+        print("POSCAR 1:", poscar1_data[1].tolist())
+        print("POSCAR 2:", poscar2_data[1].tolist())
 
     # Compare atom types and numbers
-    if poscar1_data[2] != poscar2_data[2]:
-        print("Atom types are different:")
-        print("POSCAR 1:", poscar1_data[2])
-        print("POSCAR 2:", poscar2_data[2])
-    if poscar1_data[3] != poscar2_data[3]:
-        print("Atom numbers are different:")
-        print("POSCAR 1:", poscar1_data[3])
-        print("POSCAR 2:", poscar2_data[3])
+    if not result['species']:
+        print("Atom types or numbers are different:")
+        print("POSCAR 1:", poscar1_data[2], poscar1_data[3])
+        print("POSCAR 2:", poscar2_data[2], poscar2_data[3])
 
     # Compare atomic positions
-    if poscar1_data[4] != poscar2_data[4]:
+    if not result['positions']:
         print("Atomic positions are different:")
-        print("POSCAR 1:", poscar1_data[4])
-        print("POSCAR 2:", poscar2_data[4])
-    else:
+        print("POSCAR 1:", poscar1_data[4].tolist())
+        print("POSCAR 2:", poscar2_data[4].tolist())
+
+    identical = all(result.values())
+    if identical:
         print("The two POSCAR files are identical.")
+    return identical
+
+
+def fingerprint(poscar_data, volume_bin=VOLUME_BIN):
+    """
+    Index key of a structure: composition and binned volume per atom.
+
+    Parameters:
+        poscar_data (tuple): Output of read_poscar.
+        volume_bin (float): Bin width of the volume per atom (Angstrom^3).
+
+    Returns:
+        tuple: (composition, volume bin).
+    """
+    labels, counts = np.unique(species_of(poscar_data), return_counts=True)
+    composition = tuple(zip(labels.tolist(), counts.tolist()))
+    volume = abs(np.linalg.det(poscar_data[1])) / counts.sum()
+    return composition, int(np.floor(volume / volume_bin))
+
+
+def deduplicate(poscar_files, lattice_tol=LATTICE_TOL, position_tol=POSITION_TOL, volume_bin=VOLUME_BIN):
+    """
+    Group duplicate structures among many POSCAR files.
+
+    Structures are indexed by fingerprint; a new structure is only compared
+    in full with the unique structures of its own and the neighbouring
+    volume bins, so the cost stays close to linear in the number of files.
+
+    Parameters:
+        poscar_files (list): Paths to the POSCAR files.
+        lattice_tol (float): Tolerance on lattice vector components (Angstrom).
+        position_tol (float): Tolerance on atomic distances (Angstrom).
+        volume_bin (float): Bin width of the fingerprint index (Angstrom^3 per atom).
+
+    Returns:
+        dict: Path of each unique structure -> paths of its duplicates.
+    """
+    index = {}
+    groups = {}
+    for path in poscar_files:
+        data = read_poscar(path)
+        composition, volume_key = fingerprint(data, volume_bin)
+        match = None
+        for key in (volume_key, volume_key - 1, volume_key + 1):
+            for unique_path, unique_data in index.get((composition, key), []):
+                if all(structures_match(data, unique_data, lattice_tol, position_tol).values()):
+                    match = unique_path
+                    break
+            if match:
+                break
+        if match:
+            groups[match].append(path)
+        else:
+            index.setdefault((composition, volume_key), []).append((path, data))
+            groups[path] = []
+    return groups
+
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Compare two POSCAR files.')
-    parser.add_argument('--poscar1', help='Path to the first POSCAR file',required=True)
-    parser.add_argument('--poscar2', help='Path to the second POSCAR file', required=True)
+    parser = argparse.ArgumentParser(description='Compare two POSCAR files, or find duplicates among many.')
+    parser.add_argument('--poscar1', help='Path to the first POSCAR file')
+    parser.add_argument('--poscar2', help='Path to the second POSCAR file')
+    parser.add_argument('--batch', nargs='+', help='POSCAR files to deduplicate', metavar='POSCAR')
+    parser.add_argument('--output', help='JSON file receiving the duplicate groups (batch mode)')
+    parser.add_argument('--lattice-tol', type=float, default=LATTICE_TOL, help='Lattice vector tolerance in Angstrom (default: %(default)s)')
+    parser.add_argument('--position-tol', type=float, default=POSITION_TOL, help='Atomic position tolerance in Angstrom (default: %(default)s)')
     parser.add_argument('--version', action='version', version='%(prog)s 1.0')
     args = parser.parse_args()
 
-    compare_poscars(args.poscar1, args.poscar2)
+    if args.batch:
+        groups = deduplicate(args.batch, args.lattice_tol, args.position_tol)
+        print("Structures read      : {:d}".format(len(args.batch)))
+        print("Unique structures    : {:d}".format(len(groups)))
+        for unique_path, duplicates in groups.items():
+            if duplicates:
+                print("{:s} duplicated by: {:s}".format(unique_path, ', '.join(duplicates)))
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(groups, f, indent=2)
+    elif args.poscar1 and args.poscar2:
+        compare_poscars(args.poscar1, args.poscar2, args.lattice_tol, args.position_tol)
+    else:
+        parser.error('give either --poscar1 and --poscar2, or --batch')
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 07:48:05 PM IST 2026
+###########################################################################
+# Purpose : This script finds converged ecutwfc and kspacing values for a
+#           POSCAR file and template, running the SCF variants concurrently
+#           and stopping as soon as the total energy has converged.
+###########################################################################
+
+import argparse
+import copy
+import json
+import os
+
+from executors import make_executor
+from workflow import DEFAULT_LAUNCHER, FAKE_BINARIES, FAKE_LAUNCHER, Stage
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+# Default threshold on the change of the total energy between successive values
+ENERGY_TOL = 1.0E-3     # Ry per atom
+
+DEFAULT_ECUTWFC = [30, 40, 50, 60, 70, 80]
+DEFAULT_KSPACING = [0.5, 0.4, 0.3, 0.25, 0.2, 0.15, 0.1]
+
+
+def converged_index(energies, natoms, energy_tol=ENERGY_TOL):
+    """
+    Return the index of the first value whose energy differs from the next
+    one by less than energy_tol per atom, or None.
+    """
+    for index in range(1, len(energies)):
+        if energies[index - 1] is None or energies[index] is None:
+            continue
+        if abs(energies[index] - energies[index - 1]) / natoms < energy_tol:
+            return index - 1
+    return None
+
+
+def converge_parameter(parameter, values, write_variant, executor, natoms, energy_tol=ENERGY_TOL, batch=2):
+    """
+    Run the variants of one parameter from cheapest to most expensive, a
+    batch at a time, until the energy has converged.
+
+    Parameters:
+        parameter (str): Name of the parameter (used in stage names).
+        values (list): Values, ordered from cheapest to most expensive.
+        write_variant (callable): value -> (input path, output path); writes the input.
+        executor (callable): Back end running a list of stages (see executors.py).
+        natoms (int): Number of atoms, to compare energies per atom.
+        energy_tol (float): Threshold in Ry per atom.
+        batch (int): Number of variants run concurrently.
+
+    Returns:
+        dict: 'values' and 'energies' (Ry, None for failed runs) of the runs
+        done, and the 'converged' value (None if not reached).
+    """
+    from relax import parse_relax_output
+
+    energies = []
+    for start in range(0, len(values), batch):
+        chunk = values[start:start + batch]
+        stages = []
+        for value in chunk:
+            input_path, output_path = write_variant(value)
+            stages.append(Stage('{:s}_{:g}'.format(parameter, value), binary='pw.x', input_path=input_path, output_path=output_path))
+        statuses = executor(stages)
+
+        for stage in stages:
+            result = parse_relax_output(stage.output_path) if os.path.exists(stage.output_path) else None
+            if statuses[stage.name] == 'done' and result and result['job_done'] and result['energies']:
+                energies.append(result['energies'][-1])
+            else:
+                energies.append(None)
+
+        index = converged_index(energies, natoms, energy_tol)
+        if index is not None:
+            return {'values': values[:len(energies)], 'energies': energies, 'converged': values[index]}
+    return {'values': values[:len(energies)], 'energies': energies, 'converged': None}
+
+
+def convergence_study(template_path, poscar_path, output_dir, system_name, ecutwfc_values=DEFAULT_ECUTWFC, kspacing_values=DEFAULT_KSPACING,
+                      energy_tol=ENERGY_TOL, batch=2, executor=None, **executor_options):
+    """
+    Converge ecutwfc at the template kspacing, then kspacing at the converged ecutwfc.
+
+    Every variant is an SCF run with its own prefix in a shared outdir.
+    kspacing values giving the same k-point grid as a previous value are
+    not run again. ecutrho, if set in the template, keeps its ratio to ecutwfc.
+
+    Parameters:
+        template_path (str): Path to the template file.
+        poscar_path (str): Path to the POSCAR file.
+        output_dir (str): Directory for the inputs, outputs and outdir.
+        system_name (str): Name of the system.
+        ecutwfc_values (list): Cutoffs to try in Ry (empty: keep the template value).
+        kspacing_values (list): k-point spacings to try in 1/Angstrom (empty: keep the template value).
+        energy_tol (float): Threshold in Ry per atom.
+        batch (int): Number of variants run concurrently.
+        executor (callable): Back end running the variants (default: executors.LocalExecutor).
+        **executor_options: Options of the default executor (total_cores, launcher, binaries...).
+
+    Returns:
+        dict: converge_parameter result per parameter.
+    """
+    from ase.io import read
+    from ase.io.espresso import kspacing_to_grid
+    from poscar2pwi import write_pwi
+    from pseudo import resolve_template
+
+    with open(template_path, 'r') as f:
+        template = json.load(f)
+    atoms = read(poscar_path)
+    # "auto" cutoffs become numbers the study starts from
+    resolve_template(template, atoms.get_chemical_symbols())
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    executor = executor or make_executor('local', output_dir, **executor_options)
+    template['control']['calculation'] = 'scf'
+    ecutrho_ratio = template['system']['ecutrho'] / template['system']['ecutwfc'] if 'ecutrho' in template['system'] else None
+
+    def variant(parameter, value, variant_template):
+        name = "{:s}.{:s}_{:g}".format(system_name, parameter, value)
+        input_path = os.path.join(output_dir, name + '.in')
+        overrides = {'control': {'prefix': "{:s}_{:s}_{:g}".format(system_name, parameter, value), 'outdir': "./" + system_name}}
+        write_pwi(variant_template, atoms, input_path, input_overrides=overrides)
+        return input_path, os.path.join(output_dir, name + '.out')
+
+    def ecutwfc_variant(value):
+        variant_template = copy.deepcopy(template)
+        variant_template['system']['ecutwfc'] = value
+        if ecutrho_ratio is not None:
+            variant_template['system']['ecutrho'] = value * ecutrho_ratio
+        return variant('ecutwfc', value, variant_template)
+
+    results = {}
+    if ecutwfc_values:
+        results['ecutwfc'] = converge_parameter('ecutwfc', sorted(ecutwfc_values), ecutwfc_variant, executor, len(atoms), energy_tol, batch)
+        if results['ecutwfc']['converged'] is not None:
+            template['system']['ecutwfc'] = results['ecutwfc']['converged']
+            if ecutrho_ratio is not None:
+                template['system']['ecutrho'] = results['ecutwfc']['converged'] * ecutrho_ratio
+
+    def kspacing_variant(value):
+        variant_template = copy.deepcopy(template)
+        variant_template['kspacing'] = value
+        return variant('kspacing', value, variant_template)
+
+    if kspacing_values:
+        # Distinct spacings often give the same grid: run each grid once
+        spacings, grids = [], set()
+        for value in sorted(kspacing_values, reverse=True):
+            grid = tuple(kspacing_to_grid(atoms, value))
+            if grid not in grids:
+                grids.add(grid)
+                spacings.append(value)
+        results['kspacing'] = converge_parameter('kspacing', spacings, kspacing_variant, executor, len(atoms), energy_tol, batch)
+
+    return results
+
+
+def main():
+    """
+    Main function to parse command line arguments and run the convergence study.
+    """
+    parser = argparse.ArgumentParser(description="Converge ecutwfc and kspacing of a template for a POSCAR file.")
+    parser.add_argument("-p", "--poscar", help="Path to the POSCAR file", metavar="POSCAR", required=True)
+    parser.add_argument("-t", "--template", help="Path to the template file", metavar="Template_filename", required=True)
+    parser.add_argument("-o", "--output-dir", help="Directory for all inputs and outputs", metavar="Output_dir", required=True)
+    parser.add_argument("-sn", "--system-name", help="Name of the system (prefix and file names)", metavar="System_name", required=True)
+    parser.add_argument("-e", "--ecutwfc", type=float, nargs='*', default=DEFAULT_ECUTWFC, help="Cutoffs to try in Ry (default: %(default)s)")
+    parser.add_argument("-k", "--kspacing", type=float, nargs='*', default=DEFAULT_KSPACING, help="k-point spacings to try in 1/Angstrom (default: %(default)s)")
+    parser.add_argument("--energy-tol", type=float, default=ENERGY_TOL, help="Energy threshold in Ry per atom (default: %(default)s)")
+    parser.add_argument("-b", "--batch", type=int, default=2, help="Variants run concurrently (default: 2)")
+    parser.add_argument("-n", "--cores", type=int, default=4, help="Core budget shared by the concurrent runs (default: 4)")
+    parser.add_argument("-l", "--launcher", default=None, help="Launch command with {{cores}} and {{binary}} fields (default: '{:s}', or 'srun -n {{cores}} {{binary}}' for array jobs)".format(DEFAULT_LAUNCHER))
+    parser.add_argument("--fake", action="store_true", help="Replace Quantum Espresso by fake_qe.py")
+    parser.add_argument("-x", "--executor", choices=['local', 'array', 'dry-run'], default='local', help="Back end running the variants (default: %(default)s)")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    launcher, binaries = args.launcher, None
+    if args.fake:
+        launcher, binaries = FAKE_LAUNCHER, FAKE_BINARIES
+
+    executor = make_executor(args.executor, os.path.abspath(args.output_dir), args.cores, launcher=launcher, binaries=binaries)
+    results = convergence_study(args.template, args.poscar, args.output_dir, args.system_name, args.ecutwfc, args.kspacing,
+                                energy_tol=args.energy_tol, batch=args.batch, executor=executor)
+
+    summary_path = os.path.join(args.output_dir, args.system_name + '.convergence.json')
+    with open(summary_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print("-----------------------------------------------------------")
+    for parameter, result in results.items():
+        for value, energy in zip(result['values'], result['energies']):
+            print("{:<10s} {:>8g} : {:s}".format(parameter, value, 'failed' if energy is None else '{:.8f} Ry'.format(energy)))
+        print("Converged {:<26s}: {:s}".format(parameter, 'not reached' if result['converged'] is None else '{:g}'.format(result['converged'])))
+    print("Summary written to                  : {:s}".format(summary_path))
+    print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
@@ -7,36 +7,109 @@
 # Purpose : This script converts a POSCAR file to primitive or conventional cell
 ###########################################################################
 import argparse
-from pymatgen.io.vasp import Poscar
-from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+import os
+from concurrent.futures import ProcessPoolExecutor
 
-def convert_cell_using_pymatgen(poscar_file, cell_type, output_file):
-    if cell_type == 'p':
-        cell_name = 'primitive'
-        poscar = Poscar.from_file(poscar_file)
-        structure = poscar.structure
-        primitive_structure = SpacegroupAnalyzer(structure).find_primitive()
-        poscar_primitive = Poscar(primitive_structure)
-        poscar_primitive.write_file(output_file)
-    elif cell_type == 'c':
-        cell_name = 'conventional'
-        poscar = Poscar.from_file(poscar_file)
-        structure = poscar.structure
-        conventional_structure = SpacegroupAnalyzer(structure).get_conventional_standard_structure()
-        poscar_conventional = Poscar(conventional_structure)
-        poscar_conventional.write_file(output_file)
-    else:
+from symmetry import SYMPREC, get_analyzer
+from telemetry import timed
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+CELL_NAMES = {'p': 'primitive', 'c': 'conventional'}
+
+
+@timed
+def convert_cell_using_pymatgen(poscar_file, cell_type, output_file, symprec=SYMPREC, quiet=False):
+    from pymatgen.io.vasp import Poscar
+
+    if cell_type not in CELL_NAMES:
         print("Invalid cell type. Please choose 'p' for primitive or 'c' for conventional.")
         return
+    cell_name = CELL_NAMES[cell_type]
+    # The symmetry analysis is shared by every conversion of the same structure
+    _, analyzer = get_analyzer(poscar_file, symprec)
+    if cell_type == 'p':
+        Poscar(analyzer.find_primitive()).write_file(output_file)
+    else:
+        Poscar(analyzer.get_conventional_standard_structure()).write_file(output_file)
 
-    print(f"Successfully converted {cell_name} cell using pymatgen and saved to {output_file}")
+    if not quiet:
+        print(f"Successfully converted {cell_name} cell using pymatgen and saved to {output_file}")
+
+
+def _convert_one(task):
+    poscar_file, cell_type, output_file, symprec = task
+    try:
+        convert_cell_using_pymatgen(poscar_file, cell_type, output_file, symprec, quiet=True)
+    except Exception as error:
+        return {'poscar': poscar_file, 'output': output_file, 'status': 'failed', 'error': '{:s}: {:s}'.format(type(error).__name__, str(error))}
+    return {'poscar': poscar_file, 'output': output_file, 'status': 'success', 'error': None}
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Convert POSCAR to primitive or conventional cell")
-    parser.add_argument("-i", "--input_file", help="Input POSCAR file name", required=True)
-    parser.add_argument("-t", "--cell_type", choices=['p', 'c'], help="Cell type to convert to ('p' for primitive, 'c' for conventional)", required=True)
-    parser.add_argument("-o", "--output_file", help="Output file name", required=True)
 
+def convert_cells(poscar_files, cell_types, output_dir, workers=1, symprec=SYMPREC):
+    """
+    Convert many POSCAR files in one process, or over a pool of worker processes.
+
+    pymatgen is imported once per process and every structure is analysed
+    once, however many cell types are asked for. All conversions of a file
+    go to the same worker so they share its analysis.
+
+    Parameters:
+        poscar_files (list): Paths to the POSCAR files.
+        cell_types (str): 'p', 'c' or 'pc' (both).
+        output_dir (str): Directory receiving <system name>.<cell name>.poscar files.
+        workers (int): Number of worker processes (1: the current process).
+        symprec (float): Symmetry tolerance in Angstrom.
+
+    Returns:
+        list: One result dictionary (poscar, output, status, error) per conversion.
+    """
+    from batch_gen import system_name_of
+
+    if not cell_types or any(cell_type not in CELL_NAMES for cell_type in cell_types):
+        raise ValueError("Invalid cell type. Choose 'p' for primitive, 'c' for conventional or 'pc' for both.")
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(poscar_file, cell_type, os.path.join(output_dir, '{:s}.{:s}.poscar'.format(system_name_of(poscar_file), CELL_NAMES[cell_type])), symprec)
+             for poscar_file in poscar_files for cell_type in cell_types]
+    if workers == 1 or len(poscar_files) < 2:
+        return [_convert_one(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_convert_one, tasks, chunksize=len(cell_types) * max(1, len(poscar_files) // (4 * workers))))
+
+
+def main():
+    """
+    Main function to parse command line arguments and convert the cells.
+    """
+    parser = argparse.ArgumentParser(description="Convert POSCAR to primitive or conventional cell")
+    parser.add_argument("-i", "--input_file", nargs="+", help="Input POSCAR file name (several files, directories or glob patterns with --output_dir)", required=True)
+    parser.add_argument("-t", "--cell_type", choices=['p', 'c', 'pc'], help="Cell type to convert to ('p' for primitive, 'c' for conventional, 'pc' for both with --output_dir)", required=True)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("-o", "--output_file", help="Output file name")
+    group.add_argument("-d", "--output_dir", help="Directory receiving <system name>.<primitive|conventional>.poscar files (batch mode)")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="Number of worker processes in batch mode (default: 1)")
+    parser.add_argument("-s", "--symprec", type=float, default=SYMPREC, help="Symmetry tolerance in Angstrom (default: %(default)s)")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
     args = parser.parse_args()
 
-    convert_cell_using_pymatgen(args.input_file, args.cell_type, args.output_file)
+    if args.output_file:
+        if len(args.input_file) > 1 or len(args.cell_type) > 1:
+            parser.error("--output_file takes one input file and one cell type; use --output_dir for batches")
+        convert_cell_using_pymatgen(args.input_file[0], args.cell_type, args.output_file, args.symprec)
+        return
+
+    from batch_gen import find_poscars
+
+    results = convert_cells(find_poscars(args.input_file), args.cell_type, args.output_dir, args.workers, args.symprec)
+    failed = [result for result in results if result['status'] != 'success']
+    print("-----------------------------------------------------------")
+    print("Cells converted                     : {:d}".format(len(results) - len(failed)))
+    print("Failed conversions                  : {:d}".format(len(failed)))
+    for result in failed:
+        print("  {:s}: {:s}".format(result['poscar'], result['error']))
+    print("Output directory                    : {:s}".format(args.output_dir))
+    print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
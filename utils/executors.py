@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 08:31:26 PM IST 2026
+###########################################################################
+# Purpose : Back ends that run batches of independent Quantum Espresso
+#           stages: a local process pool, batch-scheduler array jobs, the
+#           fake_qe.py stand-in and a dry run.
+###########################################################################
+#
+# An executor is a callable taking a list of run stages (workflow.Stage)
+# whose dependencies are already satisfied, and returning the final status
+# of each by stage name ('done', 'failed', 'submitted' or 'skipped'). The
+# stages of one call may run in any order or all at once.
+###########################################################################
+
+import os
+import shlex
+import subprocess
+import time
+
+import telemetry
+from workflow import DEFAULT_LAUNCHER, FAKE_BINARIES, FAKE_LAUNCHER, Stage, Workflow
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+EXECUTORS = ('local', 'fake', 'array', 'dry-run')
+
+# Launcher of a task inside an array job: the scheduler sets up the cores
+ARRAY_LAUNCHER = 'srun -n {cores} {binary}'
+
+ARRAY_SCRIPT = """#!/bin/bash
+#SBATCH --job-name={job_name}
+#SBATCH --array=0-{last_task}
+#SBATCH --ntasks={cores}
+#SBATCH --output={log_pattern}
+{setup}
+# Task list: working directory, command, input file and output file (tab separated)
+TASK=${{SLURM_ARRAY_TASK_ID:-$1}}
+IFS=$'\\t' read -r WORKDIR COMMAND INPUT OUTPUT <<< "$(sed -n "$((TASK + 1))p" {task_file})"
+cd "$WORKDIR" || exit 1
+eval "$COMMAND" < "$INPUT" > "$OUTPUT" 2>&1
+echo $? > "$OUTPUT.exit"
+"""
+
+
+def launch_command(stage, cores, launcher, binaries, plan=False):
+    """
+    Return the launch command of a run stage as a shell string.
+    """
+    binary = binaries.get(stage.binary, stage.binary)
+    if plan:
+        from parallel import launch_command as planned_command
+        return planned_command(stage.binary, stage.input_path, cores, launcher, binary)
+    return launcher.format(cores=cores, binary=binary)
+
+
+class LocalExecutor:
+    """
+    Run stages as local processes sharing a core budget.
+
+    Parameters:
+        total_cores (int): Core budget shared by the concurrent runs.
+        cores_per_job (int): Cores given to every run (default: split the
+            budget evenly between the runs started together).
+        launcher (str): Launch command with {cores} and {binary} fields.
+        binaries (dict): Binary name -> command.
+        workdir (str): Working directory of the runs.
+        **workflow_options: Passed on to Workflow (poll_interval, cache, force).
+    """
+
+    def __init__(self, total_cores=4, cores_per_job=None, launcher=DEFAULT_LAUNCHER, binaries=None, workdir='.', **workflow_options):
+        self.total_cores = total_cores
+        self.cores_per_job = cores_per_job
+        self.launcher = launcher
+        self.binaries = binaries
+        self.workdir = workdir
+        self.workflow_options = workflow_options
+
+    def __call__(self, stages):
+        workflow = Workflow(total_cores=self.total_cores, launcher=self.launcher, binaries=self.binaries, workdir=self.workdir, **self.workflow_options)
+        for stage in stages:
+            # The caller tracks dependencies; run independent copies here
+            workflow.add(Stage(stage.name, binary=stage.binary, input_path=stage.input_path, output_path=stage.output_path,
+                               min_cores=self.cores_per_job or stage.min_cores, max_cores=self.cores_per_job or stage.max_cores))
+        return workflow.run()
+
+
+class FakeExecutor(LocalExecutor):
+    """
+    LocalExecutor running fake_qe.py instead of Quantum Espresso (for tests).
+    """
+
+    def __init__(self, total_cores=4, cores_per_job=None, workdir='.', **workflow_options):
+        super().__init__(total_cores, cores_per_job, launcher=FAKE_LAUNCHER, binaries=FAKE_BINARIES, workdir=workdir, **workflow_options)
+
+
+class DryRunExecutor:
+    """
+    Print the commands that would be run, without running anything.
+
+    Parameters:
+        cores_per_job (int): Cores shown in the commands.
+        launcher (str): Launch command with {cores} and {binary} fields.
+        binaries (dict): Binary name -> command.
+        workdir (str): Working directory of the runs.
+        plan (bool): Show pw.x with planned pools (see parallel.py).
+    """
+
+    def __init__(self, cores_per_job=4, launcher=DEFAULT_LAUNCHER, binaries=None, workdir='.', plan=False):
+        self.cores_per_job = cores_per_job
+        self.launcher = launcher
+        self.binaries = dict(binaries or {})
+        self.workdir = workdir
+        self.plan = plan
+
+    def __call__(self, stages):
+        for stage in stages:
+            command = launch_command(stage, self.cores_per_job, self.launcher, self.binaries, self.plan)
+            print("(dry run) cd {:s} && {:s} < {:s} > {:s}".format(shlex.quote(os.path.abspath(self.workdir)), command,
+                                                                 shlex.quote(stage.input_path), shlex.quote(stage.output_path)))
+        return {stage.name: 'skipped' for stage in stages}
+
+
+class ArrayExecutor:
+    """
+    Submit stages as one batch-scheduler array job (Slurm syntax).
+
+    Every call writes a task list and an array script to script_dir and
+    submits the script. Each task writes its exit status to <output>.exit,
+    which is what collect() reads back. The script also runs outside the
+    scheduler for a single task: 'bash script.sh <task index>'.
+
+    Parameters:
+        script_dir (str): Directory receiving task lists, scripts and logs.
+        cores_per_job (int): Cores (--ntasks) of every array task.
+        launcher (str): Launch command with {cores} and {binary} fields.
+        binaries (dict): Binary name -> command.
+        workdir (str): Working directory of the runs.
+        modules (list): Environment modules loaded by the script.
+        directives (list): Extra '#SBATCH' options, e.g. ['--partition=short'].
+        submit_command (str): Command submitting the script (None: only write it).
+        wait (bool): Wait for all tasks to finish (otherwise return 'submitted').
+        poll_interval (float): Seconds between checks of the status files.
+        plan (bool): Launch pw.x with planned pools (see parallel.py).
+    """
+
+    def __init__(self, script_dir, cores_per_job=4, launcher=ARRAY_LAUNCHER, binaries=None, workdir='.', modules=('qe-7.3',), directives=(),
+                 submit_command='sbatch', wait=True, poll_interval=30.0, plan=False):
+        self.script_dir = os.path.abspath(script_dir)
+        self.cores_per_job = cores_per_job
+        self.launcher = launcher
+        self.binaries = dict(binaries or {})
+        self.workdir = os.path.abspath(workdir)
+        self.modules = list(modules)
+        self.directives = list(directives)
+        self.submit_command = submit_command
+        self.wait = wait
+        self.poll_interval = poll_interval
+        self.plan = plan
+        self.submitted = 0
+
+    def write_script(self, stages):
+        """
+        Write the task list and the array script of a batch of stages.
+
+        Returns:
+            str: Path of the script.
+        """
+        os.makedirs(self.script_dir, exist_ok=True)
+        self.submitted += 1
+        job_name = 'pwtk_{:d}_{:d}'.format(os.getpid(), self.submitted)
+        task_file = os.path.join(self.script_dir, job_name + '.tasks')
+        with open(task_file, 'w') as f:
+            for stage in stages:
+                command = launch_command(stage, self.cores_per_job, self.launcher, self.binaries, self.plan)
+                f.write('\t'.join([self.workdir, command, os.path.abspath(stage.input_path), os.path.abspath(stage.output_path)]) + '\n')
+                # Stale status files would be taken for the new results
+                if os.path.exists(stage.output_path + '.exit'):
+                    os.remove(stage.output_path + '.exit')
+
+        script_path = os.path.join(self.script_dir, job_name + '.sh')
+        with open(script_path, 'w') as f:
+            f.write(ARRAY_SCRIPT.format(job_name=job_name, last_task=len(stages) - 1, cores=self.cores_per_job,
+                                        log_pattern=os.path.join(self.script_dir, job_name + '_%a.log'),
+                                        setup=''.join(['#SBATCH {:s}\n'.format(directive) for directive in self.directives]
+                                                      + ['module load {:s}\n'.format(module) for module in self.modules]),
+                                        task_file=shlex.quote(task_file)))
+        return script_path
+
+    def collect(self, stages):
+        """
+        Return the status of every stage from its status file
+        ('submitted' while the task has not finished).
+        """
+        statuses = {}
+        for stage in stages:
+            exit_path = stage.output_path + '.exit'
+            if not os.path.exists(exit_path):
+                statuses[stage.name] = 'submitted'
+                continue
+            with open(exit_path, 'r') as f:
+                statuses[stage.name] = 'done' if f.read().strip() == '0' else 'failed'
+        return statuses
+
+    def __call__(self, stages):
+        script_path = self.write_script(stages)
+        if self.submit_command is None:
+            print("Array script written: {:s}".format(script_path))
+            return {stage.name: 'submitted' for stage in stages}
+
+        result = subprocess.run(shlex.split(self.submit_command) + [script_path], capture_output=True, text=True)
+        if result.returncode != 0:
+            print("Submission of {:s} failed: {:s}".format(script_path, result.stderr.strip()))
+            return {stage.name: 'failed' for stage in stages}
+        print("Submitted {:s}: {:s}".format(script_path, result.stdout.strip()))
+
+        statuses = self.collect(stages)
+        while self.wait and 'submitted' in statuses.values():
+            time.sleep(self.poll_interval)
+            statuses = self.collect(stages)
+        for stage in stages:
+            # The wall time of the task is only known from the program's own timing line
+            if statuses[stage.name] in ('done', 'failed'):
+                telemetry.record_stage(stage, status=statuses[stage.name], returncode=None, cores=self.cores_per_job, wall_time=None)
+        return statuses
+
+
+def make_executor(kind, workdir='.', total_cores=4, cores_per_job=None, launcher=None, binaries=None, script_dir=None, **options):
+    """
+    Build an executor from command line style options.
+
+    Parameters:
+        kind (str): One of EXECUTORS.
+        workdir (str): Working directory of the runs.
+        total_cores (int): Core budget of the local back ends.
+        cores_per_job (int): Cores of every run (default: budget split, or 4 for array jobs).
+        launcher (str): Launch command (default: the back end's own).
+        binaries (dict): Binary name -> command.
+        script_dir (str): Array scripts directory (default: <workdir>/array).
+        **options: Further options of the back end.
+
+    Returns:
+        callable: The executor.
+    """
+    if kind == 'local':
+        return LocalExecutor(total_cores, cores_per_job, launcher=launcher or DEFAULT_LAUNCHER, binaries=binaries, workdir=workdir, **options)
+    if kind == 'fake':
+        return FakeExecutor(total_cores, cores_per_job, workdir=workdir, **options)
+    if kind == 'array':
+        return ArrayExecutor(script_dir or os.path.join(workdir, 'array'), cores_per_job or 4, launcher=launcher or ARRAY_LAUNCHER,
+                             binaries=binaries, workdir=workdir, **options)
+    if kind == 'dry-run':
+        return DryRunExecutor(cores_per_job or total_cores, launcher=launcher or DEFAULT_LAUNCHER, binaries=binaries, workdir=workdir, **options)
+    raise ValueError("Invalid executor. Choose one of: {:s}.".format(', '.join(EXECUTORS)))
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 12:20:09 PM IST 2026
+###########################################################################
+# Purpose : Stand-in for pw.x, bands.x, dos.x and projwfc.x used to exercise
+#           the pwtk workflow tools without Quantum Espresso installed.
+###########################################################################
+#
+# Usage     : fake_qe.py <program> < input > output
+#             where <program> is pw.x, bands.x, dos.x or projwfc.x.
+#
+# Environment:
+#   FAKE_QE_SLEEP  Seconds to sleep before finishing (default 0).
+#   FAKE_QE_FAIL   Comma separated programs that should exit with status 1.
+###########################################################################
+
+import argparse
+import math
+import os
+import re
+import sys
+import time
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+BOHR = 0.52917721092        # Angstrom per bohr
+RY = 13.605693122994        # eV per Rydberg
+
+# Birch-Murnaghan equation of state of the fake material, per atom:
+# V0 (Angstrom^3), B0 (eV/Angstrom^3, 100 GPa) and B0'
+FAKE_EOS = (20.0, 0.6241509, 4.5)
+
+PROGRAMS = {
+    'pw.x': 'PWSCF',
+    'bands.x': 'BANDS',
+    'dos.x': 'DOS',
+    'projwfc.x': 'PROJWFC',
+}
+
+
+def read_setting(input_text, key, default):
+    """
+    Return the quoted value of a namelist variable in an input file.
+    """
+    match = re.search(r"^\s*{:s}\s*=\s*['\"]([^'\"]*)['\"]".format(key), input_text, re.IGNORECASE | re.MULTILINE)
+    return match.group(1) if match else default
+
+
+def read_card(input_text, card):
+    """
+    Return the units and the rows of a CELL_PARAMETERS or ATOMIC_POSITIONS card.
+    """
+    lines = input_text.splitlines()
+    for index, line in enumerate(lines):
+        if line.strip().upper().startswith(card):
+            units = line.strip()[len(card):].strip(' ({})').lower() or 'alat'
+            rows = []
+            for row in lines[index + 1:]:
+                fields = row.split()
+                if len(fields) < 3 or fields[0].upper() in ('K_POINTS', 'ATOMIC_SPECIES', 'ATOMIC_POSITIONS', 'CELL_PARAMETERS'):
+                    break
+                rows.append(fields)
+            return units, rows
+    return None, []
+
+
+def fake_energy(input_text):
+    """
+    Total energy (Ry) that converges with ecutwfc and the k-point grid, so
+    convergence studies have something to converge.
+    """
+    match = re.search(r"^\s*ecutwfc\s*=\s*(\d+(?:\.\d*)?)", input_text, re.IGNORECASE | re.MULTILINE)
+    ecutwfc = float(match.group(1)) if match else 50.0
+    kpoints = 1
+    match = re.search(r"^K_POINTS\s*\{?automatic\}?\s*\n\s*(\d+)\s+(\d+)\s+(\d+)", input_text, re.IGNORECASE | re.MULTILINE)
+    if match:
+        kpoints = int(match.group(1)) * int(match.group(2)) * int(match.group(3))
+    return -10.0 + 2.0 * math.exp(-ecutwfc / 8.0) + 0.05 / kpoints
+
+
+def fake_eos(volume_per_atom):
+    """
+    Energy (Ry per atom) and pressure (Ry/bohr^3) of the fake material at a
+    volume per atom (Angstrom^3), so strain sweeps have something to fit.
+    """
+    v0, b0, b0_prime = FAKE_EOS
+    x = (v0 / volume_per_atom) ** (2.0 / 3.0)
+    energy = 9.0 * v0 * b0 / 16.0 * ((x - 1.0) ** 3 * b0_prime + (x - 1.0) ** 2 * (6.0 - 4.0 * x))
+    pressure = 1.5 * b0 * (x ** 3.5 - x ** 2.5) * (1.0 + 0.75 * (b0_prime - 4.0) * (x - 1.0))
+    return energy / RY, pressure * BOHR ** 3 / RY
+
+
+def write_stress(pressure, output):
+    """
+    Print a hydrostatic stress tensor in the format of pw.x (tstress).
+    """
+    kbar = pressure * RY / BOHR ** 3 * 1602.1766208
+    output.write("          total   stress  (Ry/bohr**3)                   (kbar)     P={:12.2f}\n".format(kbar))
+    for row in range(3):
+        values = [pressure if column == row else 0.0 for column in range(3)]
+        kbars = [kbar if column == row else 0.0 for column in range(3)]
+        output.write("  {:12.8f} {:12.8f} {:12.8f}   {:12.2f} {:12.2f} {:12.2f}\n".format(*values, *kbars))
+    output.write("\n")
+
+
+def write_structure(input_text, output):
+    """
+    Print the start-up structure summary of pw.x for a cell given in Angstrom.
+
+    Returns:
+        tuple: (alat in bohr, cell in Angstrom, positions card units and rows,
+        volume in Angstrom^3) or None when the input has no usable structure.
+    """
+    cell_units, cell_rows = read_card(input_text, 'CELL_PARAMETERS')
+    positions_units, positions_rows = read_card(input_text, 'ATOMIC_POSITIONS')
+    if cell_units != 'angstrom' or len(cell_rows) != 3 or not positions_rows:
+        return None
+    cell = [[float(value) for value in row[:3]] for row in cell_rows]
+    alat = sum(value ** 2 for value in cell[0]) ** 0.5
+    volume = abs(cell[0][0] * (cell[1][1] * cell[2][2] - cell[1][2] * cell[2][1])
+                 - cell[0][1] * (cell[1][0] * cell[2][2] - cell[1][2] * cell[2][0])
+                 + cell[0][2] * (cell[1][0] * cell[2][1] - cell[1][1] * cell[2][0]))
+
+    output.write("     lattice parameter (alat)  = {:12.4f}  a.u.\n".format(alat / BOHR))
+    output.write("     unit-cell volume          = {:12.4f} (a.u.)^3\n".format(volume / BOHR ** 3))
+    output.write("     number of atoms/cell      = {:12d}\n\n".format(len(positions_rows)))
+    output.write("     crystal axes: (cart. coord. in units of alat)\n")
+    for index, row in enumerate(cell, start=1):
+        output.write("               a({:d}) = ( {:10.6f} {:10.6f} {:10.6f} )\n".format(index, *[value / alat for value in row]))
+    output.write("\n     site n.     atom                  positions (alat units)\n")
+    for index, row in enumerate(positions_rows, start=1):
+        position = [float(value) for value in row[1:4]]
+        if positions_units == 'crystal':
+            position = [sum(position[i] * cell[i][j] for i in range(3)) for j in range(3)]
+        output.write("         {:d}           {:s}  tau( {:3d}) = ( {:11.7f} {:11.7f} {:11.7f}  )\n".format(index, row[0], index, *[value / alat for value in position]))
+    output.write("\n")
+    return alat / BOHR, cell, positions_units, positions_rows, volume
+
+
+def write_data(program, input_text):
+    """
+    Write small data files in the formats of bands.x (filband), dos.x
+    (fildos) and projwfc.x (filpdos: two Si atoms with s and p projections).
+    """
+    energies = [-20.0 + 0.1 * step for step in range(401)]
+    if program == 'bands.x':
+        with open(read_setting(input_text, 'filband', 'bands.out'), 'w') as f:
+            f.write(" &plot nbnd=   8, nks=    20 /\n")
+            for k in range(20):
+                f.write("           {:.6f}  0.000000  0.000000\n".format(k / 19.0))
+                f.write(''.join("{:9.3f}".format(-6.0 + 2.0 * band + 0.1 * k) for band in range(8)) + "\n")
+    elif program == 'dos.x':
+        with open(read_setting(input_text, 'fildos', 'dos.out'), 'w') as f:
+            f.write("#  E (eV)   dos(E)     Int dos(E) EFermi =    6.000 eV\n")
+            for index, energy in enumerate(energies):
+                f.write("{:8.3f}  {:.4E}  {:.4E}\n".format(energy, 0.1, 0.1 * 0.1 * (index + 1)))
+    elif program == 'projwfc.x':
+        filpdos = read_setting(input_text, 'filpdos', 'pwscf')
+        with open(filpdos + '.pdos_tot', 'w') as f:
+            f.write("# E (eV)  dos(E)    pdos(E)\n")
+            f.writelines("{:7.3f}  {:.3E}  {:.3E}\n".format(energy, 0.8, 0.8) for energy in energies)
+        for atom in (1, 2):
+            for wfc, (orbital, columns) in enumerate((('s', 1), ('p', 3)), start=1):
+                with open("{:s}.pdos_atm#{:d}(Si)_wfc#{:d}({:s})".format(filpdos, atom, wfc, orbital), 'w') as f:
+                    f.write("# E (eV)  ldos(E)  " + "  ".join(['pdos(E)'] if columns == 1 else ['pz(E)', 'px(E)', 'py(E)']) + "\n")
+                    for energy in energies:
+                        f.write("{:7.3f}  {:.3E}".format(energy, 0.1 * columns) + "  {:.3E}".format(0.1) * columns + "\n")
+
+
+def run(program, input_text, output):
+    """
+    Pretend to run a Quantum Espresso program.
+
+    Parameters:
+        program (str): Name of the emulated binary.
+        input_text (str): Contents of the input file read from stdin.
+        output (file): Stream receiving the fake output.
+
+    Returns:
+        int: Exit status.
+    """
+    name = PROGRAMS[program]
+    output.write("     Program {:s} v.7.3 starts on {:s}\n\n".format(name, time.strftime("%d%b%Y at %H:%M:%S")))
+    output.write("     fake_qe.py stand-in, {:d} bytes of input read\n\n".format(len(input_text)))
+    output.flush()
+
+    time.sleep(float(os.environ.get('FAKE_QE_SLEEP', '0')))
+
+    if program in os.environ.get('FAKE_QE_FAIL', '').split(','):
+        output.write("     Error: fake failure requested through FAKE_QE_FAIL\n")
+        return 1
+
+    # pw.x prints a converged SCF at the input structure (energy and stress
+    # of FAKE_EOS); relaxations end right away with that structure as their
+    # final coordinates, vc-relax with the cell scaled to the EOS minimum
+    if program == 'pw.x':
+        structure = write_structure(input_text, output)
+        calculation = read_setting(input_text, 'calculation', 'scf')
+        energy, pressure = fake_energy(input_text), 0.0
+        if structure is not None:
+            natoms = len(structure[3])
+            eos_energy, pressure = fake_eos(structure[4] / natoms)
+            energy += natoms * eos_energy
+        output.write("!    total energy              = {:16.8f} Ry\n".format(energy))
+        write_stress(pressure, output)
+        if structure is not None and calculation in ('relax', 'vc-relax'):
+            alat, cell, positions_units, positions_rows, volume = structure
+            if calculation == 'vc-relax':
+                # The cell relaxes isotropically to the volume of the fake material
+                scale = (natoms * FAKE_EOS[0] / volume) ** (1.0 / 3.0)
+                cell = [[value * scale for value in row] for row in cell]
+                if positions_units == 'angstrom':
+                    positions_rows = [[row[0]] + ['{:.10f}'.format(float(value) * scale) for value in row[1:4]] for row in positions_rows]
+                energy, pressure = fake_energy(input_text), 0.0
+                output.write("     new unit-cell volume = {:12.5f} a.u.^3 ( {:12.5f} Ang^3 )\n\n".format(natoms * FAKE_EOS[0] / BOHR ** 3, natoms * FAKE_EOS[0]))
+            output.write("!    total energy              = {:16.8f} Ry\n".format(energy))
+            write_stress(pressure, output)
+            output.write("Begin final coordinates\n")
+            if calculation == 'vc-relax':
+                output.write("CELL_PARAMETERS (alat= {:.8f})\n".format(alat))
+                for row in cell:
+                    output.write("  {:14.9f} {:14.9f} {:14.9f}\n".format(*[value / alat / BOHR for value in row]))
+                output.write("\n")
+            output.write("ATOMIC_POSITIONS ({:s})\n".format(positions_units))
+            for row in positions_rows:
+                output.write("{:s} {:s}\n".format(row[0], ' '.join(row[1:4])))
+            output.write("End final coordinates\n\n")
+
+    # pw.x leaves a save directory behind for the post-processing programs
+    if program == 'pw.x':
+        save_dir = os.path.join(read_setting(input_text, 'outdir', './'), read_setting(input_text, 'prefix', 'pwscf') + '.save')
+        os.makedirs(save_dir, exist_ok=True)
+        with open(os.path.join(save_dir, 'charge-density.dat'), 'w') as f:
+            f.write("fake charge density\n")
+
+    if program != 'pw.x':
+        write_data(program, input_text)
+
+    output.write("     {:s}        :      0.00s CPU      0.00s WALL\n\n".format(name))
+    output.write("   JOB DONE.\n")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in for Quantum ESPRESSO binaries (reads input on stdin, writes output on stdout).")
+    parser.add_argument("program", choices=list(PROGRAMS), help="Quantum ESPRESSO binary to emulate")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    # Parallelization options of the real programs (-nk 4, -nd 1, ...) are ignored
+    args, _ = parser.parse_known_args()
+
+    sys.exit(run(args.program, sys.stdin.read(), sys.stdout))
+
+if __name__ == '__main__':
+    main()
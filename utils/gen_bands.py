@@ -8,28 +8,105 @@
 ###########################################################################
 import argparse
 import json
-from ase.io import read, write
+from ase.io import read
 from ase.dft.kpoints import parse_path_string
-import re
 import f90nml
-import os
+import numpy as np
+from occupations import with_bands
+from pseudo import resolve_template
+from pwi_renderer import from_template
+from symmetry import band_path
+from telemetry import timed
 
 VERSION = '1.0.0'
 AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
 
+# Default number of k-points from one high symmetry point to the next
+POINTS_PER_SEGMENT = 10
+
 
 def write_namelist(file_path, namelist_name, namelist_content):
     namelist = {namelist_name: namelist_content}
     f90nml.write(namelist, file_path, force=True)
 
 
-def generate_input(template_path, poscar_path, scf_path, nscf_path, bands_path, bands_data_path,system_name):
+def get_high_symmetry_points(atoms, points_per_segment=POINTS_PER_SEGMENT, density=None):
+    """
+    Build the crystal_b K_POINTS lines along the standard band path of a cell.
+
+    Parameters:
+        atoms (ASE Atoms): The atomic structure.
+        points_per_segment (int): k-points from one high symmetry point to the next.
+        density (float): k-points per 1/Angstrom of path length; when given, each
+            segment gets a number of points proportional to its length instead.
+
+    Returns:
+        list: One "kx ky kz npoints ! label" line per high symmetry point.
+    """
+    # Cached: gen_post, gen_bands and batch runs see the same cells repeatedly
+    _, path = band_path(atoms.cell)
+    special_points = path.special_points
+    kpath = parse_path_string(path.path)
+    # Special points refer to the standard form of the lattice, which has the same metric
+    reciprocal = 2 * np.pi * path.cell.reciprocal()
+
+    high_symmetry_points = []
+
+    for path in kpath:
+        for point_index, point in enumerate(path):
+            if point_index == len(path) - 1:
+                npoints = 1
+            elif density is not None:
+                segment = (np.asarray(special_points[path[point_index + 1]]) - special_points[point]) @ reciprocal
+                npoints = max(1, int(round(np.linalg.norm(segment) * density)))
+            else:
+                npoints = points_per_segment
+            coordinates = ' '.join(format(coord, '.7f') for coord in special_points[point])
+            high_symmetry_points.append(f"{coordinates} {npoints} ! {point}")
+
+    return high_symmetry_points
+
+
+def render_bands_nscf(atoms, template, high_symmetry_points):
+    """
+    Render a pw.x 'bands' input with a crystal_b K_POINTS block, in memory.
+
+    Parameters:
+        atoms (ASE Atoms): The atomic structure.
+        template (dict): Template already set up for the bands calculation.
+        high_symmetry_points (list): Lines from get_high_symmetry_points.
+
+    Returns:
+        str: Content of the input file.
+    """
+    kpoints = "K_POINTS {{crystal_b}}\n{:d}\n{:s}\n\n".format(len(high_symmetry_points), '\n'.join(high_symmetry_points))
+    return from_template(template, kspacing=False).render(atoms, kpoints)
+
+
+def write_bands_nscf(nscf_path, atoms, template, high_symmetry_points):
+    """
+    Write a pw.x 'bands' input file with a crystal_b K_POINTS block.
+
+    Parameters:
+        nscf_path (str): Path to save the Quantum Espresso nscf input file.
+        atoms (ASE Atoms): The atomic structure.
+        template (dict): Template already set up for the bands calculation.
+        high_symmetry_points (list): Lines from get_high_symmetry_points.
+    """
+    with open(nscf_path, 'w') as file:
+        file.write(render_bands_nscf(atoms, template, high_symmetry_points))
+
+
+@timed
+def generate_input(template_path, poscar_path, scf_path, nscf_path, bands_path, bands_data_path,system_name, points_per_segment=POINTS_PER_SEGMENT, kpath_density=None):
     # Load template from JSON
     with open(template_path, 'r') as f:
         template = json.load(f)
 
     # Load POSCAR file
     atoms = read(poscar_path)
+    symbols = atoms.get_chemical_symbols()
+    resolve_template(template, symbols)
 
     # Update template with information from the POSCAR file
     num_atoms = len(atoms)
@@ -42,50 +119,17 @@ def generate_input(template_path, poscar_path, scf_path, nscf_path, bands_path,
     template['system']['nat'] = num_atoms
     template['system']['ntyp'] = num_species
 
-    #
-    lattice = atoms.cell.get_bravais_lattice()
-    path = lattice.bandpath()
-    special_points = path.special_points
-    kpath = parse_path_string(path.path)
-
-    high_symmetry_points = []
-
-    for path_index, path in enumerate(kpath):
-        for point_index, point in enumerate(path):
-            if point_index == len(path) - 1:
-                density = 1
-            else:
-                density = 10
-            coordinates = ' '.join(format(coord, '.7f') for coord in special_points[point])
-            high_symmetry_points.append(f"{coordinates} {density} ! {point}")
+    high_symmetry_points = get_high_symmetry_points(atoms, points_per_segment, kpath_density)
 
     # Write Quantum ESPRESSO scf input file
-    write(scf_path, atoms, format='espresso-in', input_data=template, pseudopotentials=template['pseudopotentials'], kspacing=template['kspacing'],crystal_coordinates=template['crystal_coordinates'], pw=False)
+    from_template(with_bands(template, symbols, 'scf')).write(scf_path, atoms)
 
     # Update template for nscf calculations
     template['control']['calculation'] = 'bands'
 
     # Write Quantum ESPRESSO nscf input file
-    write('tmp_file_0', atoms, format='espresso-in', input_data=template, pseudopotentials=template['pseudopotentials'], crystal_coordinates=template['crystal_coordinates'], pw=False)
+    write_bands_nscf(nscf_path, atoms, with_bands(template, symbols, 'bands'), high_symmetry_points)
 
-    # Compile the regular expression pattern
-    pattern_regex = re.compile("K_POINTS gamma")
-
-    # Read the file, omit lines matching the pattern
-    with open('tmp_file_0', 'r') as file:
-        lines = file.readlines()
-
-    # Keep track of lines to keep
-    lines_to_keep = [line for line in lines if not pattern_regex.search(line)]
-
-    # Write the modified content back to the nscf file
-    with open(nscf_path, 'w') as file:
-        file.writelines(lines_to_keep)
-        file.write("K_POINTS {crystal_b}\n")
-        file.write("{}\n".format(str(len(high_symmetry_points))))
-        for idx in high_symmetry_points:
-            file.write("{}\n".format(idx))
-    os.remove('tmp_file_0')
     # Generate bands file
     namelist_name = 'BANDS'
     namelist_content= {}
@@ -113,6 +157,8 @@ def main():
     parser.add_argument("-n", "--nscf", help="Path to the Quantum ESPRESSO nscf input file", metavar="NSCF_Input_filename", required=True)
     parser.add_argument("-b", "--bands", help="Path to the Quantum ESPRESSO bands input file", metavar="BANDS_Input_filename", required=True)
     parser.add_argument("-f", "--bands-data", help="Path to the Quantum ESPRESSO bands data file", metavar="BANDS_Data_filename", required=True)
+    parser.add_argument("--points-per-segment", type=int, default=POINTS_PER_SEGMENT, help="k-points between high symmetry points (default: %(default)s)")
+    parser.add_argument("--kpath-density", type=float, help="k-points per 1/Angstrom of band path, instead of a fixed number per segment")
     parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
     args = parser.parse_args()
 
@@ -124,7 +170,7 @@ def main():
     bands_data_filename = args.bands_data
     system_name = args.system_name
 
-    generate_input(template_filename, poscar_filename, scf_filename,nscf_filename,bands_filename,bands_data_filename,system_name)
+    generate_input(template_filename, poscar_filename, scf_filename,nscf_filename,bands_filename,bands_data_filename,system_name, args.points_per_segment, args.kpath_density)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 11:58:04 PM IST 2026
+###########################################################################
+# Purpose : Build N x M x K supercells and enumerate their symmetry-distinct
+#           point defects (vacancies and substitutions), writing pw.x inputs
+#           directly without intermediate POSCAR files.
+###########################################################################
+#
+# The supercell is expanded with NumPy index arrays (translations outer,
+# atoms inner, the order of ASE's repeat), so atom i of the unit cell is atom
+# i of the supercell. Sites are grouped with the symmetry of the unit cell
+# (symmetry.equivalent_atoms): one defect is generated per class and
+# species, with the number of equivalent sites in the supercell as its
+# multiplicity. The template is compiled once (pwi_renderer) and every
+# defect is rendered from it as it is generated; a manifest
+# (<system name>.defects.json) lists what was written.
+###########################################################################
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from symmetry import SYMPREC, equivalent_atoms
+from telemetry import timed
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+
+def make_supercell(atoms, repeat):
+    """
+    Repeat a structure N x M x K times.
+
+    Parameters:
+        atoms (ASE Atoms): Unit cell.
+        repeat (list): N, M, K.
+
+    Returns:
+        ASE Atoms: The supercell, ordered as ASE's atoms.repeat(repeat).
+    """
+    from ase import Atoms
+
+    repeat = np.asarray(repeat, dtype=int)
+    cell = np.asarray(atoms.cell)
+    translations = np.indices(repeat).reshape(3, -1).T @ cell
+    positions = (translations[:, None, :] + atoms.positions[None, :, :]).reshape(-1, 3)
+    numbers = np.tile(atoms.numbers, len(translations))
+    return Atoms(numbers=numbers, positions=positions, cell=cell * repeat[:, None], pbc=atoms.pbc)
+
+
+def distinct_sites(atoms, symprec=SYMPREC):
+    """
+    Group the sites of a unit cell into symmetry classes.
+
+    Returns:
+        list: (representative index, number of sites in the class) per class.
+    """
+    representatives, counts = np.unique(equivalent_atoms(atoms, symprec), return_counts=True)
+    return list(zip(representatives.tolist(), counts.tolist()))
+
+
+def parse_substitutions(specs):
+    """
+    Parse substitutions given as 'Host:Dopant' (e.g. 'Si:Ge').
+
+    Returns:
+        list: (host symbol, dopant symbol) pairs.
+    """
+    substitutions = []
+    for spec in specs or []:
+        host, separator, dopant = spec.partition(':')
+        if not separator or not host or not dopant:
+            raise ValueError("Substitution '{:s}' is not of the form Host:Dopant".format(spec))
+        substitutions.append((host, dopant))
+    return substitutions
+
+
+def iter_defects(atoms, repeat, vacancies=(), substitutions=(), symprec=SYMPREC):
+    """
+    Generate the symmetry-distinct point defects of a supercell one at a time.
+
+    Parameters:
+        atoms (ASE Atoms): Unit cell.
+        repeat (list): N, M, K.
+        vacancies (list): Species whose sites are removed one at a time.
+        substitutions (list): (host, dopant) pairs (see parse_substitutions).
+        symprec (float): Symmetry tolerance in Angstrom.
+
+    Yields:
+        tuple: (label, description dictionary, ASE Atoms of the defective supercell).
+    """
+    from ase.data import atomic_numbers
+
+    supercell = make_supercell(atoms, repeat)
+    blocks = int(np.prod(repeat))
+    symbols = atoms.get_chemical_symbols()
+    keep = np.ones(len(supercell), dtype=bool)
+
+    for site, count in distinct_sites(atoms, symprec):
+        symbol = symbols[site]
+        description = {'site': site, 'host': symbol, 'multiplicity': count * blocks, 'position': supercell.positions[site].tolist()}
+        if symbol in vacancies:
+            keep[site] = False
+            defect = supercell[keep]
+            keep[site] = True
+            yield 'V_{:s}{:d}'.format(symbol, site), dict(description, kind='vacancy', species=None), defect
+        for host, dopant in substitutions:
+            if host != symbol:
+                continue
+            defect = supercell.copy()
+            defect.numbers[site] = atomic_numbers[dopant]
+            yield '{:s}_{:s}{:d}'.format(dopant, symbol, site), dict(description, kind='substitution', species=dopant), defect
+
+
+@timed
+def generate_defects(poscar_path, template_path, output_dir, repeat, vacancies=(), substitutions=(), system_name=None,
+                     pristine=False, poscar=False, symprec=SYMPREC):
+    """
+    Write a pw.x input for every symmetry-distinct point defect of a supercell.
+
+    Parameters:
+        poscar_path (str): Path to the unit cell POSCAR file.
+        template_path (str): Path to the template file (JSON).
+        output_dir (str): Directory for the generated files.
+        repeat (list): N, M, K.
+        vacancies (list): Species whose sites are removed one at a time.
+        substitutions (list): (host, dopant) pairs.
+        system_name (str): Base name of the files (default: the POSCAR file name).
+        pristine (bool): Also write the defect-free supercell.
+        poscar (bool): Also write a POSCAR file per structure.
+        symprec (float): Symmetry tolerance in Angstrom.
+
+    Returns:
+        list: Manifest entries (dictionaries) of the written structures.
+    """
+    from ase.io import read, write
+    from occupations import valence_charges, with_bands
+    from pseudo import resolve_template
+    from pwi_renderer import from_template
+
+    atoms = read(poscar_path)
+    with open(template_path, 'r') as f:
+        template_data = json.load(f)
+    # One template for all defects: pseudopotentials and cutoffs of the host and dopants
+    resolve_template(template_data, atoms.get_chemical_symbols() + [dopant for _, dopant in substitutions])
+    if template_data['system'].get('nbnd') == 'auto':
+        # nbnd of the supercell with the most electrons among the defects
+        try:
+            charges = valence_charges(template_data, atoms.get_chemical_symbols() + [dopant for _, dopant in substitutions])
+        except ValueError:
+            # with_bands falls back to the template's nbnd
+            charges = {}
+        changes = [-charges[symbol] for symbol in vacancies if symbol in charges]
+        changes += [charges[dopant] - charges[host] for host, dopant in substitutions if host in charges]
+        template_data = with_bands(template_data, atoms.get_chemical_symbols() * int(np.prod(repeat)), electron_changes=changes)
+    # Compiled once; only the structure, prefix and outdir change per file
+    renderer = from_template(template_data, variables=[('control', 'prefix'), ('control', 'outdir')])
+
+    system_name = system_name or os.path.basename(poscar_path).replace('.poscar', '')
+    system_name = "{:s}_{:d}x{:d}x{:d}".format(system_name, *repeat)
+    os.makedirs(output_dir, exist_ok=True)
+
+    def write_structure(label, structure):
+        name = "{:s}_{:s}".format(system_name, label) if label else system_name
+        files = {'pwi': os.path.join(output_dir, name + '.in')}
+        renderer.write(files['pwi'], structure, prefix=name, outdir="./" + name)
+        if poscar:
+            files['poscar'] = os.path.join(output_dir, name + '.poscar')
+            write(files['poscar'], structure, format='vasp', direct=True)
+        return dict(files, name=name, natoms=len(structure), formula=structure.get_chemical_formula())
+
+    manifest = []
+    if pristine:
+        manifest.append(dict(write_structure(None, make_supercell(atoms, repeat)), label='pristine', kind='pristine'))
+    for label, description, defect in iter_defects(atoms, repeat, vacancies, substitutions, symprec):
+        manifest.append(dict(write_structure(label, defect), label=label, **description))
+
+    manifest_path = os.path.join(output_dir, system_name + '.defects.json')
+    with open(manifest_path, 'w') as f:
+        json.dump({'poscar': os.path.abspath(poscar_path), 'template': os.path.abspath(template_path), 'repeat': list(repeat),
+                   'symprec': symprec, 'structures': manifest}, f, indent=2)
+
+    print("---------------------------------------------------")
+    print("{:<36s}: {:d} x {:d} x {:d} ({:d} atoms)".format("Supercell", *repeat, len(atoms) * int(np.prod(repeat))))
+    print("{:<36s}: {:d}".format("Structures written", len(manifest)))
+    print("{:<36s}: {:s}".format("Manifest", manifest_path))
+    print("---------------------------------------------------")
+    return manifest
+
+
+def main():
+    """
+    Main function to generate the point defects of a supercell.
+    """
+    parser = argparse.ArgumentParser(description="Build an N x M x K supercell and write pw.x inputs of its symmetry-distinct vacancies and substitutions.")
+    parser.add_argument("-p", "--poscar", help="Path to the unit cell POSCAR file", metavar="POSCAR_filename", required=True)
+    parser.add_argument("-r", "--repeat", type=int, nargs=3, default=[1, 1, 1], metavar=("N", "M", "K"), help="Supercell size (default: 1 1 1)")
+    parser.add_argument("-t", "--template", help="Path to the template file", metavar="Template_filename", required=True)
+    parser.add_argument("-o", "--output-dir", help="Output directory", metavar="Output_directory", required=True)
+    parser.add_argument("-sn", "--system-name", help="Base name of the files (default: the POSCAR file name)")
+    parser.add_argument("--vacancies", nargs="*", metavar="SPECIES", help="Vacancies of these species (all species if none given)")
+    parser.add_argument("--substitutions", nargs="+", default=[], metavar="HOST:DOPANT", help="Substitutions, e.g. Si:Ge")
+    parser.add_argument("--pristine", action="store_true", help="Also write the defect-free supercell")
+    parser.add_argument("--poscar-files", action="store_true", help="Also write a POSCAR file per structure")
+    parser.add_argument("-s", "--symprec", type=float, default=SYMPREC, help="Symmetry tolerance in Angstrom (default: %(default)s)")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    try:
+        substitutions = parse_substitutions(args.substitutions)
+    except ValueError as error:
+        parser.error(str(error))
+    vacancies = args.vacancies or []
+    if args.vacancies is not None and not args.vacancies:
+        from ase.io import read
+
+        vacancies = sorted(set(read(args.poscar).get_chemical_symbols()))
+    if not (vacancies or substitutions or args.pristine):
+        parser.error("nothing to generate: give --vacancies, --substitutions or --pristine")
+
+    generate_defects(args.poscar, args.template, args.output_dir, args.repeat, vacancies, substitutions, args.system_name,
+                     args.pristine, args.poscar_files, args.symprec)
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,12 @@
 
 import argparse
 import json
-from ase.io import read, write
+from ase.io import read
 import f90nml
+from occupations import with_bands
+from pseudo import resolve_template
+from pwi_renderer import from_template
+from telemetry import timed
 
 VERSION = '1.0.0'
 AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
@@ -31,6 +35,7 @@ def write_namelist(file_path, namelist_name, namelist_content):
     f90nml.write(namelist, file_path, force=True)
 
 
+@timed
 def generate_input(template_path, poscar_path, scf_path, nscf_path, pdos_path, pdos_data_path,system_name):
     """
     Generate Quantum Espresso input files for PDOS calculations.
@@ -52,6 +57,8 @@ def generate_input(template_path, poscar_path, scf_path, nscf_path, pdos_path, p
 
     # Load POSCAR file
     atoms = read(poscar_path)
+    symbols = atoms.get_chemical_symbols()
+    resolve_template(template, symbols)
 
     # Update template with information from the POSCAR file
     num_atoms = len(atoms)
@@ -65,13 +72,13 @@ def generate_input(template_path, poscar_path, scf_path, nscf_path, pdos_path, p
     template['system']['ntyp'] = num_species
 
     # Write Quantum ESPRESSO SCF input file
-    write(scf_path, atoms, format='espresso-in', input_data=template, pseudopotentials=template['pseudopotentials'], kspacing=template['kspacing'], crystal_coordinates=template['crystal_coordinates'], pw=False)
+    from_template(with_bands(template, symbols, 'scf')).write(scf_path, atoms)
 
     # Update template for NSCF calculations
     template['control']['calculation'] = 'nscf'
 
     # Write Quantum ESPRESSO NSCF input file
-    write(nscf_path, atoms, format='espresso-in', input_data=template, pseudopotentials=template['pseudopotentials'], kspacing=template['kspacing'], crystal_coordinates=template['crystal_coordinates'], pw=False)
+    from_template(with_bands(template, symbols, 'pdos')).write(nscf_path, atoms)
 
     # Write Quantum ESPRESSO PDOS input file
     namelist_name = 'PROJWFC'
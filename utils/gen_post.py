@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 11:40:52 AM IST 2026
+###########################################################################
+# Purpose : This script converts a POSCAR file to Quantum Espresso input files
+#           for BANDS, DOS and PDOS calculations sharing a single SCF run.
+###########################################################################
+
+import argparse
+import json
+import os
+from ase.io import read
+
+from gen_bands import POINTS_PER_SEGMENT, get_high_symmetry_points, write_bands_nscf, write_namelist
+from occupations import with_bands
+from pseudo import resolve_template
+from pwi_renderer import from_template
+from telemetry import timed
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+# Order in which the generated inputs must be run. All stages share one
+# prefix/outdir: the SCF charge density is computed once and reused. bands.x
+# reads the wavefunctions of the 'bands' pw.x run, so it has to run before the
+# NSCF run overwrites them; dos.x and projwfc.x both read the NSCF run.
+# With separate_outdirs the bands and DOS/PDOS branches use their own outdir
+# (a copy of the SCF outdir, see BRANCH_OUTDIRS) and may run concurrently.
+STAGES = [
+    ('scf', 'pw.x'),
+    ('bands_nscf', 'pw.x'),
+    ('bands', 'bands.x'),
+    ('nscf', 'pw.x'),
+    ('dos', 'dos.x'),
+    ('pdos', 'projwfc.x'),
+]
+
+# File name suffixes appended to <output_dir>/<system_name>
+SUFFIXES = {
+    'scf': '.scf.in',
+    'bands_nscf': '.bands_nscf.in',
+    'bands': '.bands.in',
+    'bands_data': '.bands.dat',
+    'nscf': '.nscf.in',
+    'dos': '.dos.in',
+    'dos_data': '.dos.dat',
+    'pdos': '.pdos.in',
+    'pdos_data': '.pdos.dat',
+}
+
+# Outdir suffix of each branch when generate_input(..., separate_outdirs=True)
+BRANCH_OUTDIRS = {
+    'bands': '_bands',
+    'dos': '_dos',
+}
+
+
+def get_paths(output_dir, system_name):
+    """
+    Return the paths of all files written by generate_input.
+
+    Parameters:
+        output_dir (str): Directory receiving the generated files.
+        system_name (str): Name of the system.
+
+    Returns:
+        dict: File path per key of SUFFIXES.
+    """
+    return {key: os.path.join(output_dir, system_name + suffix) for key, suffix in SUFFIXES.items()}
+
+
+@timed
+def generate_input(template_path, poscar_path, output_dir, system_name, separate_outdirs=False, points_per_segment=POINTS_PER_SEGMENT, kpath_density=None):
+    """
+    Generate Quantum Espresso input files for BANDS, DOS and PDOS calculations
+    on top of one shared SCF calculation.
+
+    Parameters:
+        template_path (str): Path to the template file.
+        poscar_path (str): Path to the POSCAR file.
+        output_dir (str): Directory receiving the generated files.
+        system_name (str): Name of the system (prefix and outdir).
+        separate_outdirs (bool): Give the bands and DOS/PDOS branches their own
+            outdir, to be filled with a copy of the SCF outdir before they run.
+        points_per_segment (int): k-points between high symmetry points.
+        kpath_density (float): k-points per 1/Angstrom of band path, instead
+            of points_per_segment.
+
+    Returns:
+        dict: File path per key of SUFFIXES, plus the 'outdir' of the SCF run
+        and the 'outdir_bands' and 'outdir_dos' of the two branches.
+    """
+    # Load template from JSON
+    with open(template_path, 'r') as f:
+        template = json.load(f)
+
+    # Load POSCAR file
+    atoms = read(poscar_path)
+    symbols = atoms.get_chemical_symbols()
+    resolve_template(template, symbols)
+
+    paths = get_paths(output_dir, system_name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Update template with information from the POSCAR file
+    num_atoms = len(atoms)
+    num_species = len(set(atoms.get_chemical_symbols()))
+    #
+    template['control']['prefix'] = system_name
+    template['control']['title'] = system_name
+    template['control']['outdir'] = "./" + str(system_name)
+    paths['outdir'] = template['control']['outdir']
+    for branch, suffix in BRANCH_OUTDIRS.items():
+        paths['outdir_' + branch] = paths['outdir'] + suffix if separate_outdirs else paths['outdir']
+    #
+    template['system']['nat'] = num_atoms
+    template['system']['ntyp'] = num_species
+
+    high_symmetry_points = get_high_symmetry_points(atoms, points_per_segment, kpath_density)
+
+    # Write the shared Quantum ESPRESSO SCF input file
+    from_template(with_bands(template, symbols, 'scf')).write(paths['scf'], atoms)
+
+    # Write Quantum ESPRESSO bands (band path) input file
+    template['control']['calculation'] = 'bands'
+    template['control']['outdir'] = paths['outdir_bands']
+    write_bands_nscf(paths['bands_nscf'], atoms, with_bands(template, symbols, 'bands'), high_symmetry_points)
+
+    # Write Quantum ESPRESSO NSCF input file shared by DOS and PDOS
+    template['control']['calculation'] = 'nscf'
+    template['control']['outdir'] = paths['outdir_dos']
+    template['system']['occupations'] = 'tetrahedra'
+    # Enough bands for both the DOS and the PDOS run sharing it
+    from_template(with_bands(template, symbols, ['dos', 'pdos'])).write(paths['nscf'], atoms)
+
+    # Write BANDS, DOS and PROJWFC namelists
+    write_namelist(paths['bands'], 'BANDS', {
+        'prefix': template['control']['prefix'],
+        'outdir': paths['outdir_bands'],
+        'filband': paths['bands_data']
+    })
+    write_namelist(paths['dos'], 'DOS', {
+        'prefix': template['control']['prefix'],
+        'outdir': paths['outdir_dos'],
+        'Emin': -20,
+        'Emax': 20,
+        'DeltaE': 0.1,
+        'fildos': paths['dos_data']
+    })
+    write_namelist(paths['pdos'], 'PROJWFC', {
+        'prefix': template['control']['prefix'],
+        'outdir': paths['outdir_dos'],
+        'filpdos': paths['pdos_data']
+    })
+
+    # Displaying file paths and the order in which they have to be run.
+    print("-----------------------------------------------------------")
+    for step, (key, binary) in enumerate(STAGES, start=1):
+        print("Step {:d} ({:10s}) {:<12s}: {:s}".format(step, binary, key, paths[key]))
+    print("BANDS data collection file          : {:s}".format(paths['bands_data']))
+    print("DOS data collection file            : {:s}".format(paths['dos_data']))
+    print("PDOS data collection file           : {:s}".format(paths['pdos_data']))
+    print("-----------------------------------------------------------")
+
+    return paths
+
+
+def main():
+    """
+    Main function to parse command line arguments and execute conversion.
+    """
+    parser = argparse.ArgumentParser(description="Convert VASP POSCAR file to Quantum ESPRESSO input files for BANDS, DOS and PDOS calculations sharing one SCF run.")
+    parser.add_argument("-p", "--poscar", help="Path to the POSCAR file", metavar="POSCAR", required=True)
+    parser.add_argument("-t", "--template", help="Path to the template file", metavar="Template_filename", required=True)
+    parser.add_argument("-sn", "--system-name", help="Name of the system (prefix and outdir)", metavar="System_name", required=True)
+    parser.add_argument("-o", "--output-dir", help="Directory for the generated files", metavar="Output_dir", required=True)
+    parser.add_argument("--points-per-segment", type=int, default=POINTS_PER_SEGMENT, help="k-points between high symmetry points (default: %(default)s)")
+    parser.add_argument("--kpath-density", type=float, help="k-points per 1/Angstrom of band path, instead of a fixed number per segment")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    generate_input(args.template, args.poscar, args.output_dir, args.system_name, points_per_segment=args.points_per_segment, kpath_density=args.kpath_density)
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,35 @@
 # Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
 # Written on Thu Apr  4 10:33:01 AM IST 2024
 ############################################################################
-# Purpose : This script applies uniaxial strain to a POSCAR file
+# Purpose : This script applies uniaxial strain to a POSCAR file, or a
+#           sweep of arbitrary strains (lists of percentages or full strain
+#           tensors) written in bulk
 ############################################################################
 
 import argparse
+import json
+import os
 from ase.io import read, write
 import numpy as np
+from telemetry import timed
+
+# Sweep modes: strained components of the strain tensor for a percentage.
+# Shear modes set both symmetric off-diagonal components (tensor shear).
+STRAIN_MODES = {
+    'x': [(0, 0)],
+    'y': [(1, 1)],
+    'z': [(2, 2)],
+    'xy': [(0, 0), (1, 1)],
+    'xz': [(0, 0), (2, 2)],
+    'yz': [(1, 1), (2, 2)],
+    'hydrostatic': [(0, 0), (1, 1), (2, 2)],
+    'shear_yz': [(1, 2), (2, 1)],
+    'shear_xz': [(0, 2), (2, 0)],
+    'shear_xy': [(0, 1), (1, 0)],
+}
+
+# Voigt order of the strain components
+VOIGT_INDICES = [(0, 0), (1, 1), (2, 2), (1, 2), (0, 2), (0, 1)]
 
 def apply_strain(atoms, strain_direction, strain_percentage):
     """
@@ -67,23 +90,258 @@ def write_poscar(atoms, output_file):
     print("Strained atomic structure written to {:s}".format(output_file))
     print("---------------------------------------------------")
 
-def main():
-    parser = argparse.ArgumentParser(description='Apply uniaxial strain to a POSCAR file')
-    parser.add_argument('-i', '--input-poscar', type=str, required=True, help='Path to the input POSCAR file')
-    parser.add_argument('-d', '--strain-direction', type=str, choices=['x', 'y', 'z'], required=True, help='Direction of the strain (x, y, or z)')
-    parser.add_argument('-s', '--strain-percentage', type=float, required=True, help='Strain percentage to apply')
-    parser.add_argument('-o', '--output-poscar', type=str, required=True, help='Path to write the strained POSCAR file')
-
-    args = parser.parse_args()
+@timed
+def strain_poscar(input_poscar, strain_direction, strain_percentage, output_poscar):
+    """
+    Read a POSCAR file, apply uniaxial strain and write the strained POSCAR file.
 
+    Parameters:
+        input_poscar (str): Path to the input POSCAR file.
+        strain_direction (str): Direction of the strain ('x', 'y', or 'z').
+        strain_percentage (float): Strain percentage to apply.
+        output_poscar (str): Path to write the strained POSCAR file.
+    """
     # Read the initial structure from the input POSCAR file
-    initial_structure = read_poscar(args.input_poscar)
+    initial_structure = read_poscar(input_poscar)
 
     # Apply uniaxial strain
-    strained_atoms = apply_strain(initial_structure.copy(), args.strain_direction, args.strain_percentage)
+    strained_atoms = apply_strain(initial_structure.copy(), strain_direction, strain_percentage)
 
     # Write the strained atomic structure to the output POSCAR file
-    write_poscar(strained_atoms, args.output_poscar)
+    write_poscar(strained_atoms, output_poscar)
+
+def voigt_to_tensor(voigt):
+    """
+    Convert strains in Voigt notation to 3x3 strain tensors.
+
+    Parameters:
+        voigt (array): (..., 6) strains [exx, eyy, ezz, 2eyz, 2exz, 2exy]
+            with engineering shear strains, as fractions.
+
+    Returns:
+        ndarray: (..., 3, 3) symmetric strain tensors.
+    """
+    voigt = np.asarray(voigt, dtype=float)
+    tensors = np.zeros(voigt.shape[:-1] + (3, 3))
+    for index, (i, j) in enumerate(VOIGT_INDICES):
+        value = voigt[..., index] if i == j else voigt[..., index] / 2.0
+        tensors[..., i, j] = value
+        tensors[..., j, i] = value
+    return tensors
+
+
+def tensor_to_voigt(tensors, engineering=True):
+    """
+    Convert 3x3 tensors to Voigt notation.
+
+    Parameters:
+        tensors (array): (..., 3, 3) symmetric tensors.
+        engineering (bool): Double the shear components (strains); False for
+            stresses.
+
+    Returns:
+        ndarray: (..., 6) components in the order of VOIGT_INDICES.
+    """
+    tensors = np.asarray(tensors, dtype=float)
+    voigt = np.stack([tensors[..., i, j] for i, j in VOIGT_INDICES], axis=-1)
+    if engineering:
+        voigt[..., 3:] *= 2.0
+    return voigt
+
+
+def strain_tensors(strain_percentages=None, mode='x', tensors=None):
+    """
+    Build a stack of strain tensors for a sweep.
+
+    Parameters:
+        strain_percentages (list): Strain percentages applied in the given mode.
+        mode (str): Key of STRAIN_MODES.
+        tensors (list): 3x3 strain tensors and/or Voigt 6-vectors, as
+            fractions; used instead of the percentages.
+
+    Returns:
+        ndarray: (N, 3, 3) strain tensors.
+    """
+    if tensors is not None:
+        stack = []
+        for tensor in tensors:
+            tensor = np.asarray(tensor, dtype=float)
+            if tensor.shape == (6,):
+                tensor = voigt_to_tensor(tensor)
+            elif tensor.shape != (3, 3):
+                raise ValueError("Strain tensors must be given as 3x3 matrices or Voigt 6-vectors.")
+            stack.append(tensor)
+        return np.array(stack).reshape(-1, 3, 3)
+
+    if mode not in STRAIN_MODES:
+        raise ValueError("Invalid strain mode. Choose one of: {:s}.".format(', '.join(STRAIN_MODES)))
+    values = np.asarray(strain_percentages, dtype=float) / 100.0
+    stack = np.zeros((len(values), 3, 3))
+    for i, j in STRAIN_MODES[mode]:
+        stack[:, i, j] = values
+    return stack
+
+
+def strained_cells(cell, strains):
+    """
+    Apply a stack of strain tensors to one cell in a single vectorized pass.
+
+    The lattice vectors (rows of cell) are transformed by (1 + strain), as
+    apply_strain does for a single uniaxial strain.
+
+    Parameters:
+        cell (array): 3x3 lattice vectors (rows).
+        strains (ndarray): (N, 3, 3) strain tensors.
+
+    Returns:
+        ndarray: (N, 3, 3) strained cells.
+    """
+    deformations = np.eye(3) + strains
+    return np.asarray(cell)[None, :, :] @ deformations.transpose(0, 2, 1)
+
+
+def strain_label(mode, strain_percentage):
+    # Shortest repr of the float, so distinct strains never share a label
+    # (+ 0.0 turns -0.0 into 0.0)
+    return "{:s}_{:+}".format(mode, float(strain_percentage) + 0.0)
+
+
+@timed
+def strain_sweep(input_poscar, output_dir, strain_percentages=None, mode='x', tensors=None, template=None, system_name=None, warm_start=False):
+    """
+    Write a strained POSCAR file (and optionally a QE input) for every strain of a sweep.
+
+    The structure and the template are read once and all strained cells are
+    computed together. A manifest (<system name>_<mode>.strain.json) records
+    the reference cell and the strain tensor of every structure, for
+    strain_fit.py.
+
+    Parameters:
+        input_poscar (str): Path to the input POSCAR file.
+        output_dir (str): Directory for the strained files.
+        strain_percentages (list): Strain percentages applied in the given mode.
+        mode (str): Key of STRAIN_MODES.
+        tensors (list): 3x3 strain tensors or Voigt 6-vectors, as fractions;
+            used instead of the percentages.
+        template (str): Path to a template file; a QE input is written next to
+            every POSCAR file when given.
+        system_name (str): Base name of the files (default: the input file name).
+        warm_start (bool): Write the QE inputs to start from the converged
+            run of the nearest smaller strain (see warm_start.py), recorded
+            as the 'seed' of each structure in the manifest. All inputs then
+            share the dense FFT grid (nr1, nr2, nr3) of the largest strained
+            cell, unless the template sets it.
+
+    Returns:
+        list: (label, POSCAR path, QE input path or None) for every strain.
+    """
+    from occupations import with_bands
+    from pseudo import resolve_template
+    from pwi_renderer import from_template
+
+    strains = strain_tensors(strain_percentages, mode, tensors)
+    if tensors is None:
+        labels = [strain_label(mode, value) for value in strain_percentages]
+    else:
+        labels = ["tensor_{:03d}".format(index) for index in range(len(strains))]
+    duplicates = sorted({label for label in labels if labels.count(label) > 1})
+    if duplicates:
+        raise ValueError("strains given more than once: {:s}".format(", ".join(duplicates)))
+
+    system_name = system_name or os.path.basename(input_poscar).replace('.poscar', '')
+    os.makedirs(output_dir, exist_ok=True)
+    atoms = read_poscar(input_poscar)
+    cells = strained_cells(atoms.get_cell(), strains)
+
+    seeds = [None] * len(strains)
+    if warm_start and template:
+        from warm_start import seed_tree
+        seeds = seed_tree(strains)
+
+    renderer = warm_renderer = None
+    if template:
+        with open(template, 'r') as f:
+            template_data = json.load(f)
+        resolve_template(template_data, atoms.get_chemical_symbols())
+        template_data = with_bands(template_data, atoms.get_chemical_symbols())
+        template_data['system']['nat'] = len(atoms)
+        template_data['system']['ntyp'] = len(set(atoms.get_chemical_symbols()))
+        if warm_start and not any(key in template_data['system'] for key in ('nr1', 'nr2', 'nr3')):
+            # Saved files can only be read back on the grid they were written on
+            from parallel import fft_grid
+            system = template_data['system']
+            ecutrho = float(system.get('ecutrho') or 4.0 * float(system['ecutwfc']))
+            grid = np.max([fft_grid(cell, ecutrho) for cell in cells], axis=0)
+            system.update(zip(('nr1', 'nr2', 'nr3'), grid.tolist()))
+        # Compiled once; only the structure, prefix and outdir change per file
+        renderer = from_template(template_data, variables=[('control', 'prefix'), ('control', 'outdir')])
+        if warm_start:
+            from warm_start import WARM_START
+            template_data['electrons'] = dict(template_data.get('electrons', {}), **WARM_START)
+            warm_renderer = from_template(template_data, variables=[('control', 'prefix'), ('control', 'outdir')])
+    scaled_positions = atoms.get_scaled_positions(wrap=False)
+
+    written = []
+    manifest = []
+    for label, strain, cell, seed in zip(labels, strains, cells, seeds):
+        strained_atoms = atoms.copy()
+        strained_atoms.set_cell(cell)
+        strained_atoms.set_scaled_positions(scaled_positions)
+
+        name = "{:s}_{:s}".format(system_name, label)
+        poscar_path = os.path.join(output_dir, name + '.poscar')
+        write(poscar_path, strained_atoms, format='vasp', direct=True)
+
+        pwi_path = None
+        if renderer is not None:
+            pwi_path = os.path.join(output_dir, name + '.in')
+            (renderer if seed is None else warm_renderer).write(pwi_path, strained_atoms, prefix=name, outdir="./" + name)
+        written.append((label, poscar_path, pwi_path))
+        manifest.append({'label': label, 'strain': strain.tolist(), 'volume': abs(np.linalg.det(cell)), 'poscar': poscar_path, 'pwi': pwi_path,
+                         'seed': None if seed is None else labels[seed]})
+
+    manifest_path = os.path.join(output_dir, "{:s}_{:s}.strain.json".format(system_name, mode if tensors is None else 'tensors'))
+    with open(manifest_path, 'w') as f:
+        json.dump({'system': system_name, 'poscar': os.path.abspath(input_poscar), 'formula': atoms.get_chemical_formula(),
+                   'natoms': len(atoms), 'cell': np.asarray(atoms.get_cell()).tolist(), 'volume': atoms.get_volume(),
+                   'structures': manifest}, f, indent=2)
+
+    print("---------------------------------------------------")
+    print("{:d} strained structures written to {:s}".format(len(written), output_dir))
+    print("Manifest written to {:s}".format(manifest_path))
+    print("---------------------------------------------------")
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply uniaxial strain to a POSCAR file, or write a sweep of strained structures')
+    parser.add_argument('-i', '--input-poscar', type=str, required=True, help='Path to the input POSCAR file')
+    parser.add_argument('-d', '--strain-direction', type=str, choices=['x', 'y', 'z'], help='Direction of the strain (x, y, or z)')
+    parser.add_argument('-s', '--strain-percentage', type=float, help='Strain percentage to apply')
+    parser.add_argument('-o', '--output-poscar', type=str, help='Path to write the strained POSCAR file')
+    parser.add_argument('--strains', type=float, nargs='+', help='Sweep: strain percentages applied in --mode')
+    parser.add_argument('--mode', type=str, choices=list(STRAIN_MODES), default='x', help='Sweep: strain mode (default: x)')
+    parser.add_argument('--tensors', type=str, help='Sweep: JSON file with a list of 3x3 strain tensors or Voigt 6-vectors (fractions)')
+    parser.add_argument('--output-dir', type=str, help='Sweep: directory for the strained files')
+    parser.add_argument('-t', '--template', type=str, help='Sweep: template file; also write a QE input per strain')
+    parser.add_argument('-sn', '--system-name', type=str, help='Sweep: base name of the files (default: input file name)')
+    parser.add_argument('--warm-start', action='store_true', help='Sweep: start each QE run from the converged run of the nearest smaller strain (run them with warm_start.py)')
+
+    args = parser.parse_args()
+
+    if args.strains or args.tensors:
+        if not args.output_dir:
+            parser.error('a sweep needs --output-dir')
+        tensors = None
+        if args.tensors:
+            with open(args.tensors, 'r') as f:
+                tensors = json.load(f)
+        strain_sweep(args.input_poscar, args.output_dir, strain_percentages=args.strains, mode=args.mode, tensors=tensors,
+                     template=args.template, system_name=args.system_name, warm_start=args.warm_start)
+        return
+
+    if args.strain_direction is None or args.strain_percentage is None or args.output_poscar is None:
+        parser.error('the following arguments are required: -d/--strain-direction, -s/--strain-percentage, -o/--output-poscar')
+    strain_poscar(args.input_poscar, args.strain_direction, args.strain_percentage, args.output_poscar)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 03:46:10 PM IST 2026
+###########################################################################
+# Purpose : This script follows running pw.x jobs through their output
+#           files and reports SCF progress, ETA and stalled convergence.
+###########################################################################
+
+import argparse
+import glob
+import math
+import os
+import re
+import time
+
+from telemetry import parse_qe_time
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+# Iterations without improvement of the SCF accuracy before warning
+STALL_ITERATIONS = 10
+
+ITERATION_RE = re.compile(r"^\s*iteration #\s*(\d+)")
+ENERGY_RE = re.compile(r"^\s*total energy\s*=\s*(-?\d+\.\d+)\s+Ry")
+FINAL_ENERGY_RE = re.compile(r"^!\s+total energy\s*=\s*(-?\d+\.\d+)\s+Ry")
+ACCURACY_RE = re.compile(r"estimated scf accuracy\s*<\s*(\S+)\s+Ry")
+CPU_TIME_RE = re.compile(r"total cpu time spent up to now is\s*(\S+)\s+secs")
+THRESHOLD_RE = re.compile(r"convergence threshold\s*=\s*(\S+)")
+WALL_RE = re.compile(r"PWSCF\s*:.*CPU\s+(.*)WALL")
+
+
+class JobMonitor:
+    """
+    Progress of one pw.x job, updated from the new bytes of its output file.
+
+    Parameters:
+        pwo_path (str): Path to the pw.x output file.
+        stall_iterations (int): Iterations without a better SCF accuracy
+            after which the job is reported as stalled.
+    """
+
+    def __init__(self, pwo_path, stall_iterations=STALL_ITERATIONS):
+        self.pwo_path = pwo_path
+        self.stall_iterations = stall_iterations
+        self.offset = 0
+        self.partial = ''
+        self.threshold = None
+        self.iteration = 0
+        self.ionic_step = 0
+        self.energy = None
+        self.accuracies = []
+        self.cpu_times = []
+        self.best_accuracy = None
+        self.since_best = 0
+        self.wall_time = None
+        self.done = False
+
+    def update(self):
+        """
+        Parse the lines appended to the output file since the last update.
+
+        Returns:
+            bool: True if new lines were read.
+        """
+        if not os.path.exists(self.pwo_path):
+            return False
+        with open(self.pwo_path, 'r', errors='replace') as f:
+            f.seek(self.offset)
+            chunk = f.read()
+            self.offset = f.tell()
+        if not chunk:
+            return False
+
+        lines = (self.partial + chunk).split('\n')
+        # Keep an unfinished last line for the next update
+        self.partial = lines.pop()
+        for line in lines:
+            self.parse_line(line)
+        return True
+
+    def parse_line(self, line):
+        match = ITERATION_RE.match(line)
+        if match:
+            self.iteration = int(match.group(1))
+            if self.iteration == 1:
+                # A new SCF cycle starts: one more ionic step
+                self.ionic_step += 1
+                self.accuracies = []
+                self.cpu_times = []
+                self.best_accuracy = None
+                self.since_best = 0
+            return
+        match = ENERGY_RE.match(line) or FINAL_ENERGY_RE.match(line)
+        if match:
+            self.energy = float(match.group(1))
+            return
+        match = ACCURACY_RE.search(line)
+        if match:
+            accuracy = float(match.group(1))
+            self.accuracies.append(accuracy)
+            if self.best_accuracy is None or accuracy < self.best_accuracy:
+                self.best_accuracy = accuracy
+                self.since_best = 0
+            else:
+                self.since_best += 1
+            return
+        match = CPU_TIME_RE.search(line)
+        if match:
+            self.cpu_times.append(float(match.group(1)))
+            return
+        match = THRESHOLD_RE.search(line)
+        if match and self.threshold is None:
+            self.threshold = float(match.group(1))
+            return
+        match = WALL_RE.search(line)
+        if match:
+            self.wall_time = parse_qe_time(match.group(1))
+            return
+        if 'JOB DONE.' in line:
+            self.done = True
+
+    @property
+    def stalled(self):
+        return not self.done and self.since_best >= self.stall_iterations
+
+    def eta(self):
+        """
+        Estimate the seconds left in the current SCF cycle.
+
+        The log of the SCF accuracy is extrapolated linearly over the
+        iterations of the current cycle down to the convergence threshold,
+        and multiplied by the average time per iteration.
+
+        Returns:
+            float: Seconds, or None when there is not enough data.
+        """
+        if self.done:
+            return 0.0
+        if self.threshold is None or len(self.accuracies) < 3 or len(self.cpu_times) < 2:
+            return None
+        logs = [math.log10(value) for value in self.accuracies[-5:] if value > 0]
+        if len(logs) < 2:
+            return None
+        rate = (logs[0] - logs[-1]) / (len(logs) - 1)
+        if rate <= 0:
+            return None
+        remaining = max(0.0, (logs[-1] - math.log10(self.threshold)) / rate)
+        per_iteration = (self.cpu_times[-1] - self.cpu_times[0]) / (len(self.cpu_times) - 1)
+        return remaining * per_iteration
+
+    def summary(self):
+        """
+        Return a one-line progress report.
+        """
+        if self.done:
+            state = 'done' + ('' if self.wall_time is None else ' ({:.1f}s wall)'.format(self.wall_time))
+        elif self.stalled:
+            state = 'STALLED ({:d} iterations without progress)'.format(self.since_best)
+        else:
+            eta = self.eta()
+            state = 'running' + ('' if eta is None else ', ETA {:.0f}s'.format(eta))
+        energy = 'n/a' if self.energy is None else '{:.8f}'.format(self.energy)
+        accuracy = 'n/a' if not self.accuracies else '{:.2e}'.format(self.accuracies[-1])
+        cpu_time = 'n/a' if not self.cpu_times else '{:.1f}s'.format(self.cpu_times[-1])
+        return "{:<40s} ionic {:>3d}  scf {:>3d}  E = {:>16s} Ry  acc = {:>9s} Ry  cpu {:>8s}  {:s}".format(
+            os.path.basename(self.pwo_path), self.ionic_step, self.iteration, energy, accuracy, cpu_time, state)
+
+
+def find_outputs(sources):
+    """
+    Expand directories and glob patterns into a sorted list of .out files.
+    """
+    paths = set()
+    for source in sources:
+        if os.path.isdir(source):
+            paths.update(glob.glob(os.path.join(source, '*.out')))
+        else:
+            paths.update(glob.glob(source) or [source])
+    return sorted(paths)
+
+
+def monitor(sources, interval=5.0, once=False, stall_iterations=STALL_ITERATIONS):
+    """
+    Report on all jobs until they are done.
+
+    New output files matching the sources are picked up on every round;
+    each file is only read from where the previous round stopped.
+
+    Parameters:
+        sources (list): Output files, directories or glob patterns.
+        interval (float): Seconds between reports.
+        once (bool): Report a single time and return.
+        stall_iterations (int): See JobMonitor.
+
+    Returns:
+        dict: JobMonitor per output file.
+    """
+    jobs = {}
+    while True:
+        for path in find_outputs(sources):
+            if path not in jobs:
+                jobs[path] = JobMonitor(path, stall_iterations=stall_iterations)
+        for job in jobs.values():
+            job.update()
+
+        print("----------------------------------------------------------- {:s}".format(time.strftime("%H:%M:%S")))
+        for job in jobs.values():
+            print(job.summary())
+        for job in jobs.values():
+            if job.stalled:
+                print("Warning: SCF of {:s} has not improved in {:d} iterations".format(job.pwo_path, job.since_best))
+
+        if once or (jobs and all(job.done for job in jobs.values())):
+            return jobs
+        time.sleep(interval)
+
+
+def main():
+    """
+    Main function to parse command line arguments and start monitoring.
+    """
+    parser = argparse.ArgumentParser(description="Follow running Quantum ESPRESSO pw.x jobs through their output files.")
+    parser.add_argument("-o", "--pwo", nargs="+", help="Output files, directories or glob patterns", metavar="QE_Output_filename", required=True)
+    parser.add_argument("-i", "--interval", type=float, default=5.0, help="Seconds between reports (default: 5)")
+    parser.add_argument("-s", "--stall-iterations", type=int, default=STALL_ITERATIONS, help="Iterations without progress before warning (default: %(default)s)")
+    parser.add_argument("-1", "--once", action="store_true", help="Report once and exit")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    try:
+        monitor(args.pwo, interval=args.interval, once=args.once, stall_iterations=args.stall_iterations)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
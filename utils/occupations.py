@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sun Oct 18 02:14:52 AM IST 2026
+###########################################################################
+# Purpose : Number of bands (nbnd) and occupations of a structure per
+#           calculation type, from its valence electron count (z_valence of
+#           its pseudopotentials, see pseudo.py) and a configurable policy.
+###########################################################################
+#
+# Templates opt in with "nbnd": "auto"; an explicit nbnd is kept, and without
+# nbnd pw.x chooses. With N occupied bands (half the valence electrons, all
+# of them for noncollinear runs) a calculation of type t gets
+#
+#   nbnd = max(ceil(factor_t N), ceil(N) + extra_t)
+#
+# and never fewer than pw.x itself would use with smearing or tetrahedra
+# (max(1.2 N, N + 4)). A template "nbnd_policy" object, e.g.
+# {"bands": {"factor": 2.0, "extra": 12}}, overrides NBND_POLICY per type.
+# Fixed occupations with an odd electron count (no spin polarization) are
+# switched to smearing, which pw.x would otherwise refuse.
+#
+# Without a pseudopotential index (pseudo directory missing, see pseudo.py)
+# or a z_valence for every species, "auto" falls back to the template's
+# "fallback_nbnd", else to pw.x's own choice, with a warning.
+###########################################################################
+
+import argparse
+import collections
+import copy
+import json
+import math
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+# factor and extra bands over the occupied ones, per calculation type:
+# SCF (and relaxations) only need the occupied bands, band structures and
+# densities of states some empty bands above the Fermi level
+NBND_POLICY = {
+    'scf': {'factor': 1.0, 'extra': 0},
+    'bands': {'factor': 1.5, 'extra': 8},
+    'dos': {'factor': 1.3, 'extra': 6},
+    'pdos': {'factor': 1.2, 'extra': 4},
+}
+
+# Policy type of each pw.x calculation (NSCF runs feed DOS calculations)
+CALCULATION_TYPES = {'scf': 'scf', 'relax': 'scf', 'vc-relax': 'scf', 'md': 'scf', 'vc-md': 'scf', 'bands': 'bands', 'nscf': 'dos'}
+
+# pw.x's own number of bands for partial occupations
+METALLIC_POLICY = {'factor': 1.2, 'extra': 4}
+METALLIC_OCCUPATIONS = ('smearing', 'tetrahedra', 'tetrahedra_lin', 'tetrahedra_opt')
+
+# Smearing used when fixed occupations are impossible
+SMEARING = {'smearing': 'mv', 'degauss': 0.02}
+
+
+def valence_charges(template, symbols):
+    """
+    Return the z_valence of the pseudopotential of each element.
+
+    Parameters:
+        template (dict): Template with a pseudopotential for every element
+            (see pseudo.resolve_template).
+        symbols (list): Chemical symbols.
+
+    Returns:
+        dict: Element -> z_valence.
+    """
+    from pseudo import template_index
+
+    index = template_index(template)
+    charges = {}
+    for symbol in set(symbols):
+        name = template['pseudopotentials'][symbol]
+        if name not in index or index[name]['z_valence'] is None:
+            raise ValueError("No z_valence for {:s} ({:s}) in the pseudopotential index".format(symbol, name))
+        charges[symbol] = index[name]['z_valence']
+    return charges
+
+
+def valence_electrons(template, symbols):
+    """
+    Return the number of valence electrons of a structure (minus tot_charge).
+    """
+    counts = collections.Counter(symbols)
+    charges = valence_charges(template, counts)
+    return sum(charges[symbol] * count for symbol, count in counts.items()) - template['system'].get('tot_charge', 0.0)
+
+
+def band_count(nelec, calculation_type, system, policy=None):
+    """
+    Return the number of bands of a calculation.
+
+    Parameters:
+        nelec (float): Valence electrons.
+        calculation_type (str): Key of NBND_POLICY, or a list of keys (the
+            largest count is taken, e.g. for an NSCF run shared by DOS and PDOS).
+        system (dict): The &system namelist (occupations, noncolin).
+        policy (dict): Overrides of NBND_POLICY per type.
+
+    Returns:
+        int: nbnd.
+    """
+    occupied = nelec if system.get('noncolin') else nelec / 2.0
+    rules = [dict(NBND_POLICY[kind], **(policy or {}).get(kind, {}))
+             for kind in ([calculation_type] if isinstance(calculation_type, str) else calculation_type)]
+    if system.get('occupations', 'fixed') in METALLIC_OCCUPATIONS:
+        rules.append(METALLIC_POLICY)
+    return max(max(math.ceil(rule['factor'] * occupied - 1e-9), math.ceil(occupied) + rule['extra']) for rule in rules)
+
+
+def with_bands(template, symbols, calculation_type=None, electron_changes=()):
+    """
+    Return the template with nbnd (and, if needed, occupations) set for a
+    structure, as a copy; templates without "nbnd": "auto" are returned as
+    they are. Without valence charges, nbnd falls back as described at the
+    top of this file.
+
+    Parameters:
+        template (dict): Template with a pseudopotential for every element.
+        symbols (list): Chemical symbols of the structure.
+        calculation_type (str): Key of NBND_POLICY (or a list of keys);
+            default: from control/calculation.
+        electron_changes (list): Electron count changes of further structures
+            rendered with the same template (e.g. defects); nbnd covers the
+            largest count.
+
+    Returns:
+        dict: The template.
+    """
+    if template['system'].get('nbnd') != 'auto':
+        return template
+    template = copy.deepcopy(template)
+    system = template['system']
+    if calculation_type is None:
+        calculation_type = CALCULATION_TYPES.get(template['control'].get('calculation', 'scf'), 'scf')
+
+    try:
+        nelec = valence_electrons(template, symbols)
+    except ValueError as error:
+        from pseudo import warn_once
+
+        if 'fallback_nbnd' in template:
+            system['nbnd'] = int(template['fallback_nbnd'])
+            warn_once("{:s}, using nbnd = {:d}".format(str(error), system['nbnd']))
+        else:
+            del system['nbnd']
+            warn_once("{:s}, leaving nbnd to pw.x".format(str(error)))
+        return template
+    counts = [nelec + change for change in [0.0] + list(electron_changes)]
+    spin_paired = system.get('nspin', 1) == 1 and not system.get('noncolin', False)
+    if spin_paired and system.get('occupations', 'fixed') == 'fixed' and any(round(count) % 2 for count in counts):
+        system['occupations'] = 'smearing'
+        for key, value in SMEARING.items():
+            system.setdefault(key, value)
+    system['nbnd'] = band_count(max(counts), calculation_type, system, template.get('nbnd_policy'))
+    return template
+
+
+def main():
+    """
+    Main function to print the valence electrons and bands of a structure.
+    """
+    from ase.io import read
+    from pseudo import resolve_template
+
+    parser = argparse.ArgumentParser(description="Print the valence electron count of a structure and the nbnd of each calculation type.")
+    parser.add_argument("-p", "--poscar", help="Path to the POSCAR file", metavar="POSCAR_filename", required=True)
+    parser.add_argument("-t", "--template", help="Path to the template file", metavar="Template_filename", required=True)
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    with open(args.template, 'r') as f:
+        template = json.load(f)
+    symbols = read(args.poscar).get_chemical_symbols()
+    resolve_template(template, symbols)
+    template['system']['nbnd'] = 'auto'
+
+    print("-----------------------------------------------------------")
+    print("{:<36s}: {:g}".format("Valence electrons", valence_electrons(template, symbols)))
+    for calculation_type in NBND_POLICY:
+        system = with_bands(template, symbols, calculation_type)['system']
+        print("{:<36s}: {:d} ({:s} occupations)".format("nbnd " + calculation_type, system['nbnd'], system.get('occupations', 'fixed')))
+    print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
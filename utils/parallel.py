@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sun Oct 18 12:36:19 AM IST 2026
+###########################################################################
+# Purpose : Plan the MPI parallelization of pw.x runs before launch: size
+#           the run (irreducible k-points, plane waves, FFT grid, bands)
+#           from the structure and the template or the generated input, and
+#           choose the ranks, k-point pools (-nk) and diagonalization group
+#           (-nd) for a core budget.
+###########################################################################
+#
+# Sizing follows pw.x: the plane waves of a k-point are those with kinetic
+# energy below ecutwfc, about V ecutwfc^(3/2) / (6 pi^2) in Rydberg atomic
+# units, and the FFT grid holds the sphere of ecutrho (default 4 ecutwfc),
+# rounded up to products of 2, 3 and 5. Automatic k-point grids are reduced
+# with the point group of the crystal (symmetry.symmetry_operations) and time
+# reversal; explicit lists (e.g. crystal_b band paths) are not reduced.
+#
+# Plan:
+#   ranks: the cores, but no more than k-points x FFT planes (beyond that
+#       ranks have no planes to hold);
+#   pools: the divisor of the ranks with the shortest estimated time, the
+#       k-points of a pool run one after the other on ranks/pools ranks with
+#       a speedup of (ranks/pools)^PW_SCALING (pools scale almost ideally,
+#       plane-wave parallelization does not); at most one rank per FFT plane;
+#   diagonalization group: the largest square of ranks of a pool, one
+#       row/column per BANDS_PER_DIAG_ROW bands; 1 (serial) for small runs.
+###########################################################################
+
+import argparse
+import copy
+import json
+import math
+import re
+import shlex
+
+import numpy as np
+
+from workflow import DEFAULT_LAUNCHER
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+# Binaries whose options are planned (the post-processing programs run
+# with the cores they are given)
+PLANNED_BINARIES = ('pw.x',)
+
+# Bands per row of the distributed (ScaLAPACK) subspace diagonalization;
+# below two rows the serial diagonalization is faster
+BANDS_PER_DIAG_ROW = 48
+
+# Speedup of the plane-wave parallelization within a pool on p ranks: p^PW_SCALING
+PW_SCALING = 0.8
+
+# Bands assumed per atom when the input does not set nbnd
+BANDS_PER_ATOM = 3
+
+# Structures above this size are not searched for symmetry operations (only
+# time reversal is used to reduce their k-points)
+SYMMETRY_MAX_ATOMS = 200
+
+KPOINTS_RE = re.compile(r"^\s*K_POINTS\s*[{(]?\s*(\w*)\s*[})]?\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+def good_fft_order(n):
+    """
+    Return the smallest integer >= n whose only prime factors are 2, 3 and 5.
+    """
+    while True:
+        m = n
+        for factor in (2, 3, 5):
+            while m % factor == 0:
+                m //= factor
+        if m == 1:
+            return n
+        n += 1
+
+
+def irreducible_kpoints(atoms, grid, shift=(0, 0, 0), time_reversal=True):
+    """
+    Count the k-points of a Monkhorst-Pack grid left after symmetry reduction.
+
+    Parameters:
+        atoms (ASE Atoms): The structure.
+        grid (list): Grid size along the three reciprocal vectors.
+        shift (list): 0 or 1 per direction (half-step offset, as in pw.x).
+        time_reversal (bool): Also identify k and -k.
+
+    Returns:
+        int: Number of irreducible k-points.
+    """
+    from symmetry import symmetry_operations
+
+    grid = np.asarray(grid, dtype=int)
+    if np.prod(grid) == 1:
+        return 1
+    if len(atoms) <= SYMMETRY_MAX_ATOMS:
+        rotations = symmetry_operations(atoms)[0]
+    else:
+        rotations = np.eye(3, dtype=int)[None]
+    # k transforms with the transposed rotations (the group is closed under inversion)
+    rotations = np.unique(np.transpose(rotations, (0, 2, 1)), axis=0)
+    if time_reversal:
+        rotations = np.unique(np.concatenate([rotations, -rotations]), axis=0)
+
+    # Points in units of half a grid step: m = 2 n + shift
+    indices = np.indices(grid).reshape(3, -1).T
+    points = 2 * indices + np.asarray(shift, dtype=int)
+    representatives = np.arange(len(points))
+    for rotation in rotations:
+        # k' = R k on the grid, k = m / (2 N)
+        mapped = (points / (2 * grid)) @ rotation.T * (2 * grid) - np.asarray(shift)
+        steps = mapped / 2
+        if not np.allclose(steps, np.round(steps), atol=1e-6):
+            # This operation does not map the grid onto itself
+            continue
+        mapped_indices = np.round(steps).astype(int) % grid
+        representatives = np.minimum(representatives, np.ravel_multi_index(mapped_indices.T, grid))
+    # Orbits are closed, so the smallest index reached is the orbit's
+    return len(np.unique(representatives))
+
+
+def fft_grid(cell, ecutrho):
+    """
+    Estimate the dense FFT grid of pw.x for a cell (Angstrom) and ecutrho (Ry).
+    """
+    from ase.units import Bohr
+
+    lengths = np.linalg.norm(np.asarray(cell), axis=1) / Bohr
+    return [good_fft_order(int(2 * math.sqrt(ecutrho) * length / (2 * math.pi)) + 1) for length in lengths]
+
+
+def run_size(atoms, system, kpoints):
+    """
+    Estimate the size of a pw.x run.
+
+    Parameters:
+        atoms (ASE Atoms): The structure.
+        system (dict): The &system namelist (ecutwfc, ecutrho, nbnd, nspin).
+        kpoints (tuple): ('automatic', grid, shift), ('gamma',) or ('list', count).
+
+    Returns:
+        dict: 'nks' (k-points, both spins counted), 'npw' (plane waves per
+        k-point), 'ngm' (G-vectors of the density), 'fft' (grid), 'nbnd'.
+    """
+    from ase.units import Bohr
+
+    ecutwfc = float(system['ecutwfc'])
+    ecutrho = float(system.get('ecutrho') or 4.0 * ecutwfc)
+    volume = abs(atoms.get_volume()) / Bohr ** 3
+
+    if kpoints[0] == 'automatic':
+        nks = irreducible_kpoints(atoms, kpoints[1], kpoints[2])
+    elif kpoints[0] == 'gamma':
+        nks = 1
+    else:
+        nks = kpoints[1]
+    if int(system.get('nspin', 1)) == 2:
+        nks *= 2
+
+    return {
+        'nks': int(nks),
+        'npw': int(volume * ecutwfc ** 1.5 / (6 * math.pi ** 2)),
+        'ngm': int(volume * ecutrho ** 1.5 / (6 * math.pi ** 2)),
+        'fft': [int(system[key]) for key in ('nr1', 'nr2', 'nr3')] if all(system.get(key) for key in ('nr1', 'nr2', 'nr3')) else fft_grid(atoms.cell, ecutrho),
+        'nbnd': int(system.get('nbnd') or max(8, BANDS_PER_ATOM * len(atoms))),
+    }
+
+
+def size_from_template(atoms, template):
+    """
+    Size the run of a structure with a pwtk JSON template (the kspacing grid).
+    """
+    from ase.io.espresso import kspacing_to_grid
+    from occupations import with_bands
+    from pseudo import resolve_template
+
+    symbols = atoms.get_chemical_symbols()
+    # "auto" cutoffs and bands as the generators would set them
+    template = with_bands(resolve_template(copy.deepcopy(template), symbols), symbols)
+    kspacing = template.get('kspacing')
+    kpoints = ('automatic', kspacing_to_grid(atoms, kspacing), (0, 0, 0)) if kspacing else ('gamma',)
+    return run_size(atoms, template['system'], kpoints)
+
+
+def read_kpoints(pwi_text):
+    """
+    Read the K_POINTS card of a pw.x input.
+
+    Returns:
+        tuple: ('automatic', grid, shift), ('gamma',) or ('list', count).
+    """
+    match = KPOINTS_RE.search(pwi_text)
+    if match is None:
+        return ('gamma',)
+    kind = (match.group(1) or 'tpiba').lower()
+    lines = pwi_text[match.end():].strip().splitlines()
+    if kind == 'gamma':
+        return ('gamma',)
+    if kind == 'automatic':
+        values = [int(value) for value in lines[0].split()[:6]]
+        return ('automatic', values[:3], values[3:6])
+    count = int(lines[0].split()[0])
+    if kind.endswith('_b'):
+        # Path: each vertex weight is the number of points to the next vertex
+        weights = [int(float(line.split()[3])) for line in lines[1:count + 1]]
+        return ('list', sum(weights[:-1]) + 1)
+    return ('list', count)
+
+
+def size_from_input(pwi_path):
+    """
+    Size the run of a generated pw.x input file.
+    """
+    import f90nml
+    from ase.io import read
+
+    with open(pwi_path, 'r') as f:
+        pwi_text = f.read()
+    system = dict(f90nml.read(pwi_path)['system'])
+    atoms = read(pwi_path, format='espresso-in')
+    return run_size(atoms, system, read_kpoints(pwi_text))
+
+
+def plan(size, cores):
+    """
+    Choose the ranks, pools and diagonalization group of a pw.x run.
+
+    Parameters:
+        size (dict): Result of run_size.
+        cores (int): Core budget.
+
+    Returns:
+        dict: 'ranks', 'pools', 'diag' and 'ranks_per_pool'.
+    """
+    planes = size['fft'][2]
+    ranks = max(1, min(cores, size['nks'] * planes))
+    divisors = [nk for nk in range(1, ranks + 1) if ranks % nk == 0 and nk <= size['nks']]
+    candidates = [nk for nk in divisors if ranks // nk <= planes] or divisors
+    # Shortest time, then as many pools as possible
+    pools = min(candidates, key=lambda nk: (round(math.ceil(size['nks'] / nk) / (ranks // nk) ** PW_SCALING, 9), -nk))
+    ranks_per_pool = ranks // pools
+    rows = min(math.isqrt(ranks_per_pool), size['nbnd'] // BANDS_PER_DIAG_ROW)
+    return {'ranks': ranks, 'pools': pools, 'diag': rows * rows if rows >= 2 else 1, 'ranks_per_pool': ranks_per_pool}
+
+
+def launch_options(binary, input_path, cores):
+    """
+    Plan a run and return its ranks and the options added to the binary.
+
+    Returns:
+        tuple: (ranks, list of options such as ['-nk', '4', '-nd', '1']); the
+        cores and no options for binaries that are not planned.
+    """
+    if binary not in PLANNED_BINARIES:
+        return cores, []
+    choice = plan(size_from_input(input_path), cores)
+    return choice['ranks'], ['-nk', str(choice['pools']), '-nd', str(choice['diag'])]
+
+
+def launch_command(binary, input_path, cores, launcher=DEFAULT_LAUNCHER, command=None):
+    """
+    Return the planned launch command of a run (without redirections).
+
+    Parameters:
+        binary (str): Quantum Espresso binary, e.g. 'pw.x'.
+        input_path (str): Its input file.
+        cores (int): Core budget.
+        launcher (str): Launch command with {cores} and {binary} fields.
+        command (str): Command of the binary (default: the binary name).
+    """
+    ranks, options = launch_options(binary, input_path, cores)
+    return ' '.join([launcher.format(cores=ranks, binary=command or binary)] + [shlex.quote(option) for option in options])
+
+
+def main():
+    """
+    Main function to plan the parallelization of pw.x runs.
+    """
+    parser = argparse.ArgumentParser(description="Plan the ranks, k-point pools and diagonalization group of pw.x runs for a core budget.")
+    parser.add_argument("-i", "--inputs", nargs="+", help="Generated pw.x input files", metavar="Input_filename")
+    parser.add_argument("-p", "--poscar", help="Path to a POSCAR file (with --template, instead of inputs)", metavar="POSCAR_filename")
+    parser.add_argument("-t", "--template", help="Path to the template file", metavar="Template_filename")
+    parser.add_argument("-n", "--cores", type=int, default=4, help="Core budget (default: 4)")
+    parser.add_argument("-b", "--binary", default='pw.x', help="Binary launched (default: pw.x)")
+    parser.add_argument("-l", "--launcher", default=DEFAULT_LAUNCHER, help="Launch command with {cores} and {binary} fields (default: '%(default)s')")
+    parser.add_argument("-c", "--command", action="store_true", help="Only print the launch command of each input, e.g. for shell scripts")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    if args.command:
+        if not args.inputs:
+            parser.error("--command requires --inputs")
+        for input_path in args.inputs:
+            print(launch_command(args.binary, input_path, args.cores, args.launcher))
+        return
+
+    if args.inputs:
+        sizes = [(input_path, size_from_input(input_path)) for input_path in args.inputs]
+    elif args.poscar and args.template:
+        from ase.io import read
+
+        with open(args.template, 'r') as f:
+            sizes = [(args.poscar, size_from_template(read(args.poscar), json.load(f)))]
+    else:
+        parser.error("give --inputs, or --poscar and --template")
+
+    print("-----------------------------------------------------------")
+    for name, size in sizes:
+        choice = plan(size, args.cores)
+        print("{:<36s}: {:s}".format("Run", name))
+        print("{:<36s}: {:d}".format("Irreducible k-points", size['nks']))
+        print("{:<36s}: {:d}".format("Plane waves per k-point", size['npw']))
+        print("{:<36s}: {:d} x {:d} x {:d}".format("FFT grid", *size['fft']))
+        print("{:<36s}: {:d}".format("Bands", size['nbnd']))
+        print("{:<36s}: {:d} ranks, -nk {:d}, -nd {:d}".format("Plan", choice['ranks'], choice['pools'], choice['diag']))
+        print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
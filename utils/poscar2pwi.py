@@ -8,13 +8,50 @@
 ############################################################################
 
 import argparse
+import copy
 import json
-from ase.io import read, write
+from ase.io import read
+from occupations import with_bands
+from pseudo import resolve_template
+from pwi_renderer import from_template
+from telemetry import timed
 
 VERSION = '1.0.0'
 AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
 
-def convert_poscar_to_pwi(template_path, poscar_path, output_path):
+def write_pwi(template, atoms, output_path, input_overrides=None):
+    """
+    Write a Quantum Espresso input file for an in-memory structure.
+
+    Parameters:
+        template (dict): Loaded template; it is not modified.
+        atoms (ASE Atoms): The atomic structure.
+        output_path (str): Path to save the Quantum Espresso input file.
+        input_overrides (dict): Optional namelist values merged over the
+            template, e.g. {'control': {'prefix': 'Si'}}.
+
+    Returns:
+        None
+    """
+    template = copy.deepcopy(template)
+    resolve_template(template, atoms.get_chemical_symbols())
+
+    # Update template with information from the structure
+    num_atoms = len(atoms)
+    num_species = len(set(atoms.get_chemical_symbols()))
+    template['system']['nat'] = num_atoms
+    template['system']['ntyp'] = num_species
+
+    # Apply per-call namelist overrides
+    for section, values in (input_overrides or {}).items():
+        template.setdefault(section, {}).update(values)
+
+    # Write Quantum ESPRESSO input file
+    from_template(with_bands(template, atoms.get_chemical_symbols())).write(output_path, atoms)
+
+
+@timed
+def convert_poscar_to_pwi(template_path, poscar_path, output_path, input_overrides=None):
     """
     Convert a POSCAR file to Quantum Espresso input file.
 
@@ -22,6 +59,8 @@ def convert_poscar_to_pwi(template_path, poscar_path, output_path):
         template_path (str): Path to the template file.
         poscar_path (str): Path to the POSCAR file.
         output_path (str): Path to save the Quantum Espresso input file.
+        input_overrides (dict): Optional namelist values merged over the
+            template, e.g. {'control': {'prefix': 'Si'}}.
 
     Returns:
         None
@@ -33,14 +72,7 @@ def convert_poscar_to_pwi(template_path, poscar_path, output_path):
     # Load POSCAR file
     atoms = read(poscar_path)
 
-    # Update template with information from the POSCAR file
-    num_atoms = len(atoms)
-    num_species = len(set(atoms.get_chemical_symbols()))
-    template['system']['nat'] = num_atoms
-    template['system']['ntyp'] = num_species
-
-    # Write Quantum ESPRESSO input file
-    write(output_path, atoms, format='espresso-in', input_data=template, pseudopotentials=template['pseudopotentials'], kspacing=template['kspacing'],crystal_coordinates=template['crystal_coordinates'], pw=False)
+    write_pwi(template, atoms, output_path, input_overrides)
 
     # Displaying information about the generated Quantum Espresso SCF input file.
 
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 07:02:44 PM IST 2026
+###########################################################################
+# Purpose : Read the data files of bands.x (filband), dos.x (fildos) and
+#           projwfc.x (filpdos) into NumPy arrays, and store them in
+#           compressed .npz files.
+###########################################################################
+
+import argparse
+import glob
+import os
+import re
+
+import numpy as np
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+PLOT_RE = re.compile(r"nbnd\s*=\s*(\d+)\s*,\s*nks\s*=\s*(\d+)")
+EFERMI_RE = re.compile(r"EFermi\s*=\s*(-?\d+\.\d+)")
+PDOS_FILE_RE = re.compile(r"\.pdos_atm#(\d+)\((\w+)\)_wfc#(\d+)\(([a-z])(?:_j(\d+(?:\.\d+)?))?\)$")
+
+
+def _read_columns(path):
+    """
+    Return the header lines (starting with '#') and the numbers of a
+    whitespace separated data file as a 2D array.
+    """
+    with open(path, 'r') as f:
+        text = f.read()
+    header = []
+    position = 0
+    while text.startswith('#', position):
+        end = text.find('\n', position)
+        header.append(text[position:end])
+        position = end + 1
+    first_line = text[position:text.find('\n', position)]
+    values = np.array(text[position:].split(), dtype=float)
+    return header, values.reshape(-1, len(first_line.split()))
+
+
+def read_bands(filband):
+    """
+    Read the band energies written by bands.x.
+
+    Parameters:
+        filband (str): Path to the filband file (not the .gnu/.rap files).
+
+    Returns:
+        dict: 'kpoints' (nks x 3, 2pi/alat) and 'eigenvalues' (nks x nbnd, eV).
+    """
+    with open(filband, 'r') as f:
+        header = f.readline()
+        values = np.array(f.read().split(), dtype=float)
+    match = PLOT_RE.search(header)
+    if not match:
+        raise ValueError("{:s} is not a bands.x filband file".format(filband))
+    nbnd, nks = int(match.group(1)), int(match.group(2))
+    values = values.reshape(nks, 3 + nbnd)
+    return {'kpoints': values[:, :3].copy(), 'eigenvalues': values[:, 3:].copy()}
+
+
+def read_dos(fildos):
+    """
+    Read the density of states written by dos.x.
+
+    Parameters:
+        fildos (str): Path to the fildos file.
+
+    Returns:
+        dict: 'energy' (nE, eV), 'dos' (nE x channels; one channel, or up and
+        down when spin polarised), 'integrated' (nE) and 'efermi' (eV or NaN).
+    """
+    header, data = _read_columns(fildos)
+    match = EFERMI_RE.search(' '.join(header))
+    return {
+        'energy': data[:, 0].copy(),
+        'dos': data[:, 1:-1].copy(),
+        'integrated': data[:, -1].copy(),
+        'efermi': float(match.group(1)) if match else np.nan,
+    }
+
+
+def read_pdos(filpdos):
+    """
+    Read all projections written by projwfc.x for one filpdos prefix.
+
+    The per atom/orbital files are stacked into one array; m-resolved
+    columns are padded with zeros up to the largest orbital present.
+
+    Parameters:
+        filpdos (str): The filpdos prefix given to projwfc.x.
+
+    Returns:
+        dict:
+            'energy' (nE, eV),
+            'total' (nE x columns of the .pdos_tot file),
+            'ldos' (nproj x nE x nspin) summed over m for every projection,
+            'pdos' (nproj x nE x mmax x nspin) m-resolved projections,
+            'atom', 'species', 'wfc', 'orbital', 'j' (nproj) describing them.
+    """
+    files = []
+    for path in glob.glob(glob.escape(filpdos) + '.pdos_atm#*'):
+        match = PDOS_FILE_RE.search(path)
+        if match:
+            atom, species, wfc, orbital, j = match.groups()
+            files.append((int(atom), int(wfc), species, orbital, float(j) if j else np.nan, path))
+    if not files:
+        raise ValueError("No projwfc.x files found for {:s}".format(filpdos))
+    files.sort()
+
+    header, total = _read_columns(filpdos + '.pdos_tot')
+    nspin = 2 if 'dosup' in ' '.join(header) else 1
+    blocks = [_read_columns(path)[1] for *_, path in files]
+    mmax = max((block.shape[1] - 1) // nspin - 1 for block in blocks)
+
+    nenergy = len(total)
+    ldos = np.zeros((len(blocks), nenergy, nspin))
+    pdos = np.zeros((len(blocks), nenergy, mmax, nspin))
+    for index, block in enumerate(blocks):
+        ldos[index] = block[:, 1:1 + nspin]
+        m_columns = block[:, 1 + nspin:]
+        pdos[index, :, :m_columns.shape[1] // nspin] = m_columns.reshape(nenergy, -1, nspin)
+
+    return {
+        'energy': total[:, 0].copy(),
+        'total': total[:, 1:].copy(),
+        'ldos': ldos,
+        'pdos': pdos,
+        'atom': np.array([entry[0] for entry in files]),
+        'wfc': np.array([entry[1] for entry in files]),
+        'species': np.array([entry[2] for entry in files]),
+        'orbital': np.array([entry[3] for entry in files]),
+        'j': np.array([entry[4] for entry in files]),
+    }
+
+
+def sum_pdos(pdos, by='species'):
+    """
+    Sum the projected DOS over groups of projections.
+
+    Parameters:
+        pdos (dict): Output of read_pdos (or load_results of it).
+        by (str): 'atom', 'species', 'orbital' or 'species_orbital'.
+
+    Returns:
+        dict: Group label -> summed ldos (nE x nspin).
+    """
+    if by == 'species_orbital':
+        labels = np.char.add(np.char.add(pdos['species'].astype(str), '_'), pdos['orbital'].astype(str))
+    elif by in ('atom', 'species', 'orbital'):
+        labels = pdos[by].astype(str)
+    else:
+        raise ValueError("Invalid grouping. Choose 'atom', 'species', 'orbital' or 'species_orbital'.")
+    groups, inverse = np.unique(labels, return_inverse=True)
+    sums = np.zeros((len(groups),) + pdos['ldos'].shape[1:])
+    np.add.at(sums, inverse, pdos['ldos'])
+    return dict(zip(groups.tolist(), sums))
+
+
+def save_results(npz_path, results):
+    """
+    Store a result dictionary of this module in a compressed .npz file.
+    """
+    np.savez_compressed(npz_path, **results)
+
+
+def load_results(npz_path):
+    """
+    Load a result dictionary stored with save_results.
+    """
+    with np.load(npz_path) as data:
+        return {key: data[key] if data[key].ndim else data[key].item() for key in data.files}
+
+
+def main():
+    """
+    Main function to parse command line arguments and convert the data files.
+    """
+    parser = argparse.ArgumentParser(description="Read bands.x, dos.x or projwfc.x data files into NumPy arrays.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("-b", "--bands-data", help="Path to the bands.x filband file", metavar="BANDS_Data_filename")
+    group.add_argument("-d", "--dos-data", help="Path to the dos.x fildos file", metavar="DOS_Data_filename")
+    group.add_argument("-p", "--pdos-data", help="filpdos prefix of the projwfc.x files", metavar="PDOS_Data_prefix")
+    parser.add_argument("-o", "--output", help="Compressed .npz file receiving the arrays", metavar="Output_filename")
+    parser.add_argument("-s", "--sum", choices=['atom', 'species', 'orbital', 'species_orbital'], help="Print the PDOS summed by this grouping")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    if args.bands_data:
+        results = read_bands(args.bands_data)
+        source = args.bands_data
+    elif args.dos_data:
+        results = read_dos(args.dos_data)
+        source = args.dos_data
+    else:
+        results = read_pdos(args.pdos_data)
+        source = args.pdos_data
+
+    print("-----------------------------------------------------------")
+    print("Data read from                      : {:s}".format(source))
+    for key, value in results.items():
+        if isinstance(value, np.ndarray):
+            print("{:<36s}: {:s}".format(key, ' x '.join(str(size) for size in value.shape)))
+    if args.sum and args.pdos_data:
+        step = results['energy'][1] - results['energy'][0]
+        for label, ldos in sum_pdos(results, args.sum).items():
+            print("{:<36s}: integral {:s}".format('  ' + label, ' '.join('{:.4f}'.format(value) for value in ldos.sum(axis=0) * step)))
+    if args.output:
+        save_results(args.output, results)
+        print("Arrays saved in                     : {:s} ({:d} bytes)".format(args.output, os.path.getsize(args.output)))
+    print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
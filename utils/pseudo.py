@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sun Oct 18 01:27:45 AM IST 2026
+###########################################################################
+# Purpose : Index of a pseudopotential directory (element, functional, type,
+#           z_valence and suggested cutoffs read from the UPF headers), used
+#           to fill in the pseudopotentials and cutoffs of templates per
+#           structure.
+###########################################################################
+#
+# The index of a directory is kept as JSON in the pwtk cache directory
+# (pseudo/<hash of the directory path>.json). Only files added or changed
+# since the last scan (size or modification time) are read again, and only
+# up to the end of their header.
+#
+# Templates opt in per value:
+#   "pseudopotentials": species missing from the map are taken from the
+#       index, with the functional of the mapped ones (or of the template
+#       "functional" key); among several files, the lowest suggested cutoff;
+#   "ecutwfc": "auto" (or null): the largest suggested wavefunction cutoff
+#       of the species of the structure;
+#   "ecutrho": "auto" (or absent when ecutwfc is "auto"): the largest
+#       suggested density cutoff, and at least 4 ecutwfc.
+# The pseudo directory is the template's control/pseudo_dir, else
+# $ESPRESSO_PSEUDO, else ~/espresso/pseudo (as pw.x looks it up). When that
+# directory does not exist (e.g. inputs generated away from the machine
+# running pw.x) and every species has a pseudopotential in the template,
+# "auto" cutoffs take the template's "fallback_ecutwfc" (default
+# DEFAULT_ECUTWFC) and 4 times that, with a warning.
+###########################################################################
+
+import argparse
+import hashlib
+import json
+import os
+import re
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+UPF_PATTERN = re.compile(r".*\.upf$", re.IGNORECASE)
+
+# Wavefunction cutoff (Ry) of a pseudopotential without a suggested value
+DEFAULT_ECUTWFC = 50.0
+
+# Density to wavefunction cutoff ratio of a pseudopotential without a
+# suggested density cutoff, per pseudopotential type
+DUAL = {'NC': 4.0, 'SL': 4.0, '1/r': 4.0, 'US': 8.0, 'USPP': 8.0, 'PAW': 8.0}
+
+# Usual names of the functionals written as four components in UPF headers
+FUNCTIONALS = {
+    'SLA PW PBX PBC': 'PBE',
+    'SLA PW PBE PBE': 'PBE',
+    'SLA PW PSX PSC': 'PBESOL',
+    'SLA PZ NOGX NOGC': 'PZ',
+    'SLA PW NOGX NOGC': 'PW',
+    'SLA PW B88 P86': 'BP',
+    'SLA PW GGX GGC': 'PW91',
+}
+
+# Values written to the index for each pseudopotential file
+FIELDS = ('element', 'functional', 'pseudo_type', 'z_valence', 'ecutwfc', 'ecutrho')
+
+AUTO = ('auto', None)
+
+_indexes = {}
+_warnings = set()
+
+
+def _number(text):
+    try:
+        return float(text.replace('D', 'E').replace('d', 'e'))
+    except (AttributeError, ValueError):
+        return None
+
+
+def warn_once(message):
+    """
+    Print a warning the first time it comes up in this process (batches
+    resolve one template per structure).
+    """
+    if message not in _warnings:
+        _warnings.add(message)
+        print("Warning: " + message)
+
+
+def normalize_functional(functional):
+    """
+    Return a functional name in a comparable form (e.g. 'SLA PW PBX PBC' -> 'PBE').
+    """
+    if not functional:
+        return None
+    functional = ' '.join(functional.upper().split())
+    for components, name in FUNCTIONALS.items():
+        if functional.startswith(components):
+            return name
+    return functional
+
+
+def read_upf_header(upf_path):
+    """
+    Read the metadata of a UPF file (format 1 or 2) from its header.
+
+    Returns:
+        dict: 'element', 'functional', 'pseudo_type', 'z_valence' and the
+        suggested 'ecutwfc' and 'ecutrho' in Ry (None when not given).
+    """
+    lines, in_header = [], False
+    with open(upf_path, 'r', errors='replace') as f:
+        for line in f:
+            lines.append(line)
+            in_header = in_header or '<PP_HEADER' in line.upper()
+            if in_header and ('</PP_HEADER>' in line.upper() or '/>' in line):
+                break
+    text = ''.join(lines)
+    header = {field: None for field in FIELDS}
+
+    match = re.search(r"<PP_HEADER\b(.*?)/?>", text, re.IGNORECASE | re.DOTALL)
+    attributes = dict(re.findall(r'(\w+)\s*=\s*"([^"]*)"', match.group(1))) if match else {}
+    attributes = {key.lower(): value.strip() for key, value in attributes.items()}
+    if 'element' in attributes:
+        # Format 2: attributes of the PP_HEADER tag
+        header['element'] = attributes['element']
+        header['functional'] = attributes.get('functional')
+        header['pseudo_type'] = attributes.get('pseudo_type')
+        header['z_valence'] = _number(attributes.get('z_valence'))
+        header['ecutwfc'] = _number(attributes.get('wfc_cutoff')) or None
+        header['ecutrho'] = _number(attributes.get('rho_cutoff')) or None
+    else:
+        # Format 1: one value per line, followed by its label
+        block = re.search(r"<PP_HEADER>(.*?)</PP_HEADER>", text, re.IGNORECASE | re.DOTALL)
+        for line in (block.group(1) if block else '').splitlines():
+            fields = line.split()
+            if not fields:
+                continue
+            label = line.lower()
+            if 'element' in label:
+                header['element'] = fields[0]
+            elif 'z valence' in label:
+                header['z_valence'] = _number(fields[0])
+            elif 'exchange-correlation' in label:
+                header['functional'] = ' '.join(fields[:label.split().index('exchange-correlation')])
+            elif 'suggested cutoff' in label:
+                header['ecutwfc'] = _number(fields[0]) or None
+                header['ecutrho'] = _number(fields[1]) or None
+            elif fields[0] in ('US', 'NC', 'PAW', 'SL') and len(fields) > 1:
+                header['pseudo_type'] = fields[0]
+
+    # Suggestions of the generation (e.g. pslibrary) take precedence
+    wfc = re.search(r"Suggested minimum cutoff for wavefunctions:\s*([\d.EeDd+-]+)", text)
+    rho = re.search(r"Suggested minimum cutoff for charge density:\s*([\d.EeDd+-]+)", text)
+    if wfc:
+        header['ecutwfc'] = _number(wfc.group(1)) or header['ecutwfc']
+    if rho:
+        header['ecutrho'] = _number(rho.group(1)) or header['ecutrho']
+
+    if header['element'] is None:
+        raise ValueError("No element in the header of {:s}".format(upf_path))
+    header['element'] = header['element'].capitalize()
+    header['functional'] = normalize_functional(header['functional'])
+    return header
+
+
+def default_pseudo_dir():
+    return os.environ.get('ESPRESSO_PSEUDO', os.path.join(os.path.expanduser('~'), 'espresso', 'pseudo'))
+
+
+def index_path(pseudo_dir):
+    from cache import DEFAULT_CACHE_DIR
+
+    digest = hashlib.sha256(os.path.abspath(pseudo_dir).encode()).hexdigest()[:16]
+    return os.path.join(DEFAULT_CACHE_DIR, 'pseudo', digest + '.json')
+
+
+def build_index(pseudo_dir, index_file=None):
+    """
+    Return the index of a pseudopotential directory, reading only the files
+    added or changed since it was last saved.
+
+    Parameters:
+        pseudo_dir (str): Directory of UPF files.
+        index_file (str): Where the index is kept (default: see index_path).
+
+    Returns:
+        dict: File name -> metadata (see read_upf_header, plus 'size' and 'mtime').
+    """
+    pseudo_dir = os.path.abspath(os.path.expanduser(pseudo_dir))
+    if not os.path.isdir(pseudo_dir):
+        raise ValueError("Pseudopotential directory {:s} not found".format(pseudo_dir))
+    index_file = index_file or index_path(pseudo_dir)
+
+    # In this process, the saved index is only read again when a file was
+    # added, removed or rewritten (an edit in place keeps the directory mtime)
+    stats = {entry.name: (entry.stat().st_size, entry.stat().st_mtime_ns) for entry in os.scandir(pseudo_dir)
+             if UPF_PATTERN.match(entry.name) and entry.is_file()}
+    if pseudo_dir in _indexes and _indexes[pseudo_dir][0] == stats:
+        return _indexes[pseudo_dir][1]
+
+    saved = {}
+    if os.path.exists(index_file):
+        with open(index_file, 'r') as f:
+            saved = json.load(f).get('files', {})
+
+    index, changed = {}, False
+    for name in sorted(stats):
+        path = os.path.join(pseudo_dir, name)
+        size, mtime = stats[name]
+        entry = saved.get(name)
+        if entry is None or entry['size'] != size or entry['mtime'] != mtime:
+            try:
+                entry = dict(read_upf_header(path), size=size, mtime=mtime)
+            except (OSError, ValueError) as error:
+                print("Skipping {:s}: {:s}".format(path, str(error)))
+                continue
+            changed = True
+        index[name] = entry
+    changed = changed or set(index) != set(saved)
+
+    if changed:
+        os.makedirs(os.path.dirname(index_file), exist_ok=True)
+        temporary_path = '{:s}.{:d}.tmp'.format(index_file, os.getpid())
+        with open(temporary_path, 'w') as f:
+            json.dump({'version': VERSION, 'pseudo_dir': pseudo_dir, 'files': index}, f, indent=2)
+        os.replace(temporary_path, index_file)
+    _indexes[pseudo_dir] = (stats, index)
+    return index
+
+
+def select_pseudopotentials(index, symbols, preferred=None, functional=None):
+    """
+    Choose one pseudopotential file per element, all with the same functional.
+
+    Parameters:
+        index (dict): Result of build_index.
+        symbols (list): Elements of the structure.
+        preferred (dict): Element -> file name chosen beforehand (kept; e.g.
+            the template map, possibly with other elements).
+        functional (str): Required functional (default: that of the
+            preferred files, else the one covering every element at the
+            lowest cutoffs).
+
+    Returns:
+        dict: Element -> file name.
+    """
+    preferred = preferred or {}
+    symbols = sorted(set(symbols))
+    chosen = {symbol: preferred[symbol] for symbol in symbols if symbol in preferred}
+    missing = [symbol for symbol in symbols if symbol not in chosen]
+    if not missing:
+        return chosen
+
+    functional = normalize_functional(functional)
+    if functional is None:
+        # Also the files mapped for elements not in this structure tell the intent
+        known = [index[name]['functional'] for name in preferred.values() if name in index]
+        functional = known[0] if known else None
+
+    def candidates(symbol, required):
+        files = [name for name, entry in index.items() if entry['element'] == symbol and required in (None, entry['functional'])]
+        return sorted(files, key=lambda name: (index[name]['ecutwfc'] or DEFAULT_ECUTWFC, name))
+
+    if functional is None:
+        # The functional available for every missing element, cheapest first
+        common = set.intersection(*[{index[name]['functional'] for name in candidates(symbol, None)} for symbol in missing])
+        for name in candidates(missing[0], None):
+            if index[name]['functional'] in common:
+                functional = index[name]['functional']
+                break
+
+    for symbol in missing:
+        files = candidates(symbol, functional)
+        if not files:
+            raise ValueError("No {:s} pseudopotential{:s} in the index".format(symbol, '' if functional is None else ' for ' + functional))
+        chosen[symbol] = files[0]
+    return chosen
+
+
+def suggested_cutoffs(index, file_names):
+    """
+    Return the (ecutwfc, ecutrho) in Ry suited to a set of pseudopotentials.
+    """
+    ecutwfc, ecutrho = 0.0, 0.0
+    for name in file_names:
+        entry = index.get(name, {})
+        wfc = entry.get('ecutwfc') or DEFAULT_ECUTWFC
+        rho = entry.get('ecutrho') or DUAL.get(entry.get('pseudo_type'), 4.0) * wfc
+        ecutwfc, ecutrho = max(ecutwfc, wfc), max(ecutrho, rho)
+    return ecutwfc, max(ecutrho, 4.0 * ecutwfc)
+
+
+def template_index(template):
+    """
+    Return the index of the pseudo directory of a template.
+    """
+    return build_index(template.get('control', {}).get('pseudo_dir') or default_pseudo_dir())
+
+
+def needs_index(template, symbols):
+    system = template.get('system', {})
+    return (any(symbol not in template.get('pseudopotentials', {}) for symbol in set(symbols))
+            or system.get('ecutwfc') in AUTO or system.get('ecutrho', 0) in AUTO)
+
+
+def resolve_template(template, symbols):
+    """
+    Fill in the pseudopotentials and "auto" cutoffs of a template for the
+    elements of a structure (see the top of this file). Templates giving
+    everything explicitly are returned as they are, without an index.
+
+    Parameters:
+        template (dict): Loaded template; modified in place.
+        symbols (list): Chemical symbols of the structure.
+
+    Returns:
+        dict: The template.
+    """
+    if not needs_index(template, symbols):
+        return template
+    system = template['system']
+    try:
+        index = template_index(template)
+    except ValueError as error:
+        missing = sorted(set(symbol for symbol in symbols if symbol not in template.get('pseudopotentials', {})))
+        if missing:
+            raise ValueError("{:s}: no pseudopotential for {:s}".format(str(error), ', '.join(missing)))
+        auto_wfc = system.get('ecutwfc') in AUTO
+        if auto_wfc:
+            system['ecutwfc'] = float(template.get('fallback_ecutwfc', DEFAULT_ECUTWFC))
+            warn_once("{:s}, using ecutwfc = {:g} Ry".format(str(error), system['ecutwfc']))
+        if system.get('ecutrho', 0) in AUTO or (auto_wfc and 'ecutrho' not in system):
+            system['ecutrho'] = 4.0 * system['ecutwfc']
+        return template
+
+    template['pseudopotentials'] = dict(template.get('pseudopotentials') or {})
+    chosen = select_pseudopotentials(index, symbols, template['pseudopotentials'], template.get('functional'))
+    template['pseudopotentials'].update(chosen)
+
+    ecutwfc, ecutrho = suggested_cutoffs(index, [chosen[symbol] for symbol in set(symbols)])
+    auto_wfc = system.get('ecutwfc') in AUTO
+    if auto_wfc:
+        system['ecutwfc'] = ecutwfc
+    if system.get('ecutrho', 0) in AUTO or (auto_wfc and 'ecutrho' not in system):
+        system['ecutrho'] = max(ecutrho, 4.0 * system['ecutwfc'])
+    return template
+
+
+def main():
+    """
+    Main function to index a pseudopotential directory.
+    """
+    parser = argparse.ArgumentParser(description="Index the UPF files of a pseudopotential directory and print or save their metadata.")
+    parser.add_argument("-d", "--pseudo-dir", default=None, help="Pseudopotential directory (default: $ESPRESSO_PSEUDO or ~/espresso/pseudo)")
+    parser.add_argument("-o", "--output", default=None, help="Also write the index to this JSON file", metavar="Output_filename")
+    parser.add_argument("-e", "--elements", nargs="+", default=None, help="Show the choice for the elements of a structure, e.g. Li O")
+    parser.add_argument("-f", "--functional", default=None, help="Functional required with --elements, e.g. PBE")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    pseudo_dir = args.pseudo_dir or default_pseudo_dir()
+    try:
+        index = build_index(pseudo_dir)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(index, f, indent=2)
+
+    def cutoff(value):
+        return 'n/a' if value is None else '{:.1f}'.format(value)
+
+    print("-----------------------------------------------------------")
+    for name, entry in index.items():
+        print("{:<40s} {:<3s} {:<8s} {:<4s} Z={:<5s} wfc={:>6s} rho={:>7s}".format(
+            name, entry['element'], str(entry['functional']), str(entry['pseudo_type']), cutoff(entry['z_valence']), cutoff(entry['ecutwfc']), cutoff(entry['ecutrho'])))
+    print("-----------------------------------------------------------")
+    if args.elements:
+        try:
+            chosen = select_pseudopotentials(index, args.elements, functional=args.functional)
+        except ValueError as error:
+            parser.error(str(error))
+        for symbol, name in sorted(chosen.items()):
+            print("{:<36s}: {:s}".format(symbol, name))
+        print("{:<36s}: {:.1f} / {:.1f} Ry".format("ecutwfc / ecutrho", *suggested_cutoffs(index, chosen.values())))
+        print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
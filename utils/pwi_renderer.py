@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 06:20:15 PM IST 2026
+###########################################################################
+# Purpose : Fast writer of pw.x input files for many structures sharing one
+#           template. The template is compiled once; only the per-structure
+#           blocks are formatted for each file. The output is byte for byte
+#           the one of ase.io.write(format='espresso-in').
+###########################################################################
+#
+# Compiling runs ASE's own namelist construction once, with placeholders for
+# nat, ntyp and any declared per-structure variables, and splits the text
+# around them. Rendering then fills in the placeholders, ATOMIC_SPECIES,
+# K_POINTS, CELL_PARAMETERS and ATOMIC_POSITIONS with the same formats as
+# ASE. Structures ASE would treat specially (constraints, initial magnetic
+# moments, spin-polarised templates) are handed to ASE unchanged.
+###########################################################################
+
+import argparse
+import copy
+import io
+import json
+import time
+
+import numpy as np
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+
+class _Placeholder:
+    """
+    Namelist value whose repr marks where a per-structure value goes.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return '\x00{:s}\x00'.format(self.name)
+
+
+class PwiRenderer:
+    """
+    pw.x input writer compiled from one template.
+
+    Parameters:
+        input_data (dict): Template passed as input_data to ASE.
+        pseudopotentials (dict): Pseudopotential file per element.
+        kspacing (float): k-point spacing in 1/Angstrom (None: Gamma only,
+            unless a K_POINTS card is given to render).
+        crystal_coordinates (bool): Write positions in crystal coordinates.
+        variables (list): (section, key) namelist entries whose value changes
+            from one structure to the next; they are given to render by key.
+        **kwargs: Further keyword arguments of ASE's writer (e.g. pw=False).
+    """
+
+    def __init__(self, input_data, pseudopotentials, kspacing=None, crystal_coordinates=False, variables=(), **kwargs):
+        from ase.io.espresso import Namelist
+
+        self.input_data = copy.deepcopy(input_data)
+        self.pseudopotentials = pseudopotentials
+        self.kspacing = kspacing
+        self.crystal_coordinates = crystal_coordinates
+        self.kwargs = kwargs
+        self.variables = list(variables)
+
+        data = copy.deepcopy(input_data)
+        for section, key in variables:
+            data.setdefault(section, {})[key] = _Placeholder(key)
+        namelist = Namelist(data)
+        namelist.to_nested('pw', **copy.deepcopy(kwargs))
+
+        system = namelist['system']
+        # Anything that makes ASE add species labels or magnetisations
+        self.native = (system.get('nspin', 1) == 1 and not system.get('noncolin', False)
+                       and system.get('ibrav', 0) == 0)
+        system['ntyp'] = _Placeholder('ntyp')
+        system['nat'] = _Placeholder('nat')
+        if 'ibrav' not in system:
+            system['ibrav'] = 0
+
+        # Alternating literal text and placeholder names
+        self.parts = ''.join(namelist.to_string(list_form=True)).split('\x00')
+
+    def _fallback(self, atoms, values, kpoints):
+        from ase.io import write
+
+        data = copy.deepcopy(self.input_data)
+        for section, key in self.variables:
+            data.setdefault(section, {})[key] = values[key]
+        buffer = io.StringIO()
+        write(buffer, atoms, format='espresso-in', input_data=data, pseudopotentials=self.pseudopotentials,
+              kspacing=None if kpoints else self.kspacing, crystal_coordinates=self.crystal_coordinates, **self.kwargs)
+        text = buffer.getvalue()
+        if kpoints:
+            text = text.replace("K_POINTS gamma\n\n", kpoints, 1)
+        return text
+
+    def render(self, atoms, kpoints=None, **values):
+        """
+        Render the input file of one structure.
+
+        Parameters:
+            atoms (ASE Atoms): The atomic structure.
+            kpoints (str): Complete K_POINTS card, followed by a blank line,
+                used in place of the kspacing grid (e.g. a crystal_b path).
+            **values: Values of the variables declared at compile time.
+
+        Returns:
+            str: Content of the input file.
+        """
+        if not self.native or atoms.constraints or np.any(atoms.get_initial_magnetic_moments()):
+            return self._fallback(atoms, values, kpoints)
+
+        symbols = atoms.get_chemical_symbols()
+        masses = atoms.get_masses()
+        species = {}
+        for symbol, mass in zip(symbols, masses):
+            if symbol not in species:
+                species[symbol] = "{:s} {} {:s}\n".format(symbol, mass, self.pseudopotentials[symbol])
+
+        values = {key: repr(value) for key, value in values.items()}
+        values['ntyp'] = repr(len(species))
+        values['nat'] = repr(len(atoms))
+        pwi = [part if index % 2 == 0 else values[part] for index, part in enumerate(self.parts)]
+
+        pwi.append('ATOMIC_SPECIES\n')
+        pwi.extend(species.values())
+        pwi.append('\n')
+
+        if kpoints:
+            pwi.append(kpoints)
+        elif self.kspacing is not None:
+            grid = (np.linalg.norm(atoms.cell.reciprocal(), axis=1) / self.kspacing).astype(int) + 1
+            grid[~atoms.pbc] = 1
+            pwi.append('K_POINTS automatic\n{:d} {:d} {:d}  0 0 0\n\n'.format(*grid))
+        else:
+            pwi.append('K_POINTS gamma\n\n')
+
+        cell = atoms.cell
+        pwi.append('CELL_PARAMETERS angstrom\n')
+        pwi.append(('{:.14f} {:.14f} {:.14f}\n' * 3).format(*cell[0], *cell[1], *cell[2]))
+        pwi.append('\n')
+
+        if self.crystal_coordinates:
+            pwi.append('ATOMIC_POSITIONS crystal\n')
+            coordinates = cell.scaled_positions(atoms.positions)
+        else:
+            pwi.append('ATOMIC_POSITIONS angstrom\n')
+            coordinates = atoms.positions
+        pwi.extend('{:s} {:.10f} {:.10f} {:.10f}  \n'.format(symbol, *position) for symbol, position in zip(symbols, coordinates))
+        pwi.append('\n')
+        return ''.join(pwi)
+
+    def write(self, pwi_path, atoms, kpoints=None, **values):
+        """
+        Write the input file of one structure (see render).
+        """
+        with open(pwi_path, 'w') as f:
+            f.write(self.render(atoms, kpoints, **values))
+
+
+def from_template(template, kspacing=True, variables=()):
+    """
+    Compile a pwtk JSON template the way the generators pass it to ASE.
+
+    Parameters:
+        template (dict): Loaded template.
+        kspacing (bool): Use the template kspacing (False: Gamma only or an
+            explicit K_POINTS card).
+        variables (list): See PwiRenderer.
+
+    Returns:
+        PwiRenderer: The compiled template.
+    """
+    return PwiRenderer(template, template['pseudopotentials'], kspacing=template['kspacing'] if kspacing else None,
+                       crystal_coordinates=template['crystal_coordinates'], variables=variables, pw=False)
+
+
+def benchmark(template_path, poscar_path, count=10000, seed=0):
+    """
+    Time the renderer against ase.io.write on perturbed copies of a structure
+    and check that both give the same bytes.
+
+    Parameters:
+        template_path (str): Path to the template file.
+        poscar_path (str): Path to the POSCAR file.
+        count (int): Number of structures.
+        seed (int): Seed of the random perturbations.
+
+    Returns:
+        dict: 'ase' and 'native' times in seconds, 'mismatches' count.
+    """
+    from ase.io import read, write
+    from occupations import with_bands
+    from pseudo import resolve_template
+
+    with open(template_path, 'r') as f:
+        template = json.load(f)
+    atoms = read(poscar_path)
+    symbols = atoms.get_chemical_symbols()
+    template = with_bands(resolve_template(template, symbols), symbols)
+    template['system']['nat'] = len(atoms)
+    template['system']['ntyp'] = len(set(symbols))
+
+    rng = np.random.default_rng(seed)
+    structures = []
+    for _ in range(count):
+        structure = atoms.copy()
+        structure.set_cell(atoms.cell @ (np.eye(3) + rng.normal(scale=0.02, size=(3, 3))), scale_atoms=True)
+        structure.rattle(0.05, seed=int(rng.integers(1 << 31)))
+        structures.append(structure)
+
+    start = time.perf_counter()
+    reference = []
+    for structure in structures:
+        buffer = io.StringIO()
+        write(buffer, structure, format='espresso-in', input_data=template, pseudopotentials=template['pseudopotentials'],
+              kspacing=template['kspacing'], crystal_coordinates=template['crystal_coordinates'], pw=False)
+        reference.append(buffer.getvalue())
+    ase_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    renderer = from_template(template)
+    rendered = [renderer.render(structure) for structure in structures]
+    native_time = time.perf_counter() - start
+
+    mismatches = sum(text != expected for text, expected in zip(rendered, reference))
+    return {'ase': ase_time, 'native': native_time, 'mismatches': mismatches}
+
+
+def main():
+    """
+    Main function to parse command line arguments and run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the compiled pw.x input writer against ase.io.write.")
+    parser.add_argument("-t", "--template", help="Path to the template file", metavar="Template_filename", required=True)
+    parser.add_argument("-p", "--poscar", help="Path to the POSCAR file", metavar="POSCAR", required=True)
+    parser.add_argument("-n", "--count", type=int, default=10000, help="Number of perturbed structures (default: 10000)")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    result = benchmark(args.template, args.poscar, args.count)
+    print("-----------------------------------------------------------")
+    print("Structures rendered                 : {:d}".format(args.count))
+    print("ase.io.write                        : {:.3f} s".format(result['ase']))
+    print("Compiled template                   : {:.3f} s".format(result['native']))
+    print("Speed-up                            : {:.1f}x".format(result['ase'] / result['native']))
+    print("Files differing from ase.io.write   : {:d}".format(result['mismatches']))
+    print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
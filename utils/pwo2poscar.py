@@ -8,15 +8,22 @@
 ############################################################################
 
 import argparse
-from ase.io import read, write
+from ase.io import write
+
+from pwo_reader import read_last_structure
+from telemetry import timed
 
 VERSION = '1.0.0'
 AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
 
+@timed
 def convert_pwo_to_poscar(qe_output_file, poscar_output_file):
     """
     Convert Quantum Espresso output file to POSCAR file.
 
+    Only the final structure is parsed (searching from the end of the file),
+    so large vc-relax and MD outputs are not read into memory.
+
     Parameters:
         qe_output_file (str): Path to the Quantum Espresso output file.
         poscar_output_file (str): Path to save the POSCAR file.
@@ -24,7 +31,7 @@ def convert_pwo_to_poscar(qe_output_file, poscar_output_file):
     Returns:
         None
     """
-    atoms = read(qe_output_file, format='espresso-out')
+    atoms = read_last_structure(qe_output_file)
     write(poscar_output_file, atoms, format='vasp', direct=True)
     # Displaying information about the generated POSCAR file.
 
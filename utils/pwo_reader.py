@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 02:58:21 PM IST 2026
+###########################################################################
+# Purpose : Streaming reader for (large) Quantum Espresso pw.x output files.
+#           Finds the final structure by searching from the end of the file
+#           and yields ionic steps one at a time, resuming from a saved byte
+#           offset.
+###########################################################################
+
+import argparse
+import json
+import mmap
+import os
+import re
+
+import numpy as np
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+BOHR = 0.52917721092        # Angstrom per bohr (same value as ase.units.Bohr)
+
+CELL_KEY = b'CELL_PARAMETERS'
+POSITIONS_KEY = b'ATOMIC_POSITIONS'
+
+ALAT_RE = re.compile(rb"lattice parameter \(alat\)\s*=\s*(\d+\.\d+)")
+NAT_RE = re.compile(rb"number of atoms/cell\s*=\s*(\d+)")
+AXES_RE = re.compile(rb"a\(\d\) = \(\s*(\S+)\s+(\S+)\s+(\S+)\s*\)")
+SITE_RE = re.compile(rb"\d+\s+(\S+)\s+tau\(\s*\d+\) = \(\s*(\S+)\s+(\S+)\s+(\S+)\s*\)")
+UNITS_RE = re.compile(rb"[({]?\s*([a-z]+)\s*(?:=\s*(\S+?))?\s*[)}]?\s*$", re.IGNORECASE)
+SYMBOL_RE = re.compile(r"^[A-Z][a-z]?")
+
+
+def _units(line, keyword):
+    """
+    Return (units, alat in bohr or None) of a CELL_PARAMETERS/ATOMIC_POSITIONS line.
+    """
+    match = UNITS_RE.match(line[len(keyword):].strip())
+    if not match:
+        return 'alat', None
+    alat = match.group(2)
+    return match.group(1).decode().lower(), float(alat.rstrip(b')')) if alat else None
+
+
+def _symbol(label):
+    match = SYMBOL_RE.match(label)
+    return match.group(0) if match else label
+
+
+def parse_header(mm):
+    """
+    Parse the initial structure printed by pw.x at start-up.
+
+    Parameters:
+        mm (mmap): Memory map of the output file.
+
+    Returns:
+        dict: 'alat' (bohr), 'nat', 'cell' (3x3 list, Angstrom), 'symbols'
+        and 'positions' (cartesian, Angstrom). Missing items are None.
+    """
+    header = {'alat': None, 'nat': None, 'cell': None, 'symbols': None, 'positions': None}
+    match = ALAT_RE.search(mm)
+    if match:
+        header['alat'] = float(match.group(1))
+    match = NAT_RE.search(mm)
+    if match:
+        header['nat'] = int(match.group(1))
+    if header['alat'] is None or header['nat'] is None:
+        return header
+
+    start = mm.find(b'crystal axes:')
+    if start != -1:
+        axes = AXES_RE.findall(mm, start, start + 400)[:3]
+        if len(axes) == 3:
+            header['cell'] = (np.array(axes, dtype=float) * header['alat'] * BOHR).tolist()
+
+    start = mm.find(b'positions (alat units)')
+    if start != -1:
+        symbols, positions = [], []
+        for match in SITE_RE.finditer(mm, start):
+            symbols.append(_symbol(match.group(1).decode()))
+            positions.append([float(value) for value in match.groups()[1:]])
+            if len(symbols) == header['nat']:
+                break
+        if len(symbols) == header['nat']:
+            header['symbols'] = symbols
+            header['positions'] = (np.array(positions) * header['alat'] * BOHR).tolist()
+    return header
+
+
+def _read_lines(mm, start, count):
+    """
+    Return the line at start plus the count following lines, and the offset
+    after them; None if the file ends before the block is complete.
+    """
+    lines = []
+    position = start
+    for _ in range(count + 1):
+        end = mm.find(b'\n', position)
+        if end == -1:
+            return None, start
+        lines.append(mm[position:end])
+        position = end + 1
+    return lines, position
+
+
+def _parse_cell(lines, header):
+    units, alat = _units(lines[0], CELL_KEY)
+    cell = np.array([line.split()[:3] for line in lines[1:]], dtype=float)
+    if units == 'alat':
+        cell *= (alat or header['alat']) * BOHR
+    elif units == 'bohr':
+        cell *= BOHR
+    return cell
+
+
+def _parse_positions(lines, cell, header):
+    units, _ = _units(lines[0], POSITIONS_KEY)
+    fields = [line.split() for line in lines[1:]]
+    symbols = [_symbol(field[0].decode()) for field in fields]
+    positions = np.array([field[1:4] for field in fields], dtype=float)
+    if units == 'crystal':
+        positions = positions @ cell
+    elif units == 'alat':
+        positions *= header['alat'] * BOHR
+    elif units == 'bohr':
+        positions *= BOHR
+    return symbols, positions
+
+
+def _to_atoms(symbols, cell, positions):
+    from ase import Atoms
+    return Atoms(symbols=symbols, cell=cell, positions=positions, pbc=True)
+
+
+class PwoReader:
+    """
+    Incremental reader of a pw.x output file.
+
+    Each call of steps() continues where the previous one stopped, so a
+    running job can be tailed without re-parsing the file. A block that is
+    still being written is left for the next call. state() returns a JSON
+    serialisable dictionary from which a new reader can resume later.
+
+    Parameters:
+        pwo_path (str): Path to the pw.x output file.
+        offset (int): Byte offset to resume from.
+        header (dict): Header saved by an earlier reader (see parse_header).
+        cell (list): Last cell seen by an earlier reader (Angstrom).
+    """
+
+    def __init__(self, pwo_path, offset=0, header=None, cell=None):
+        self.pwo_path = pwo_path
+        self.offset = offset
+        self.header = header
+        self.cell = None if cell is None else np.array(cell)
+
+    def state(self):
+        return {'pwo_path': self.pwo_path, 'offset': self.offset, 'header': self.header,
+                'cell': None if self.cell is None else self.cell.tolist()}
+
+    def steps(self):
+        """
+        Yield the ionic steps written since the last call as ASE Atoms.
+
+        The first call on a fresh reader yields the initial structure from the
+        header first. vc-relax runs repeat the final structure in their
+        'Begin final coordinates' block.
+        """
+        if os.path.getsize(self.pwo_path) == 0:
+            return
+        with open(self.pwo_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if self.header is None or self.header['nat'] is None:
+                self.header = parse_header(mm)
+                if self.header['nat'] is None:
+                    return
+                self.cell = None if self.header['cell'] is None else np.array(self.header['cell'])
+                if self.offset == 0 and self.header['positions'] is not None:
+                    yield _to_atoms(self.header['symbols'], self.cell, self.header['positions'])
+
+            nat = self.header['nat']
+            while True:
+                cell_at = mm.find(CELL_KEY, self.offset)
+                positions_at = mm.find(POSITIONS_KEY, self.offset)
+                if positions_at == -1:
+                    break
+                if cell_at != -1 and cell_at < positions_at:
+                    lines, end = _read_lines(mm, cell_at, 3)
+                    if lines is None:
+                        break
+                    self.cell = _parse_cell(lines, self.header)
+                    self.offset = end
+                    continue
+                lines, end = _read_lines(mm, positions_at, nat)
+                if lines is None:
+                    break
+                symbols, positions = _parse_positions(lines, self.cell, self.header)
+                self.offset = end
+                yield _to_atoms(symbols, self.cell, positions)
+
+
+def iter_ionic_steps(pwo_path, offset=0):
+    """
+    Yield the structures of a pw.x output file one ionic step at a time.
+
+    Parameters:
+        pwo_path (str): Path to the pw.x output file.
+        offset (int): Byte offset to start from.
+
+    Yields:
+        ASE Atoms: One structure per ionic step.
+    """
+    yield from PwoReader(pwo_path, offset=offset).steps()
+
+
+def read_last_structure(pwo_path):
+    """
+    Read the final structure of a pw.x output file by searching from its end.
+
+    Only the header and the last CELL_PARAMETERS/ATOMIC_POSITIONS blocks are
+    parsed, so the cost does not grow with the number of ionic steps.
+
+    Parameters:
+        pwo_path (str): Path to the pw.x output file.
+
+    Returns:
+        ASE Atoms: The last complete structure in the file.
+    """
+    with open(pwo_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header = parse_header(mm)
+        if header['nat'] is None:
+            raise ValueError("{:s} is not a pw.x output file (no 'number of atoms/cell')".format(pwo_path))
+        nat = header['nat']
+
+        end = len(mm)
+        while True:
+            positions_at = mm.rfind(POSITIONS_KEY, 0, end)
+            if positions_at == -1:
+                break
+            lines, _ = _read_lines(mm, positions_at, nat)
+            if lines is None:
+                # Block still being written: look at the previous one
+                end = positions_at
+                continue
+            # The cell in effect is the last one printed before these positions
+            cell_at = mm.rfind(CELL_KEY, 0, positions_at)
+            cell = np.array(header['cell']) if header['cell'] is not None else None
+            if cell_at != -1:
+                cell_lines, _ = _read_lines(mm, cell_at, 3)
+                cell = _parse_cell(cell_lines, header)
+            symbols, positions = _parse_positions(lines, cell, header)
+            return _to_atoms(symbols, cell, positions)
+
+        if header['positions'] is None:
+            raise ValueError("No structure found in {:s}".format(pwo_path))
+        return _to_atoms(header['symbols'], header['cell'], header['positions'])
+
+
+def main():
+    """
+    Main function to parse command line arguments and print the ionic steps.
+    """
+    parser = argparse.ArgumentParser(description="Stream the ionic steps of a Quantum ESPRESSO pw.x output file.")
+    parser.add_argument("-o", "--pwo", help="Path to the Quantum ESPRESSO output file", metavar="QE_Output_filename", required=True)
+    parser.add_argument("-s", "--state", help="JSON file holding the reader state; updated after reading", metavar="State_filename")
+    parser.add_argument("-l", "--last", action="store_true", help="Only print the final structure")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    if args.last:
+        atoms = read_last_structure(args.pwo)
+        print("Final structure: {:s}, volume {:.4f} Ang^3".format(atoms.get_chemical_formula(), atoms.get_volume()))
+        return
+
+    reader = PwoReader(args.pwo)
+    if args.state and os.path.exists(args.state):
+        with open(args.state, 'r') as f:
+            state = json.load(f)
+        reader = PwoReader(args.pwo, offset=state['offset'], header=state['header'], cell=state['cell'])
+
+    for atoms in reader.steps():
+        print("Step at byte {:d}: {:s}, volume {:.4f} Ang^3".format(reader.offset, atoms.get_chemical_formula(), atoms.get_volume()))
+
+    if args.state:
+        with open(args.state, 'w') as f:
+            json.dump(reader.state(), f)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 10:12:40 AM IST 2026
+###########################################################################
+# Purpose : Single driver exposing the pwtk utilities as subcommands and
+#           in-process functions, with a JSON manifest (batch) mode.
+###########################################################################
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+# Make the sibling utilities importable when the driver is run from elsewhere.
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+if UTILS_DIR not in sys.path:
+    sys.path.insert(0, UTILS_DIR)
+
+# command name -> (module, function, ordered keyword names, command line options)
+# Each option is (short flag, long flag, help). The keyword names are the
+# argparse destinations of the long flags and are also the manifest keys.
+COMMANDS = {
+    'poscar2pwi': ('poscar2pwi', 'convert_poscar_to_pwi', ['template', 'poscar', 'pwi'], [
+        ("-t", "--template", "Path to the template file"),
+        ("-p", "--poscar", "Path to the POSCAR file"),
+        ("-i", "--pwi", "Path to the Quantum ESPRESSO input file"),
+    ]),
+    'pwo2poscar': ('pwo2poscar', 'convert_pwo_to_poscar', ['pwo', 'poscar'], [
+        ("-o", "--pwo", "Path to the Quantum ESPRESSO output file"),
+        ("-p", "--poscar", "Path to the POSCAR file"),
+    ]),
+    'gen_bands': ('gen_bands', 'generate_input', ['template', 'poscar', 'scf', 'nscf', 'bands', 'bands_data', 'system_name'], [
+        ("-t", "--template", "Path to the template file"),
+        ("-p", "--poscar", "Path to the POSCAR file"),
+        ("-s", "--scf", "Path to the Quantum ESPRESSO scf input file"),
+        ("-n", "--nscf", "Path to the Quantum ESPRESSO nscf input file"),
+        ("-b", "--bands", "Path to the Quantum ESPRESSO bands input file"),
+        ("-f", "--bands-data", "Path to the Quantum ESPRESSO bands data file"),
+        ("-sn", "--system-name", "Name of the system (prefix and outdir)"),
+    ]),
+    'gen_dos': ('gen_dos', 'generate_input', ['template', 'poscar', 'scf', 'nscf', 'dos', 'dos_data', 'system_name'], [
+        ("-t", "--template", "Path to the template file"),
+        ("-p", "--poscar", "Path to the POSCAR file"),
+        ("-s", "--scf", "Path to the Quantum ESPRESSO SCF input file"),
+        ("-n", "--nscf", "Path to the Quantum ESPRESSO NSCF input file"),
+        ("-d", "--dos", "Path to the Quantum ESPRESSO DOS input file"),
+        ("-f", "--dos-data", "Path to the Quantum ESPRESSO DOS data file"),
+        ("-sn", "--system-name", "Name of the system (prefix and outdir)"),
+    ]),
+    'gen_pdos': ('gen_pdos', 'generate_input', ['template', 'poscar', 'scf', 'nscf', 'pdos', 'pdos_data', 'system_name'], [
+        ("-t", "--template", "Path to the template file"),
+        ("-p", "--poscar", "Path to the POSCAR file"),
+        ("-s", "--scf", "Path to the Quantum ESPRESSO SCF input file"),
+        ("-n", "--nscf", "Path to the Quantum ESPRESSO NSCF input file"),
+        ("-d", "--pdos", "Path to the Quantum ESPRESSO PDOS input file"),
+        ("-f", "--pdos-data", "Path to the Quantum ESPRESSO PDOS data file"),
+        ("-sn", "--system-name", "Name of the system (prefix and outdir)"),
+    ]),
+    'gen_post': ('gen_post', 'generate_input', ['template', 'poscar', 'output_dir', 'system_name'], [
+        ("-t", "--template", "Path to the template file"),
+        ("-p", "--poscar", "Path to the POSCAR file"),
+        ("-o", "--output-dir", "Directory for the generated files"),
+        ("-sn", "--system-name", "Name of the system (prefix and outdir)"),
+    ]),
+    'gen_strain': ('gen_strain', 'strain_poscar', ['input_poscar', 'strain_direction', 'strain_percentage', 'output_poscar'], [
+        ("-i", "--input-poscar", "Path to the input POSCAR file"),
+        ("-d", "--strain-direction", "Direction of the strain (x, y, or z)"),
+        ("-s", "--strain-percentage", "Strain percentage to apply"),
+        ("-o", "--output-poscar", "Path to write the strained POSCAR file"),
+    ]),
+    'compare_poscar': ('compare_poscar', 'compare_poscars', ['poscar1', 'poscar2'], [
+        ("-a", "--poscar1", "Path to the first POSCAR file"),
+        ("-b", "--poscar2", "Path to the second POSCAR file"),
+    ]),
+    'convert_crystal': ('convert_crystal', 'convert_cell_using_pymatgen', ['input_file', 'cell_type', 'output_file'], [
+        ("-i", "--input_file", "Input POSCAR file name"),
+        ("-t", "--cell_type", "Cell type to convert to ('p' for primitive, 'c' for conventional)"),
+        ("-o", "--output_file", "Output file name"),
+    ]),
+}
+
+# Modules already imported by this process, so ASE/f90nml/pymatgen load once.
+_loaded = {}
+
+
+def get_function(command):
+    """
+    Return the in-process function implementing a subcommand.
+
+    The owning utility module (and therefore ASE, f90nml or pymatgen) is only
+    imported the first time one of its commands is requested.
+
+    Parameters:
+        command (str): Name of the subcommand (a key of COMMANDS).
+
+    Returns:
+        callable: The utility function.
+    """
+    if command not in COMMANDS:
+        raise ValueError("Unknown command '{:s}'. Choose from: {:s}".format(command, ', '.join(sorted(COMMANDS))))
+    module_name, function_name = COMMANDS[command][:2]
+    if module_name not in _loaded:
+        _loaded[module_name] = importlib.import_module(module_name)
+    return getattr(_loaded[module_name], function_name)
+
+
+def run(command, quiet=False, **kwargs):
+    """
+    Run one pwtk utility in the current process.
+
+    Parameters:
+        command (str): Name of the subcommand (a key of COMMANDS).
+        quiet (bool): Suppress the banner printed by the utility.
+        **kwargs: Arguments of the utility, named as in COMMANDS.
+
+    Returns:
+        The return value of the utility function.
+    """
+    function = get_function(command)
+    names = COMMANDS[command][2]
+    missing = [name for name in names if kwargs.get(name) is None]
+    if missing:
+        raise ValueError("Missing arguments for '{:s}': {:s}".format(command, ', '.join(missing)))
+    unknown = sorted(set(kwargs) - set(names))
+    if unknown:
+        raise ValueError("Unknown arguments for '{:s}': {:s}".format(command, ', '.join(unknown)))
+    if command == 'gen_strain':
+        kwargs['strain_percentage'] = float(kwargs['strain_percentage'])
+    args = [kwargs[name] for name in names]
+    if quiet:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function(*args)
+    return function(*args)
+
+
+def cache_module():
+    """
+    Return the cache module, imported on first use.
+    """
+    return importlib.import_module('cache')
+
+
+def load_manifest(manifest_path):
+    """
+    Load a batch manifest.
+
+    The manifest is a JSON file holding either a list of jobs, or an object
+    with a "jobs" list and optional "defaults" merged into every job. Each
+    job is an object with a "command" key plus the arguments of that command;
+    defaults a command does not accept are ignored for that job. For example:
+
+        {
+          "defaults": {"command": "poscar2pwi", "template": "template.scf.dat"},
+          "jobs": [
+            {"poscar": "Si.poscar", "pwi": "Si.scf.in"},
+            {"poscar": "AlSi.poscar", "pwi": "AlSi.scf.in"}
+          ]
+        }
+
+    Parameters:
+        manifest_path (str): Path to the JSON manifest.
+
+    Returns:
+        list: Job dictionaries with defaults applied.
+    """
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    if isinstance(manifest, list):
+        defaults, jobs = {}, manifest
+    else:
+        defaults, jobs = manifest.get('defaults', {}), manifest.get('jobs', [])
+
+    merged = []
+    for job in jobs:
+        command = job.get('command', defaults.get('command'))
+        names = COMMANDS[command][2] if command in COMMANDS else []
+        # Only carry over defaults that the job's command actually accepts
+        job_defaults = {key: value for key, value in defaults.items() if key == 'command' or key in names}
+        merged.append(dict(job_defaults, **job))
+    return merged
+
+
+def run_batch(jobs, quiet=True, stop_on_error=False, cache=None, force=False):
+    """
+    Run a list of jobs in the current process.
+
+    Parameters:
+        jobs (list): Job dictionaries, each with a "command" key.
+        quiet (bool): Suppress the banner printed by each utility.
+        stop_on_error (bool): Re-raise the first failure instead of continuing.
+        cache (cache.Cache): Reuse previously generated inputs of the
+            generator commands (default: no cache).
+        force (bool): Regenerate even on a cache hit.
+
+    Returns:
+        list: One (job, error) tuple per job; error is None on success.
+    """
+    results = []
+    for job in jobs:
+        kwargs = dict(job)
+        command = kwargs.pop('command', None)
+        try:
+            if cache is not None and command in cache_module().OUTPUT_FILES:
+                cache_module().run_cached(command, cache=cache, force=force, quiet=quiet, **kwargs)
+            else:
+                run(command, quiet=quiet, **kwargs)
+            results.append((job, None))
+        except Exception as error:
+            if stop_on_error:
+                raise
+            results.append((job, error))
+    return results
+
+
+def main():
+    """
+    Main function to parse command line arguments and dispatch subcommands.
+    """
+    parser = argparse.ArgumentParser(description="Planewave Toolkit driver: run pwtk utilities in a single process.")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.required = True
+
+    for command, (_, _, _, options) in COMMANDS.items():
+        subparser = subparsers.add_parser(command, help="Run {:s}".format(command))
+        for short, long, help_text in options:
+            subparser.add_argument(short, long, help=help_text, required=True)
+
+    batch_parser = subparsers.add_parser("batch", help="Run all jobs listed in a JSON manifest")
+    batch_parser.add_argument("-m", "--manifest", help="Path to the JSON manifest", metavar="Manifest_filename", required=True)
+    batch_parser.add_argument("-q", "--quiet", action="store_true", help="Suppress per-job banners")
+    batch_parser.add_argument("-x", "--stop-on-error", action="store_true", help="Stop at the first failing job")
+    batch_parser.add_argument("-c", "--cache", nargs="?", const="", default=None, metavar="Cache_dir", help="Reuse previously generated inputs (default directory: $PWTK_CACHE_DIR or ~/.cache/pwtk)")
+    batch_parser.add_argument("-f", "--force", action="store_true", help="Regenerate all inputs even on a cache hit")
+
+    args = parser.parse_args()
+
+    if args.command != "batch":
+        kwargs = vars(args)
+        command = kwargs.pop("command")
+        run(command, **kwargs)
+        return
+
+    jobs = load_manifest(args.manifest)
+    cache = None if args.cache is None else cache_module().Cache(args.cache or None)
+    results = run_batch(jobs, quiet=args.quiet, stop_on_error=args.stop_on_error, cache=cache, force=args.force)
+    failed = [(job, error) for job, error in results if error is not None]
+
+    print("-----------------------------------------------------------")
+    print("Jobs in manifest                    : {:d}".format(len(results)))
+    print("Jobs completed                      : {:d}".format(len(results) - len(failed)))
+    print("Jobs failed                         : {:d}".format(len(failed)))
+    for job, error in failed:
+        print("  {:s}: {:s}".format(json.dumps(job), str(error)))
+    print("-----------------------------------------------------------")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
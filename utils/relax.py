@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 02:05:48 PM IST 2026
+###########################################################################
+# Purpose : This script runs repeated QE vc-relax passes on a POSCAR file
+#           until the cell has converged, instead of a fixed number of
+#           restarts.
+###########################################################################
+
+import argparse
+import mmap
+import os
+import re
+import shutil
+import sys
+
+from workflow import DEFAULT_LAUNCHER, FAKE_BINARIES, FAKE_LAUNCHER, Stage, Workflow
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+# Default convergence thresholds between the start and the end of one pass
+ENERGY_TOL = 1.0E-4     # Ry, change of the total energy
+VOLUME_TOL = 1.0E-3     # relative change of the unit-cell volume
+PRESSURE_TOL = 0.5      # kbar, absolute value of the final pressure
+
+ENERGY_RE = re.compile(rb"^!\s+total energy\s*=\s*(-?\d+\.\d+)\s+Ry", re.MULTILINE)
+VOLUME_RE = re.compile(rb"unit-cell volume\s*=\s*(\d+\.\d+)")
+PRESSURE_RE = re.compile(rb"P=\s*(-?\d+\.\d+)")
+
+
+def parse_relax_output(pwo_path):
+    """
+    Extract the convergence information of one vc-relax pass.
+
+    Parameters:
+        pwo_path (str): Path to the pw.x output file.
+
+    Returns:
+        dict: 'energies' (Ry), 'volumes' (bohr^3) and 'pressures' (kbar) in
+        the order printed, and 'job_done' telling if pw.x finished (False
+        when the output is missing or empty).
+    """
+    if not os.path.exists(pwo_path) or os.path.getsize(pwo_path) == 0:
+        return {'energies': [], 'volumes': [], 'pressures': [], 'job_done': False}
+
+    # Scan a memory map instead of loading the whole output
+    with open(pwo_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return {
+            'energies': [float(value) for value in ENERGY_RE.findall(mm)],
+            'volumes': [float(value) for value in VOLUME_RE.findall(mm)],
+            'pressures': [float(value) for value in PRESSURE_RE.findall(mm)],
+            'job_done': mm.rfind(b'JOB DONE.') != -1,
+        }
+
+
+def check_convergence(result, energy_tol=ENERGY_TOL, volume_tol=VOLUME_TOL, pressure_tol=PRESSURE_TOL):
+    """
+    Decide whether a vc-relax pass left the cell converged.
+
+    A pass is converged when the cell volume moved less than volume_tol
+    (relative), the last two total energies differ by less than energy_tol,
+    and the final pressure is below pressure_tol. The final SCF of a
+    vc-relax is done with a fresh basis, so a small change there means the
+    Pulay stress no longer shifts the cell and no restart is needed.
+
+    Parameters:
+        result (dict): Output of parse_relax_output.
+        energy_tol (float): Energy threshold in Ry.
+        volume_tol (float): Relative volume threshold.
+        pressure_tol (float): Pressure threshold in kbar.
+
+    Returns:
+        tuple: (converged, dict with 'energy_change', 'volume_change' and 'pressure').
+    """
+    energies, volumes, pressures = result['energies'], result['volumes'], result['pressures']
+    metrics = {
+        'energy_change': abs(energies[-1] - energies[-2]) if len(energies) > 1 else None,
+        # A single volume means the cell was never changed
+        'volume_change': abs(volumes[-1] - volumes[0]) / volumes[0] if volumes else None,
+        'pressure': abs(pressures[-1]) if pressures else None,
+    }
+    converged = (result['job_done']
+                 and metrics['energy_change'] is not None and metrics['energy_change'] < energy_tol
+                 and metrics['volume_change'] is not None and metrics['volume_change'] < volume_tol
+                 and metrics['pressure'] is not None and metrics['pressure'] < pressure_tol)
+    return converged, metrics
+
+
+def relax(template_path, poscar_path, output_dir, system_name, max_steps=5, energy_tol=ENERGY_TOL, volume_tol=VOLUME_TOL, pressure_tol=PRESSURE_TOL,
+          reuse=True, cores=4, launcher=DEFAULT_LAUNCHER, binaries=None, cache=None, force=False, executor=None, state=None, plan=False):
+    """
+    Run vc-relax passes until the cell is converged or max_steps is reached.
+
+    All passes share one prefix/outdir. With reuse, every restart starts from
+    the wavefunctions and potential of the previous pass; if the cell change
+    moved the FFT grid (see warm_start.input_fft_grid), or such a restart
+    fails, it is repeated from scratch.
+
+    Parameters:
+        template_path (str): Path to the vc-relax template file.
+        poscar_path (str): Path to the starting POSCAR file.
+        output_dir (str): Directory for the inputs, outputs and outdir.
+        system_name (str): Name of the system (prefix and file names).
+        max_steps (int): Maximum number of vc-relax passes (safety cap).
+        energy_tol (float): Energy threshold in Ry.
+        volume_tol (float): Relative volume threshold.
+        pressure_tol (float): Pressure threshold in kbar.
+        reuse (bool): Start restarts from the previous wavefunctions/potential.
+        cores (int): Number of cores given to pw.x.
+        launcher (str): Launch command with {cores} and {binary} fields.
+        binaries (dict): Binary name -> command.
+        cache (cache.Cache): Skip passes that already completed (see Workflow).
+        force (bool): Rerun passes even if the cache has them as completed.
+        executor (callable): Run the passes through this executor (see executors.py).
+        state (state.StateStore): Checkpoint file; passes it has as completed
+            are not run again (see Workflow).
+        plan (bool): Launch pw.x with planned pools (see Workflow).
+
+    Returns:
+        tuple: (path of the relaxed POSCAR file, converged flag, number of passes).
+    """
+    from poscar2pwi import convert_poscar_to_pwi
+    from pwo2poscar import convert_pwo_to_poscar
+    from warm_start import input_fft_grid
+
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    def path(step, suffix):
+        return os.path.join(output_dir, "{:s}.vcrelax_{:d}{:s}".format(system_name, step, suffix))
+
+    shutil.copyfile(poscar_path, path(1, '_in.poscar'))
+    overrides = {'control': {'prefix': system_name, 'outdir': "./" + system_name}}
+
+    converged = False
+    step = 0
+    for step in range(1, max_steps + 1):
+        attempts = [True, False] if reuse and step > 1 else [False]
+        for from_previous in attempts:
+            step_overrides = {'control': dict(overrides['control'], restart_mode='from_scratch'), 'electrons': {}}
+            if from_previous:
+                step_overrides['electrons'] = {'startingwfc': 'file', 'startingpot': 'file'}
+            convert_poscar_to_pwi(template_path, path(step, '_in.poscar'), path(step, '.in'), input_overrides=step_overrides)
+            if from_previous and input_fft_grid(path(step - 1, '.in')) != input_fft_grid(path(step, '.in')):
+                print("FFT grid changed since the previous pass, running step {:d} from scratch".format(step))
+                continue
+
+            workflow = Workflow(total_cores=cores, launcher=launcher, binaries=binaries, workdir=output_dir, cache=cache, force=force, executor=executor, state=state, plan=plan)
+            workflow.add(Stage('vcrelax_{:d}'.format(step), binary='pw.x', input_path=path(step, '.in'), output_path=path(step, '.out')))
+            status = list(workflow.run().values())[0]
+            result = parse_relax_output(path(step, '.out'))
+            if status == 'done' and result['job_done']:
+                break
+            if from_previous:
+                print("Restart from the previous pass failed, repeating step {:d} from scratch".format(step))
+        else:
+            raise RuntimeError("vc-relax step {:d} failed, see {:s}".format(step, path(step, '.out')))
+
+        convert_pwo_to_poscar(path(step, '.out'), path(step, '_out.poscar'))
+        converged, metrics = check_convergence(result, energy_tol, volume_tol, pressure_tol)
+
+        print("Step # {:d}: dE = {:s} Ry, dV/V = {:s}, |P| = {:s} kbar{:s}".format(
+            step,
+            *['n/a' if metrics[key] is None else '{:.3e}'.format(metrics[key]) for key in ('energy_change', 'volume_change', 'pressure')],
+            ' (converged)' if converged else ''))
+        if converged or step == max_steps:
+            break
+        shutil.copyfile(path(step, '_out.poscar'), path(step + 1, '_in.poscar'))
+
+    return path(step, '_out.poscar'), converged, step
+
+
+def main():
+    """
+    Main function to parse command line arguments and run the relaxation.
+    """
+    parser = argparse.ArgumentParser(description="Run QE vc-relax passes on a POSCAR file until the cell is converged.")
+    parser.add_argument("-p", "--poscar", help="Path to the POSCAR file", metavar="POSCAR", required=True)
+    parser.add_argument("-t", "--template", help="Path to the vc-relax template file", metavar="Template_filename", required=True)
+    parser.add_argument("-o", "--output-dir", help="Directory for all inputs and outputs", metavar="Output_dir", required=True)
+    parser.add_argument("-sn", "--system-name", help="Name of the system (prefix and file names)", metavar="System_name", required=True)
+    parser.add_argument("-m", "--max-steps", type=int, default=5, help="Maximum number of vc-relax passes (default: 5)")
+    parser.add_argument("--energy-tol", type=float, default=ENERGY_TOL, help="Energy change threshold in Ry (default: %(default)s)")
+    parser.add_argument("--volume-tol", type=float, default=VOLUME_TOL, help="Relative volume change threshold (default: %(default)s)")
+    parser.add_argument("--pressure-tol", type=float, default=PRESSURE_TOL, help="Pressure threshold in kbar (default: %(default)s)")
+    parser.add_argument("--no-reuse", action="store_true", help="Start every pass from scratch")
+    parser.add_argument("-n", "--cores", type=int, default=4, help="Number of cores for pw.x (default: 4)")
+    parser.add_argument("-l", "--launcher", default=DEFAULT_LAUNCHER, help="Launch command with {cores} and {binary} fields (default: '%(default)s')")
+    parser.add_argument("--plan", action="store_true", help="Launch pw.x with the ranks, k-point pools and diagonalization group planned for its cores (see parallel.py)")
+    parser.add_argument("--fake", action="store_true", help="Replace Quantum Espresso by fake_qe.py")
+    parser.add_argument("-s", "--state", default=None, metavar="State_filename", help="Checkpoint file used to resume an interrupted relaxation (default: <output dir>/<system name>.state.json)")
+    parser.add_argument("--no-resume", action="store_true", help="Forget the checkpoint file and run every pass again")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    launcher, binaries = args.launcher, None
+    if args.fake:
+        launcher, binaries = FAKE_LAUNCHER, FAKE_BINARIES
+
+    from state import StateStore
+    state = StateStore(args.state or os.path.join(args.output_dir, args.system_name + '.state.json'))
+    if args.no_resume:
+        state.forget()
+
+    relaxed_poscar, converged, steps = relax(args.template, args.poscar, args.output_dir, args.system_name, max_steps=args.max_steps,
+                                             energy_tol=args.energy_tol, volume_tol=args.volume_tol, pressure_tol=args.pressure_tol,
+                                             reuse=not args.no_reuse, cores=args.cores, launcher=launcher, binaries=binaries, state=state, plan=args.plan)
+
+    print("-----------------------------------------------------------")
+    print("vc-relax passes run                 : {:d}".format(steps))
+    print("Cell converged                      : {:s}".format('yes' if converged else 'no (maximum number of passes reached)'))
+    print("Relaxed POSCAR file                 : {:s}".format(relaxed_poscar))
+    print("-----------------------------------------------------------")
+
+    if not converged:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
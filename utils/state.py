@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 09:15:52 PM IST 2026
+###########################################################################
+# Purpose : Per-structure checkpoint file of a workflow, so that a re-run
+#           resumes at the first stage that did not complete.
+###########################################################################
+#
+# For every stage the file records a hash of what it was run with (binary,
+# input file and declared extra inputs), the hashes of its output files,
+# the exit status and the timing. A stage is skipped on a re-run when it
+# completed with the same inputs, its outputs are unchanged and none of the
+# stages it depends on finished after it started (i.e. had to run again).
+###########################################################################
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from cache import file_hash
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+
+def stage_key(stage):
+    """
+    Hash of what a stage runs with: its binary (or action name), the content
+    of its input file and of its extra input files.
+
+    Returns:
+        str: Hexadecimal digest, or None if an input file is missing.
+    """
+    parts = [stage.binary or 'action:' + stage.name]
+    for path in ([stage.input_path] if stage.input_path else []) + list(stage.inputs):
+        if not os.path.exists(path):
+            return None
+        parts.append(file_hash(path))
+    return hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+
+
+def stage_outputs(stage):
+    return ([stage.output_path] if stage.output_path else []) + list(stage.outputs)
+
+
+class StateStore:
+    """
+    JSON checkpoint file of the stages of one structure.
+
+    The file is rewritten atomically after every change, so it stays valid
+    if the job is killed at any point.
+
+    Parameters:
+        state_path (str): Path of the JSON file (created on first record).
+    """
+
+    def __init__(self, state_path):
+        self.state_path = state_path
+        self.stages = {}
+        if os.path.exists(state_path):
+            with open(state_path, 'r') as f:
+                self.stages = json.load(f)['stages']
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = '{:s}.{:d}.tmp'.format(self.state_path, os.getpid())
+        with open(temporary_path, 'w') as f:
+            json.dump({'version': VERSION, 'updated': time.time(), 'stages': self.stages}, f, indent=2)
+        os.replace(temporary_path, self.state_path)
+
+    def completed(self, stage):
+        """
+        Tell whether a stage completed earlier with the same inputs, after
+        the stages it depends on, and left its outputs unchanged.
+        """
+        record = self.stages.get(stage.name)
+        if record is None or record['status'] != 'done':
+            return False
+        for name in stage.depends:
+            depend = self.stages.get(name)
+            if depend is None or depend['end_time'] is None or depend['end_time'] > record['start_time']:
+                return False
+        if record['key'] != stage_key(stage):
+            return False
+        for path, digest in record['outputs'].items():
+            if not os.path.exists(path) or file_hash(path) != digest:
+                return False
+        return True
+
+    def record(self, stage):
+        """
+        Record the outcome of a finished stage.
+        """
+        self.stages[stage.name] = {
+            'status': stage.status,
+            'binary': stage.binary,
+            'key': stage_key(stage),
+            'outputs': {os.path.abspath(path): file_hash(path) for path in stage_outputs(stage) if os.path.exists(path)},
+            'returncode': stage.returncode,
+            'error': stage.error,
+            'cores': stage.cores,
+            'start_time': stage.start_time,
+            'end_time': stage.end_time,
+            'wall_time': stage.wall_time,
+        }
+        self.save()
+
+    def forget(self, names=None):
+        """
+        Drop the records of some stages (default: all), so they run again.
+        """
+        for name in list(self.stages) if names is None else names:
+            self.stages.pop(name, None)
+        self.save()
+
+
+def main():
+    """
+    Main function to show or reset a checkpoint file, or to run one stage
+    under it (skipped if already completed), e.g. from a shell script.
+    """
+    from workflow import DEFAULT_LAUNCHER, Stage, Workflow
+
+    parser = argparse.ArgumentParser(description="Show or reset the checkpoint file of a pwtk workflow, or run one stage under it.")
+    parser.add_argument("-s", "--state", help="Path to the state file", metavar="State_filename", required=True)
+    parser.add_argument("-r", "--reset", nargs="*", metavar="STAGE", help="Forget these stages (all if none given) so they run again")
+    parser.add_argument("--run", metavar="STAGE", help="Run this stage unless the state file has it as completed")
+    parser.add_argument("-b", "--binary", help="Binary of the stage to run, e.g. pw.x")
+    parser.add_argument("-i", "--input", help="Input file of the stage to run", metavar="Input_filename")
+    parser.add_argument("-o", "--output", help="Output file of the stage to run", metavar="Output_filename")
+    parser.add_argument("-d", "--depends", nargs="*", default=[], metavar="STAGE", help="Stages of the state file the stage to run depends on")
+    parser.add_argument("-n", "--cores", type=int, default=4, help="Number of cores of the stage to run (default: 4)")
+    parser.add_argument("-l", "--launcher", default=DEFAULT_LAUNCHER, help="Launch command with {cores} and {binary} fields (default: '%(default)s')")
+    parser.add_argument("--plan", action="store_true", help="Launch pw.x with the ranks, k-point pools and diagonalization group planned for its cores (see parallel.py)")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    store = StateStore(args.state)
+    if args.reset is not None:
+        store.forget(args.reset or None)
+
+    if args.run:
+        if not (args.binary and args.input and args.output):
+            parser.error("--run requires --binary, --input and --output")
+        stage = Stage(args.run, binary=args.binary, input_path=args.input, output_path=args.output, depends=args.depends, min_cores=args.cores)
+        if store.completed(stage):
+            print("Resumed  {:<16s} {:<10s} (completed in an earlier run)".format(stage.name, stage.binary))
+            return
+        # The dependencies are only known to the state file, not to this workflow
+        stage.depends = []
+        workflow = Workflow(total_cores=args.cores, launcher=args.launcher, force=True, state=store, plan=args.plan)
+        workflow.add(stage)
+        if workflow.run()[args.run] != 'done':
+            sys.exit(1)
+        return
+
+    print("-----------------------------------------------------------")
+    for name, record in store.stages.items():
+        wall_time = 'n/a' if record['wall_time'] is None else '{:.1f}s'.format(record['wall_time'])
+        print("{:<16s} {:<10s} {:<8s} {:>10s}".format(name, record['binary'] or 'python', record['status'], wall_time))
+    print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
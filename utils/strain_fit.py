@@ -0,0 +1,460 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sun Oct 18 03:26:41 AM IST 2026
+###########################################################################
+# Purpose : Fit equations of state (Birch-Murnaghan, Vinet) and elastic
+#           tensors to the pw.x outputs of strain sweeps (gen_strain.py),
+#           for many materials at once.
+###########################################################################
+#
+# Every strain sweep leaves a manifest (<system>_<mode>.strain.json) with
+# the strain tensor of each structure; the pw.x output of <name>.in is
+# <name>.out. Manifests of the same system and POSCAR file form one
+# material. Each output is read once, from its end, for the last total
+# energy, stress tensor and cell volume.
+#
+# The fits run on padded (materials x runs) arrays with zero weights for
+# missing runs, so one NumPy call fits all materials:
+#   - Birch-Murnaghan: E is a cubic polynomial in t = (V_ref / V)^(2/3), a
+#     linear least-squares problem; E0, V0, B0 and B0' follow from the
+#     polynomial at its minimum.
+#   - Vinet: Levenberg-Marquardt on all materials together, started from
+#     the Birch-Murnaghan parameters.
+#   - Elastic tensor: sigma = sigma_0 + C epsilon (Voigt notation) by least
+#     squares over all runs; C_ij is only reported when the sweeps strain
+#     component j independently of the others (NaN otherwise).
+# The equations of state use the hydrostatic runs (strain proportional to
+# the identity) only. Fit quality: R^2, RMS and largest residuals, and for
+# the EOS whether V0 lies inside the sampled volumes.
+###########################################################################
+
+import argparse
+import glob
+import json
+import mmap
+import os
+import re
+
+import numpy as np
+
+from gen_strain import tensor_to_voigt
+from pwo_reader import BOHR, NAT_RE
+from telemetry import timed
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+RY = 13.605693122994        # eV per Rydberg (same value as ase.units.Ry)
+EV_A3_TO_GPA = 160.21766208  # GPa per eV/Angstrom^3
+
+ENERGY_KEY = b'!    total energy'
+STRESS_KEY = b'total   stress'
+ENERGY_RE = re.compile(rb"total energy\s*=\s*(-?\d+\.\d+)\s+Ry")
+VOLUME_RE = re.compile(rb"unit-cell volume\s*=\s*(\d+\.\d+)")
+
+EOS_MODELS = ('birch_murnaghan', 'vinet')
+MIN_EOS_POINTS = 5          # four parameters and at least one degree of freedom
+HYDROSTATIC_TOL = 1e-8      # largest deviation of a hydrostatic strain from s * identity
+RCOND = 1e-10               # relative singular value below which a fit direction is undetermined
+LM_ITERATIONS = 100
+LM_TOL = 1e-12              # relative change of the cost at which Levenberg-Marquardt stops
+
+
+def read_run(pwo_path):
+    """
+    Read the last total energy, stress tensor and cell volume of a pw.x output.
+
+    Parameters:
+        pwo_path (str): Path to the pw.x output file.
+
+    Returns:
+        dict: 'energy' (eV), 'stress' (3x3, GPa, positive in tension, as in
+        ASE; None without tstress), 'volume' (Angstrom^3) and 'natoms'; None
+        when the file holds no total energy yet.
+    """
+    if not os.path.exists(pwo_path) or os.path.getsize(pwo_path) == 0:
+        return None
+    with open(pwo_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        energy_at = mm.rfind(ENERGY_KEY)
+        if energy_at == -1:
+            return None
+        energy = float(ENERGY_RE.search(mm, energy_at).group(1)) * RY
+
+        volume_at = mm.rfind(b'unit-cell volume')
+        volume = float(VOLUME_RE.search(mm, volume_at).group(1)) * BOHR ** 3 if volume_at != -1 else None
+        match = NAT_RE.search(mm)
+        natoms = int(match.group(1)) if match else None
+
+        stress = None
+        stress_at = mm.rfind(STRESS_KEY)
+        if stress_at != -1:
+            rows = mm[stress_at:stress_at + 512].split(b'\n')[1:4]
+            try:
+                # Ry/bohr^3 columns; pw.x prints the negative of the stress
+                stress = -np.array([[float(value) for value in row.split()[:3]] for row in rows]) * RY / BOHR ** 3 * EV_A3_TO_GPA
+            except ValueError:
+                stress = None
+            if stress is not None and stress.shape != (3, 3):
+                stress = None
+    return {'energy': energy, 'stress': stress, 'volume': volume, 'natoms': natoms}
+
+
+def find_manifests(paths):
+    """
+    Expand directories into the strain manifests they contain.
+    """
+    manifests = []
+    for path in paths:
+        if os.path.isdir(path):
+            manifests.extend(sorted(glob.glob(os.path.join(path, '*.strain.json'))))
+        else:
+            manifests.append(path)
+    return manifests
+
+
+def collect(manifest_paths):
+    """
+    Read the pw.x outputs of strain sweeps, grouped into materials.
+
+    Parameters:
+        manifest_paths (list): Strain manifests written by gen_strain.strain_sweep.
+
+    Returns:
+        list: One dictionary per material: 'name', 'formula', 'natoms',
+        'labels', 'strains' (n x 3 x 3), 'energies' (eV), 'volumes'
+        (Angstrom^3) and 'stresses' (n x 3 x 3, GPa); runs without output
+        have NaN energies and stresses, and are listed in 'missing'.
+    """
+    materials = {}
+    for manifest_path in manifest_paths:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        key = (manifest['system'], manifest['poscar'])
+        material = materials.setdefault(key, {'name': manifest['system'], 'formula': manifest['formula'], 'natoms': manifest['natoms'],
+                                              'labels': [], 'strains': [], 'energies': [], 'volumes': [], 'stresses': [], 'missing': [],
+                                              'read': set()})
+        directory = os.path.dirname(manifest_path)
+        for structure in manifest['structures']:
+            if structure['poscar'] in material['read']:
+                continue
+            material['read'].add(structure['poscar'])
+            name = os.path.splitext(os.path.basename(structure['poscar']))[0]
+            run = read_run(os.path.join(directory, name + '.out'))
+            material['labels'].append(structure['label'])
+            material['strains'].append(structure['strain'])
+            if run is None:
+                material['missing'].append(structure['label'])
+            material['energies'].append(np.nan if run is None else run['energy'])
+            material['volumes'].append(structure['volume'] if run is None or run['volume'] is None else run['volume'])
+            material['stresses'].append(np.full((3, 3), np.nan) if run is None or run['stress'] is None else run['stress'])
+
+    for material in materials.values():
+        del material['read']
+        for key in ('strains', 'energies', 'volumes', 'stresses'):
+            material[key] = np.array(material[key], dtype=float)
+    return list(materials.values())
+
+
+def _pad(materials, key, shape=()):
+    """
+    Stack a per-material array into (materials x longest sweep) with NaN padding.
+    """
+    length = max(len(material[key]) for material in materials)
+    padded = np.full((len(materials), length) + shape, np.nan)
+    for index, material in enumerate(materials):
+        padded[index, :len(material[key])] = material[key]
+    return padded
+
+
+def weighted_lstsq(design, values, weights, rcond=RCOND):
+    """
+    Solve many weighted linear least-squares problems at once.
+
+    Parameters:
+        design (ndarray): (m, n, k) design matrices.
+        values (ndarray): (m, n) or (m, n, r) right-hand sides.
+        weights (ndarray): (m, n) weights (0 for padding).
+        rcond (float): Relative singular value cut-off.
+
+    Returns:
+        tuple: (coefficients (m, k) or (m, k, r), minimum-norm where
+        undetermined; determined (m, k) boolean, True for coefficients fixed
+        by the data).
+    """
+    vector = values.ndim == 2
+    if vector:
+        values = values[..., None]
+    root = np.sqrt(weights)[..., None]
+    u, s, vt = np.linalg.svd(np.where(root > 0, design * root, 0.0), full_matrices=False)
+    kept = s > rcond * np.maximum(s[:, :1], np.finfo(float).tiny)
+    inverse = np.where(kept, 1.0 / np.where(kept, s, 1.0), 0.0)
+    projected = np.einsum('mnk,mnr->mkr', u, np.where(root > 0, values * root, 0.0))
+    coefficients = np.einsum('mkj,mk,mkr->mjr', vt, inverse, projected)
+    determined = np.einsum('mkj,mk->mj', vt ** 2, kept) > 1.0 - 1e-6
+    return (coefficients[..., 0] if vector else coefficients), determined
+
+
+def _quality(values, predicted, weights):
+    """
+    R^2, RMS and largest absolute residual per material (rows of values).
+    """
+    count = weights.sum(axis=1)
+    residuals = np.where(weights > 0, values - predicted, 0.0)
+    mean = (np.where(weights > 0, values, 0.0) * weights).sum(axis=1) / np.maximum(count, 1)
+    total = (np.where(weights > 0, values - mean[:, None], 0.0) ** 2 * weights).sum(axis=1)
+    squared = (residuals ** 2 * weights).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(total > 0, 1.0 - squared / total, np.nan)
+    return r2, np.sqrt(squared / np.maximum(count, 1)), np.abs(residuals).max(axis=1)
+
+
+def birch_murnaghan(volumes, e0, v0, b0, b0_prime):
+    """
+    Third-order Birch-Murnaghan energy (eV) at volumes (Angstrom^3), B0 in eV/Angstrom^3.
+    """
+    x = (v0 / volumes) ** (2.0 / 3.0)
+    return e0 + 9.0 * v0 * b0 / 16.0 * ((x - 1.0) ** 3 * b0_prime + (x - 1.0) ** 2 * (6.0 - 4.0 * x))
+
+
+def vinet(volumes, e0, v0, b0, b0_prime):
+    """
+    Vinet energy (eV) at volumes (Angstrom^3), B0 in eV/Angstrom^3.
+    """
+    eta = (volumes / v0) ** (1.0 / 3.0)
+    return e0 + 2.0 * b0 * v0 / (b0_prime - 1.0) ** 2 * (2.0 - (5.0 + 3.0 * b0_prime * (eta - 1.0) - 3.0 * eta)
+                                                         * np.exp(-1.5 * (b0_prime - 1.0) * (eta - 1.0)))
+
+
+def fit_birch_murnaghan(volumes, energies, weights):
+    """
+    Fit third-order Birch-Murnaghan equations of state by linear least squares.
+
+    E(V) is a cubic polynomial a + b t + c t^2 + d t^3 in t = (V_ref / V)^(2/3);
+    at its minimum t0, V0 = V_ref t0^(-3/2), B0 = 4 t0^2 E''(t0) / (9 V0)
+    and B0' = 4 + 2 t0 E'''(t0) / (3 E''(t0)).
+
+    Parameters:
+        volumes (ndarray): (m, n) volumes in Angstrom^3.
+        energies (ndarray): (m, n) energies in eV.
+        weights (ndarray): (m, n) weights (0 for unused runs).
+
+    Returns:
+        ndarray: (m, 4) E0 (eV), V0 (Angstrom^3), B0 (eV/Angstrom^3), B0';
+        NaN rows for materials without a minimum or with too few points.
+    """
+    count = (weights > 0).sum(axis=1)
+    reference = (np.where(weights > 0, volumes, 0.0) * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-300)
+    reference = np.where(count > 0, reference, 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(weights > 0, (reference[:, None] / volumes) ** (2.0 / 3.0), 0.0)
+    design = t[..., None] ** np.arange(4)
+    a, b, c, d = weighted_lstsq(design, np.where(weights > 0, energies, 0.0), weights)[0].T
+
+    # Stationary points b + 2c t + 3d t^2 = 0, keeping the minimum
+    with np.errstate(divide='ignore', invalid='ignore'):
+        root = np.sqrt(4.0 * c ** 2 - 12.0 * b * d)
+        cubic = np.abs(d) > 1e-12 * np.abs(c)
+        candidates = np.where(cubic[:, None], np.stack([(-2.0 * c + root) / (6.0 * d), (-2.0 * c - root) / (6.0 * d)], axis=1),
+                              (-b / (2.0 * c))[:, None])
+        curvature = 2.0 * c[:, None] + 6.0 * d[:, None] * candidates
+        t0 = np.where(curvature[:, 0] > 0, candidates[:, 0], candidates[:, 1])
+        second = 2.0 * c + 6.0 * d * t0
+        v0 = reference * t0 ** -1.5
+        e0 = a + b * t0 + c * t0 ** 2 + d * t0 ** 3
+        b0 = 4.0 * t0 ** 2 * second / (9.0 * v0)
+        b0_prime = 4.0 + 2.0 * t0 * 6.0 * d / (3.0 * second)
+    parameters = np.stack([e0, v0, b0, b0_prime], axis=1)
+    valid = (count >= MIN_EOS_POINTS) & (t0 > 0) & (second > 0) & np.all(np.isfinite(parameters), axis=1)
+    return np.where(valid[:, None], parameters, np.nan)
+
+
+def fit_vinet(volumes, energies, weights, initial):
+    """
+    Fit Vinet equations of state by Levenberg-Marquardt, all materials at once.
+
+    Parameters:
+        volumes, energies, weights (ndarray): (m, n) as for fit_birch_murnaghan.
+        initial (ndarray): (m, 4) starting parameters (Birch-Murnaghan fit).
+
+    Returns:
+        ndarray: (m, 4) E0, V0, B0, B0'; NaN rows where initial is NaN.
+    """
+    active = np.all(np.isfinite(initial), axis=1)
+    parameters = np.where(active[:, None], initial, [0.0, 1.0, 1.0, 4.0])
+    volumes = np.where(weights > 0, volumes, 1.0)
+    energies = np.where(weights > 0, energies, 0.0)
+
+    def residuals(trial):
+        with np.errstate(all='ignore'):
+            return (energies - vinet(volumes, *trial.T[..., None])) * np.sqrt(weights)
+
+    def cost(values):
+        total = (values ** 2).sum(axis=1)
+        return np.where(np.isfinite(total), total, np.inf)
+
+    current = residuals(parameters)
+    current_cost = cost(current)
+    damping = np.full(len(parameters), 1e-3)
+    for _ in range(LM_ITERATIONS):
+        # Forward-difference Jacobian of the model (minus that of the residuals)
+        steps = 1e-7 * np.maximum(np.abs(parameters), 1e-3)
+        jacobian = np.stack([(current - residuals(parameters + np.eye(4)[k] * steps[:, k:k + 1])) / steps[:, k:k + 1]
+                             for k in range(4)], axis=-1)
+        normal = np.einsum('mnk,mnl->mkl', jacobian, jacobian)
+        gradient = np.einsum('mnk,mn->mk', jacobian, current)
+        diagonal = np.einsum('mkk->mk', normal)
+        system = normal + damping[:, None, None] * np.eye(4) * np.maximum(diagonal, 1e-300)[:, :, None]
+        usable = active & np.all(np.isfinite(system), axis=(1, 2)) & np.all(np.isfinite(gradient), axis=1)
+        system = np.where(usable[:, None, None], system, np.eye(4))
+        gradient = np.where(usable[:, None], gradient, 0.0)
+        try:
+            step = np.linalg.solve(system, gradient[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            step = np.einsum('mkl,ml->mk', np.linalg.pinv(system), gradient)
+        trial = parameters + step
+        trial_residuals = residuals(trial)
+        trial_cost = cost(trial_residuals)
+        better = active & (trial_cost < current_cost)
+        change = np.where(better, (current_cost - trial_cost) / np.maximum(current_cost, 1e-300), 0.0)
+        parameters = np.where(better[:, None], trial, parameters)
+        current = np.where(better[:, None], trial_residuals, current)
+        current_cost = np.where(better, trial_cost, current_cost)
+        damping = np.where(better, damping * 0.3, damping * 10.0)
+        if not np.any(active & ((better & (change > LM_TOL)) | (~better & (damping < 1e10)))):
+            break
+    return np.where(active[:, None], parameters, np.nan)
+
+
+def fit_elastic(strains, stresses, weights):
+    """
+    Fit sigma = sigma_0 + C epsilon (Voigt notation) for many materials at once.
+
+    Parameters:
+        strains (ndarray): (m, n, 3, 3) strain tensors.
+        stresses (ndarray): (m, n, 3, 3) stresses in GPa.
+        weights (ndarray): (m, n) weights (0 for runs without stress).
+
+    Returns:
+        tuple: (C (m, 6, 6) in GPa, symmetrised, NaN where undetermined;
+        residual stresses sigma_0 (m, 6); fitted stresses (m, n, 6)).
+    """
+    epsilon = np.where(weights[..., None] > 0, tensor_to_voigt(np.nan_to_num(strains)), 0.0)
+    sigma = np.where(weights[..., None] > 0, tensor_to_voigt(np.nan_to_num(stresses), engineering=False), 0.0)
+    design = np.concatenate([np.ones(epsilon.shape[:-1] + (1,)), epsilon], axis=-1)
+    coefficients, determined = weighted_lstsq(design, sigma, weights)
+
+    # C_ij = d sigma_i / d epsilon_j, known for the determined strain components j
+    elastic = np.where(determined[:, None, 1:], coefficients[:, 1:, :].transpose(0, 2, 1), np.nan)
+    transposed = elastic.transpose(0, 2, 1)
+    symmetric = np.where(np.isnan(elastic), transposed, np.where(np.isnan(transposed), elastic, (elastic + transposed) / 2.0))
+    return symmetric, coefficients[:, 0, :], np.einsum('mnk,mkr->mnr', design, coefficients)
+
+
+@timed
+def fit_materials(manifest_paths):
+    """
+    Fit the equations of state and elastic tensors of the materials of strain sweeps.
+
+    Parameters:
+        manifest_paths (list): Strain manifests (or directories holding them).
+
+    Returns:
+        list: One JSON-serialisable dictionary of results per material.
+    """
+    materials = collect(find_manifests(manifest_paths))
+    if not materials:
+        return []
+    strains = _pad(materials, 'strains', (3, 3))
+    energies = _pad(materials, 'energies')
+    volumes = _pad(materials, 'volumes')
+    stresses = _pad(materials, 'stresses', (3, 3))
+    natoms = np.array([material['natoms'] for material in materials], dtype=float)
+
+    # Equations of state from the hydrostatic runs
+    diagonal = np.einsum('mnii->mn', np.nan_to_num(strains)) / 3.0
+    hydrostatic = np.all(np.abs(np.nan_to_num(strains) - diagonal[..., None, None] * np.eye(3)) < HYDROSTATIC_TOL, axis=(2, 3))
+    eos_weights = (hydrostatic & np.isfinite(energies) & np.isfinite(volumes)).astype(float)
+    eos = {'birch_murnaghan': fit_birch_murnaghan(volumes, energies, eos_weights)}
+    eos['vinet'] = fit_vinet(volumes, energies, eos_weights, eos['birch_murnaghan'])
+    lowest = np.where(eos_weights > 0, volumes, np.inf).min(axis=1)
+    highest = np.where(eos_weights > 0, volumes, -np.inf).max(axis=1)
+    eos_quality = {}
+    for model, function in (('birch_murnaghan', birch_murnaghan), ('vinet', vinet)):
+        with np.errstate(all='ignore'):
+            predicted = function(np.nan_to_num(volumes, nan=1.0), *eos[model].T[..., None])
+        eos_quality[model] = _quality(np.nan_to_num(energies), predicted, eos_weights)
+
+    # Elastic tensors from all runs with a stress
+    stress_weights = np.all(np.isfinite(stresses), axis=(2, 3)).astype(float)
+    elastic, residual_stress, fitted = fit_elastic(strains, stresses, stress_weights)
+    voigt_stresses = tensor_to_voigt(np.nan_to_num(stresses), engineering=False)
+    repeated = np.repeat(stress_weights, 6, axis=1)
+    elastic_quality = _quality(voigt_stresses.reshape(len(materials), -1), fitted.reshape(len(materials), -1), repeated)
+
+    results = []
+    for index, material in enumerate(materials):
+        result = {'name': material['name'], 'formula': material['formula'], 'natoms': material['natoms'],
+                  'runs': len(material['labels']), 'missing': material['missing']}
+        result['eos'] = {'points': int(eos_weights[index].sum()), 'volume_range': [_number(lowest[index]), _number(highest[index])]}
+        for model in EOS_MODELS:
+            e0, v0, b0, b0_prime = eos[model][index]
+            r2, rms, largest = (values[index] for values in eos_quality[model])
+            result['eos'][model] = {'E0': _number(e0), 'V0': _number(v0), 'B0': _number(b0 * EV_A3_TO_GPA), 'B0_prime': _number(b0_prime),
+                                    'r2': _number(r2), 'rms_mev_per_atom': _number(rms * 1000.0 / natoms[index]),
+                                    'max_residual_mev_per_atom': _number(largest * 1000.0 / natoms[index]),
+                                    'in_range': bool(lowest[index] <= v0 <= highest[index])}
+        c = elastic[index]
+        bulk = (c[0, 0] + c[1, 1] + c[2, 2] + 2.0 * (c[0, 1] + c[0, 2] + c[1, 2])) / 9.0
+        shear = (c[0, 0] + c[1, 1] + c[2, 2] - c[0, 1] - c[0, 2] - c[1, 2] + 3.0 * (c[3, 3] + c[4, 4] + c[5, 5])) / 15.0
+        result['elastic'] = {'points': int(stress_weights[index].sum()), 'C': [[_number(value) for value in row] for row in c],
+                             'residual_stress': [_number(value) for value in residual_stress[index]],
+                             'bulk_modulus_voigt': _number(bulk), 'shear_modulus_voigt': _number(shear),
+                             'r2': _number(elastic_quality[0][index]), 'rms_gpa': _number(elastic_quality[1][index]),
+                             'max_residual_gpa': _number(elastic_quality[2][index])}
+        results.append(result)
+    return results
+
+
+def _number(value):
+    """
+    A float for JSON, None for NaN.
+    """
+    return float(value) if np.isfinite(value) else None
+
+
+def _format(value, spec):
+    return 'n/a' if value is None else spec.format(value)
+
+
+def main():
+    """
+    Main function to fit the strain sweeps of many materials and print a summary.
+    """
+    parser = argparse.ArgumentParser(description="Fit Birch-Murnaghan/Vinet equations of state and elastic tensors to the pw.x outputs of strain sweeps.")
+    parser.add_argument("-m", "--manifests", nargs="+", help="Strain manifests (*.strain.json) or directories holding them", metavar="Manifest", required=True)
+    parser.add_argument("-o", "--output", help="JSON file receiving the results", metavar="Output_filename")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    results = fit_materials(args.manifests)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    print("-----------------------------------------------------------")
+    for result in results:
+        bm, vinet_fit, c = result['eos']['birch_murnaghan'], result['eos']['vinet'], result['elastic']['C']
+        print("{:<36s}: {:s} ({:d} of {:d} runs read)".format(result['name'], result['formula'], result['runs'] - len(result['missing']), result['runs']))
+        print("{:<36s}: V0 {:s} A^3, B0 {:s} GPa, B0' {:s}, R^2 {:s}".format("  Birch-Murnaghan", _format(bm['V0'], '{:.3f}'), _format(bm['B0'], '{:.1f}'),
+                                                                               _format(bm['B0_prime'], '{:.2f}'), _format(bm['r2'], '{:.6f}')))
+        print("{:<36s}: V0 {:s} A^3, B0 {:s} GPa, B0' {:s}, R^2 {:s}".format("  Vinet", _format(vinet_fit['V0'], '{:.3f}'), _format(vinet_fit['B0'], '{:.1f}'),
+                                                                               _format(vinet_fit['B0_prime'], '{:.2f}'), _format(vinet_fit['r2'], '{:.6f}')))
+        print("{:<36s}: C11 {:s}, C12 {:s}, C44 {:s} GPa, R^2 {:s}".format("  Elastic", _format(c[0][0], '{:.1f}'), _format(c[0][1], '{:.1f}'),
+                                                                            _format(c[3][3], '{:.1f}'), _format(result['elastic']['r2'], '{:.6f}')))
+    print("{:<36s}: {:d}".format("Materials fitted", len(results)))
+    print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
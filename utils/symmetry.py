@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 10:02:36 PM IST 2026
+###########################################################################
+# Purpose : In-process cache of symmetry analyses, so that converting many
+#           structures, or converting and then generating band paths for
+#           the same structure, analyses each structure only once.
+###########################################################################
+#
+# pymatgen analyses (SpacegroupAnalyzer) are keyed by cache.structure_hash of
+# the POSCAR file, i.e. by the structure itself rather than the file name or
+# formatting. ASE Bravais lattices and band paths are keyed by the rounded
+# cell. Both caches live as long as the process (or pool worker) does.
+#
+# symmetry_operations finds the space-group operations with NumPy alone
+# (for structures at hand as ASE Atoms, or without pymatgen): candidate
+# rotations are the integer matrices with entries -1, 0 or 1 in a
+# Minkowski-reduced basis that preserve its metric, and candidate
+# translations map one atom of the rarest species onto the others.
+###########################################################################
+
+import argparse
+import functools
+import hashlib
+import itertools
+
+import numpy as np
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+# Default symmetry tolerance of pymatgen (Angstrom)
+SYMPREC = 0.01
+
+# Maximum number of structures kept in each cache
+CACHE_SIZE = 4096
+
+_analyzers = {}
+_operations = {}
+
+
+def get_analyzer(poscar_path, symprec=SYMPREC):
+    """
+    Return the pymatgen structure and SpacegroupAnalyzer of a POSCAR file,
+    analysing each distinct structure once per process.
+
+    Parameters:
+        poscar_path (str): Path to the POSCAR file.
+        symprec (float): Symmetry tolerance in Angstrom.
+
+    Returns:
+        tuple: (pymatgen Structure, SpacegroupAnalyzer).
+    """
+    from cache import structure_hash
+
+    key = (structure_hash(poscar_path), symprec)
+    if key not in _analyzers:
+        from pymatgen.io.vasp import Poscar
+        from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+
+        if len(_analyzers) >= CACHE_SIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            del _analyzers[next(iter(_analyzers))]
+        structure = Poscar.from_file(poscar_path).structure
+        _analyzers[key] = (structure, SpacegroupAnalyzer(structure, symprec=symprec))
+    return _analyzers[key]
+
+
+def symmetry_dataset(poscar_path, symprec=SYMPREC):
+    """
+    Summarise the symmetry of a POSCAR file.
+
+    Returns:
+        dict: 'number', 'symbol', 'point_group', 'crystal_system' and
+        'lattice_type' of the space group.
+    """
+    _, analyzer = get_analyzer(poscar_path, symprec)
+    return {
+        'number': analyzer.get_space_group_number(),
+        'symbol': analyzer.get_space_group_symbol(),
+        'point_group': analyzer.get_point_group_symbol(),
+        'crystal_system': analyzer.get_crystal_system(),
+        'lattice_type': analyzer.get_lattice_type(),
+    }
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _band_path(cell_key, eps):
+    from ase.cell import Cell
+
+    lattice = Cell(np.array(cell_key)).get_bravais_lattice(eps=eps)
+    return lattice, lattice.bandpath()
+
+
+def band_path(cell, eps=2e-4, decimals=10):
+    """
+    Return the ASE Bravais lattice and standard band path of a cell, computing
+    them once per distinct cell.
+
+    Parameters:
+        cell (ASE Cell): The unit cell.
+        eps (float): Tolerance of the lattice recognition (as in ASE).
+        decimals (int): Rounding of the cell used as cache key.
+
+    Returns:
+        tuple: (ASE BravaisLattice, ASE BandPath).
+    """
+    cell_key = tuple(map(tuple, np.round(np.asarray(cell), decimals) + 0.0))
+    return _band_path(cell_key, eps)
+
+
+def _atoms_key(atoms, symprec, decimals=6):
+    parts = (np.round(np.asarray(atoms.cell), decimals) + 0.0, np.round(atoms.get_scaled_positions(), decimals) % 1.0 + 0.0, atoms.numbers)
+    return hashlib.sha256(b''.join(np.ascontiguousarray(part).tobytes() for part in parts)).hexdigest(), symprec
+
+
+def symmetry_operations(atoms, symprec=SYMPREC):
+    """
+    Return the space-group operations of a structure, computing them once per
+    distinct structure.
+
+    Parameters:
+        atoms (ASE Atoms): Periodic structure (a unit cell: the cost grows as
+            the cube of the number of atoms).
+        symprec (float): Distance tolerance in Angstrom.
+
+    Returns:
+        tuple: (rotations, permutations). Rotation k (3 x 3 integers) acts on
+        the fractional coordinates of atoms.cell, x' = W x; with its
+        translation it moves atom i onto atom permutations[k, i].
+    """
+    from ase.geometry import minkowski_reduce
+
+    key = _atoms_key(atoms, symprec)
+    if key in _operations:
+        return _operations[key]
+
+    cell, reduction = minkowski_reduce(np.asarray(atoms.cell))
+    fractional = np.linalg.solve(cell.T, atoms.positions.T).T % 1.0
+    numbers = atoms.numbers
+    metric = cell @ cell.T
+
+    # Integer rotations (fractional coordinates, x' = W x) preserving the metric
+    candidates = np.array(list(itertools.product((-1, 0, 1), repeat=9))).reshape(-1, 3, 3)
+    candidates = candidates[np.abs(np.round(np.linalg.det(candidates))) == 1]
+    metric_tol = 2.0 * symprec * np.sqrt(np.max(np.diag(metric)))
+    rotations = candidates[np.all(np.abs(np.einsum('nji,jk,nkl->nil', candidates, metric, candidates) - metric) < metric_tol, axis=(1, 2))]
+
+    species, counts = np.unique(numbers, return_counts=True)
+    anchors = np.flatnonzero(numbers == species[np.argmin(counts)])
+    other_species = numbers[:, None] != numbers[None, :]
+    found_rotations, permutations = [], []
+    for rotation in rotations:
+        rotated = fractional @ rotation.T
+        for translation in fractional[anchors] - rotated[anchors[0]]:
+            delta = (rotated + translation)[:, None, :] - fractional[None, :, :]
+            delta -= np.round(delta)
+            distances = np.linalg.norm(delta @ cell, axis=-1)
+            distances[other_species] = np.inf
+            partners = np.argmin(distances, axis=1)
+            if np.all(distances[np.arange(len(numbers)), partners] < symprec) and len(np.unique(partners)) == len(numbers):
+                found_rotations.append(rotation)
+                permutations.append(partners)
+
+    # Back to the fractional coordinates of the original cell (x = P^T x_reduced)
+    back = reduction.T
+    found_rotations = np.rint(back @ np.array(found_rotations) @ np.linalg.inv(back)).astype(int)
+
+    if len(_operations) >= CACHE_SIZE:
+        del _operations[next(iter(_operations))]
+    _operations[key] = (found_rotations, np.array(permutations))
+    return _operations[key]
+
+
+def equivalent_atoms(atoms, symprec=SYMPREC):
+    """
+    Return, for every atom, the lowest index of the atoms symmetry-equivalent to it
+    (as spglib's 'equivalent_atoms').
+    """
+    return symmetry_operations(atoms, symprec)[1].min(axis=0)
+
+
+def clear():
+    """
+    Empty all caches.
+    """
+    _analyzers.clear()
+    _operations.clear()
+    _band_path.cache_clear()
+
+
+def main():
+    """
+    Main function to print the symmetry of POSCAR files.
+    """
+    parser = argparse.ArgumentParser(description="Print the space group of POSCAR files.")
+    parser.add_argument("-p", "--poscars", nargs="+", help="Paths to the POSCAR files", metavar="POSCAR", required=True)
+    parser.add_argument("-s", "--symprec", type=float, default=SYMPREC, help="Symmetry tolerance in Angstrom (default: %(default)s)")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    print("-----------------------------------------------------------")
+    for poscar_path in args.poscars:
+        dataset = symmetry_dataset(poscar_path, args.symprec)
+        print("{:<36s}: {:s} ({:d}), {:s}".format(poscar_path, dataset['symbol'], dataset['number'], dataset['crystal_system']))
+    print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
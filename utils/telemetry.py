@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 11:20:47 PM IST 2026
+###########################################################################
+# Purpose : Timing and resource telemetry of pwtk generator calls and of
+#           the Quantum Espresso binaries launched by the workflows, written
+#           as JSON lines and summarised per stage.
+###########################################################################
+#
+# Telemetry is off unless $PWTK_TELEMETRY names a log file (or configure()
+# is called). Every record is one JSON object on one line, appended with a
+# single write, so concurrent processes can share a log:
+#
+#   kind 'generator': a decorated pwtk function (see timed), with its wall
+#       and CPU time, the peak RSS of the process and the size of the input
+#       files it was given;
+#   kind 'binary': a Quantum Espresso run of a workflow, with its wall time,
+#       cores, CPU time and peak RSS of the launched process tree (when it
+#       was reaped locally), file sizes, exit status and the CPU/WALL times
+#       printed by the program itself (e.g. 'PWSCF : 1m2.3s CPU 1m4.5s WALL').
+#
+# The peak RSS the kernel reports for a child starts from the RSS it
+# inherits at fork, i.e. that of the pwtk process. A run peaking no higher
+# than the pwtk process has no 'max_rss' but a 'max_rss_bound' (an upper
+# bound of its peak).
+###########################################################################
+
+import argparse
+import functools
+import json
+import os
+import re
+import socket
+import time
+
+try:
+    import resource
+except ImportError:     # not available on Windows
+    resource = None
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+TELEMETRY_ENV = 'PWTK_TELEMETRY'
+
+# Closing timing line of a Quantum Espresso program (per-routine lines end
+# with '(N calls)' instead)
+QE_TIMING_RE = re.compile(rb"^\s*([A-Z][A-Z0-9_]*)\s*:\s*(.+?)\s+CPU\s+(.+?)\s+WALL\s*$", re.MULTILINE)
+QE_TIME_RE = re.compile(r"(\d+(?:\.\d*)?)\s*([dhms])")
+QE_TIME_UNITS = {'d': 86400.0, 'h': 3600.0, 'm': 60.0, 's': 1.0}
+
+# Bytes read from the end of an output file to find its timing line
+TAIL_BYTES = 16384
+
+
+def configure(log_path):
+    """
+    Send telemetry of this process and its children to a log file (None: off).
+    """
+    if log_path:
+        os.environ[TELEMETRY_ENV] = os.path.abspath(log_path)
+    else:
+        os.environ.pop(TELEMETRY_ENV, None)
+
+
+def log_path():
+    return os.environ.get(TELEMETRY_ENV) or None
+
+
+def record(entry):
+    """
+    Append one record to the telemetry log, if telemetry is on.
+    """
+    path = log_path()
+    if path is None:
+        return
+    entry = dict(entry, host=socket.gethostname(), pid=os.getpid(), time=time.time())
+    line = json.dumps(entry) + '\n'
+    with open(path, 'a') as f:
+        f.write(line)
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return None
+
+
+def max_rss():
+    """
+    Return the peak resident set size of this process in bytes (None if unknown).
+    """
+    if resource is None:
+        return None
+    # Kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def timed(function):
+    """
+    Decorator recording the calls of a generator function.
+
+    Positional and keyword arguments naming existing files are counted as
+    its inputs. Exceptions are recorded and raised again.
+    """
+    # The module file name, also when the module runs as __main__
+    module_name = os.path.splitext(os.path.basename(function.__code__.co_filename))[0]
+    name = '{:s}.{:s}'.format(module_name, function.__name__)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if log_path() is None:
+            return function(*args, **kwargs)
+        inputs = {}
+        for value in list(args) + list(kwargs.values()):
+            if isinstance(value, str) and os.path.isfile(value):
+                inputs[value] = os.path.getsize(value)
+        start, cpu_start = time.perf_counter(), time.process_time()
+        status, error = 'done', None
+        try:
+            return function(*args, **kwargs)
+        except Exception as exception:
+            status, error = 'failed', '{:s}: {:s}'.format(type(exception).__name__, str(exception))
+            raise
+        finally:
+            record({'kind': 'generator', 'name': name, 'status': status, 'error': error,
+                    'wall_time': time.perf_counter() - start, 'cpu_time': time.process_time() - cpu_start,
+                    'max_rss': max_rss(), 'input_bytes': sum(inputs.values()), 'inputs': inputs})
+
+    return wrapper
+
+
+def parse_qe_time(text):
+    """
+    Convert a Quantum Espresso time such as '1h 2m', '3m45.67s' or '0.52s' to seconds.
+    """
+    return sum(float(value) * QE_TIME_UNITS[unit] for value, unit in QE_TIME_RE.findall(text))
+
+
+def parse_qe_timing(output_path):
+    """
+    Return the program name and the CPU and WALL times (seconds) printed at
+    the end of a Quantum Espresso output, or None if there is no such line.
+    """
+    try:
+        with open(output_path, 'rb') as f:
+            f.seek(max(0, os.path.getsize(output_path) - TAIL_BYTES))
+            tail = f.read()
+    except OSError:
+        return None
+    matches = QE_TIMING_RE.findall(tail)
+    if not matches:
+        return None
+    program, cpu, wall = matches[-1]
+    return {'program': program.decode(), 'qe_cpu_time': parse_qe_time(cpu.decode()), 'qe_wall_time': parse_qe_time(wall.decode())}
+
+
+def record_stage(stage, rusage=None, **fields):
+    """
+    Record a finished run stage of a workflow.
+
+    Parameters:
+        stage (workflow.Stage): The stage, with its status and times set.
+        rusage (resource.struct_rusage): Resource usage of the reaped
+            launcher process (None when the run was not a local child);
+            its peak RSS is only kept when above that of this process.
+        **fields: Values replacing those taken from the stage.
+    """
+    if log_path() is None:
+        return
+    entry = {'kind': 'binary', 'name': stage.name, 'binary': stage.binary, 'status': stage.status, 'returncode': stage.returncode,
+             'cores': stage.cores, 'wall_time': stage.wall_time, 'cpu_time': None, 'max_rss': None,
+             'input_bytes': file_size(stage.input_path), 'output_bytes': file_size(stage.output_path)}
+    if rusage is not None:
+        entry['cpu_time'] = rusage.ru_utime + rusage.ru_stime
+        entry['max_rss'] = rusage.ru_maxrss * 1024
+        if entry['max_rss'] <= (max_rss() or 0):
+            # Not above what the child inherited at fork (see the top of this file)
+            entry['max_rss_bound'] = entry.pop('max_rss')
+            entry['max_rss'] = None
+    entry.update(fields)
+    entry.update(parse_qe_timing(stage.output_path) or {})
+    record(entry)
+
+
+def read_log(path):
+    """
+    Read a telemetry log, skipping incomplete lines.
+
+    Returns:
+        list: Records (dictionaries).
+    """
+    entries = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def summarize(entries, key='name'):
+    """
+    Aggregate records per value of a key.
+
+    Returns:
+        dict: key value -> 'count', 'failed', 'total_wall_time', 'mean_wall_time',
+        'max_wall_time', 'total_cpu_time' and 'max_rss' (largest seen).
+    """
+    summary = {}
+    for entry in entries:
+        group = summary.setdefault(str(entry.get(key)), {'count': 0, 'failed': 0, 'total_wall_time': 0.0, 'max_wall_time': 0.0,
+                                                         'total_cpu_time': 0.0, 'max_rss': 0})
+        wall_time = entry.get('wall_time') or entry.get('qe_wall_time') or 0.0
+        group['count'] += 1
+        group['failed'] += entry.get('status') != 'done'
+        group['total_wall_time'] += wall_time
+        group['max_wall_time'] = max(group['max_wall_time'], wall_time)
+        group['total_cpu_time'] += entry.get('cpu_time') or 0.0
+        group['max_rss'] = max(group['max_rss'], entry.get('max_rss') or 0)
+    for group in summary.values():
+        group['mean_wall_time'] = group['total_wall_time'] / group['count']
+    return summary
+
+
+def main():
+    """
+    Main function to summarise telemetry logs.
+    """
+    parser = argparse.ArgumentParser(description="Summarise pwtk telemetry logs (JSON lines), slowest stages first.")
+    parser.add_argument("-l", "--logs", nargs="+", help="Telemetry log files", metavar="Log_filename", required=True)
+    parser.add_argument("-g", "--group-by", default='name', help="Record field to group by, e.g. name, binary, kind or host (default: name)")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    entries = []
+    for path in args.logs:
+        entries.extend(read_log(path))
+    summary = summarize(entries, args.group_by)
+
+    print("-----------------------------------------------------------")
+    print("{:<32s} {:>7s} {:>6s} {:>12s} {:>10s} {:>10s} {:>9s}".format(args.group_by, 'count', 'failed', 'total wall', 'mean wall', 'total cpu', 'max RSS'))
+    for name, group in sorted(summary.items(), key=lambda item: -item[1]['total_wall_time']):
+        print("{:<32s} {:>7d} {:>6d} {:>11.1f}s {:>9.2f}s {:>9.1f}s {:>6.0f} MB".format(
+            name, group['count'], group['failed'], group['total_wall_time'], group['mean_wall_time'], group['total_cpu_time'], group['max_rss'] / 1e6))
+    print("-----------------------------------------------------------")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sun Oct 18 04:47:09 AM IST 2026
+###########################################################################
+# Purpose : Start pw.x runs from the charge density and wavefunctions of an
+#           already converged neighbouring run (startingpot/startingwfc =
+#           'file'), e.g. the points of a strain sweep, falling back to a
+#           start from scratch when that is not safe.
+###########################################################################
+#
+# gen_strain.py --warm-start writes every input but the smallest strain
+# with startingwfc/startingpot = 'file', and records in the manifest the
+# structure it starts from: the nearest strain (Frobenius norm) among those
+# closer to zero strain, so a sweep runs outwards from the unstrained point
+# as a tree. Each run keeps its own outdir; before it starts, the save
+# directory of its seed is copied into it (a copy, not a link: pw.x
+# rewrites the files of its save directory in place).
+#
+# The run falls back to pw.x's default start (the starting* settings are
+# removed from its input) when the seed did not converge or has no save
+# directory, or when the two runs would not use the same dense FFT grid,
+# since files written on another grid cannot be read back. gen_strain.py
+# --warm-start pins nr1, nr2 and nr3 to the grid of the largest strained
+# cell, so that a sweep shares one grid; inputs without them are compared
+# by their estimated grid (parallel.fft_grid). relax.py applies the same
+# grid check to its vc-relax restarts. The number of runs started each way
+# is reported at the end of a sweep.
+###########################################################################
+
+import argparse
+import json
+import mmap
+import os
+import re
+import shutil
+import sys
+
+import numpy as np
+
+from workflow import DEFAULT_LAUNCHER, FAKE_BINARIES, FAKE_LAUNCHER, Stage, Workflow
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+# &ELECTRONS settings of a run started from its seed
+WARM_START = {'startingwfc': 'file', 'startingpot': 'file'}
+
+STARTING_RE = re.compile(r"^\s*(?:startingwfc|startingpot)\s*=.*\n", re.IGNORECASE | re.MULTILINE)
+
+
+def seed_tree(strains):
+    """
+    Choose the seed of every point of a sweep.
+
+    Points are taken by increasing strain (Frobenius norm); each one starts
+    from the nearest point taken before it.
+
+    Parameters:
+        strains (array): (N, 3, 3) strain tensors.
+
+    Returns:
+        list: Index of the seed of every point, None for the first one.
+    """
+    strains = np.asarray(strains, dtype=float).reshape(len(strains), -1)
+    order = np.lexsort((np.arange(len(strains)), np.linalg.norm(strains, axis=1)))
+    distances = np.linalg.norm(strains[:, None, :] - strains[None, :, :], axis=-1)
+    seeds = [None] * len(strains)
+    for position, index in enumerate(order[1:], start=1):
+        earlier = order[:position]
+        seeds[index] = int(earlier[np.argmin(distances[index, earlier])])
+    return seeds
+
+
+def read_input(pwi_path):
+    """
+    Return the namelists and the structure of a pw.x input.
+    """
+    import f90nml
+    from ase.io import read
+
+    return f90nml.read(pwi_path), read(pwi_path, format='espresso-in')
+
+
+def input_fft_grid(pwi_path):
+    """
+    Return the dense FFT grid a pw.x input would use: its nr1, nr2 and nr3,
+    else the estimate of parallel.fft_grid.
+    """
+    from parallel import fft_grid
+
+    namelists, atoms = read_input(pwi_path)
+    system = namelists['system']
+    if all(system.get(key) for key in ('nr1', 'nr2', 'nr3')):
+        return [int(system[key]) for key in ('nr1', 'nr2', 'nr3')]
+    return fft_grid(atoms.cell, float(system.get('ecutrho') or 4.0 * float(system['ecutwfc'])))
+
+
+def save_dir(pwi_path, workdir):
+    """
+    Return the save directory (<outdir>/<prefix>.save) of a pw.x input run in workdir.
+    """
+    import f90nml
+
+    control = f90nml.read(pwi_path).get('control', {})
+    return os.path.join(workdir, control.get('outdir', './'), control.get('prefix', 'pwscf') + '.save')
+
+
+def converged(pwo_path):
+    """
+    Tell whether a pw.x output finished with a converged SCF.
+    """
+    if not os.path.exists(pwo_path) or os.path.getsize(pwo_path) == 0:
+        return False
+    with open(pwo_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm.rfind(b'JOB DONE.') != -1 and mm.find(b'convergence NOT achieved') == -1
+
+
+def cold_start(pwi_path):
+    """
+    Remove startingwfc/startingpot from a pw.x input (pw.x's default start).
+    """
+    with open(pwi_path, 'r') as f:
+        text = f.read()
+    with open(pwi_path, 'w') as f:
+        f.write(STARTING_RE.sub('', text))
+
+
+def seed(seed_pwi, seed_pwo, pwi_path, workdir):
+    """
+    Prepare a run to start from its seed, or from scratch when that is not safe.
+
+    Parameters:
+        seed_pwi (str): Input of the seed run.
+        seed_pwo (str): Output of the seed run.
+        pwi_path (str): Input of the run, written with WARM_START.
+        workdir (str): Working directory of both runs.
+
+    Returns:
+        tuple: (warm start flag, reason of the fallback or None).
+    """
+    source = save_dir(seed_pwi, workdir)
+    reason = None
+    if not converged(seed_pwo):
+        reason = "seed {:s} did not converge".format(os.path.basename(seed_pwo))
+    elif not os.path.isdir(source):
+        reason = "no save directory {:s}".format(source)
+    else:
+        seed_grid, grid = input_fft_grid(seed_pwi), input_fft_grid(pwi_path)
+        if seed_grid != grid:
+            reason = "FFT grids differ ({:s} and {:s})".format('x'.join(map(str, seed_grid)), 'x'.join(map(str, grid)))
+    if reason is None:
+        try:
+            shutil.copytree(source, save_dir(pwi_path, workdir), dirs_exist_ok=True)
+            return True, None
+        except OSError as error:
+            reason = "copying {:s} failed ({:s})".format(source, str(error))
+    cold_start(pwi_path)
+    return False, reason
+
+
+def sweep_workflow(manifest_path, **workflow_options):
+    """
+    Build the workflow running the pw.x inputs of a strain sweep.
+
+    Structures with a seed in the manifest (gen_strain.py --warm-start) run
+    after it, starting from its save directory when seed() allows; the
+    others run independently.
+
+    Parameters:
+        manifest_path (str): Strain manifest written by gen_strain.strain_sweep.
+        **workflow_options: Passed on to Workflow.
+
+    Returns:
+        tuple: (Workflow ready to run, dict counting the 'warm' and 'cold'
+        starts of the seeded runs as they are prepared).
+    """
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    workdir = os.path.dirname(os.path.abspath(manifest_path))
+    workflow = Workflow(workdir=workdir, **workflow_options)
+    starts = {'warm': 0, 'cold': 0}
+
+    structures = {structure['label']: structure for structure in manifest['structures']}
+
+    def name(label):
+        return os.path.splitext(os.path.basename(structures[label]['pwi']))[0]
+
+    def files(label):
+        pwi_path = os.path.join(workdir, os.path.basename(structures[label]['pwi']))
+        return pwi_path, pwi_path[:-len('.in')] + '.out'
+
+    def start(label):
+        seed_label = structures[label]['seed']
+
+        def action():
+            warm, reason = seed(*files(seed_label), files(label)[0], workdir)
+            starts['warm' if warm else 'cold'] += 1
+            print("  {:s}: {:s}".format(name(label), "starts from " + name(seed_label) if warm else "starts from scratch, " + reason))
+        return action
+
+    for label, structure in structures.items():
+        if structure['pwi'] is None:
+            raise ValueError("{:s} has no pw.x inputs (run gen_strain.py with a template)".format(manifest_path))
+        pwi_path, pwo_path = files(label)
+        depends = []
+        if structure.get('seed') is not None:
+            workflow.add(Stage('seed_' + name(label), action=start(label), after=[name(structure['seed'])]))
+            depends = ['seed_' + name(label)]
+        workflow.add(Stage(name(label), binary='pw.x', input_path=pwi_path, output_path=pwo_path, depends=depends))
+    return workflow, starts
+
+
+def main():
+    """
+    Main function to run the pw.x inputs of strain sweeps.
+    """
+    parser = argparse.ArgumentParser(description="Run the pw.x inputs of strain sweeps, starting each from the converged run of its nearest neighbour.")
+    parser.add_argument("-m", "--manifests", nargs="+", help="Strain manifests (*.strain.json) written by gen_strain.py", metavar="Manifest", required=True)
+    parser.add_argument("-n", "--cores", type=int, default=4, help="Core budget shared by concurrent runs (default: 4)")
+    parser.add_argument("-l", "--launcher", default=DEFAULT_LAUNCHER, help="Launch command with {cores} and {binary} fields (default: '%(default)s')")
+    parser.add_argument("--plan", action="store_true", help="Launch pw.x with the ranks, k-point pools and diagonalization group planned for its cores (see parallel.py)")
+    parser.add_argument("--fake", action="store_true", help="Replace Quantum Espresso by fake_qe.py")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    launcher, binaries = (FAKE_LAUNCHER, FAKE_BINARIES) if args.fake else (args.launcher, None)
+    failed = 0
+    total = {'warm': 0, 'cold': 0}
+    for manifest_path in args.manifests:
+        print("-----------------------------------------------------------")
+        print("{:<36s}: {:s}".format("Strain sweep", manifest_path))
+        workflow, starts = sweep_workflow(manifest_path, total_cores=args.cores, launcher=launcher, binaries=binaries, plan=args.plan)
+        statuses = workflow.run()
+        failed += sum(status != 'done' for status in statuses.values())
+        print("{:<36s}: {:d} warm, {:d} from scratch".format("Seeded runs", starts['warm'], starts['cold']))
+        for key in total:
+            total[key] += starts[key]
+    print("-----------------------------------------------------------")
+    print("{:<36s}: {:d} of {:d}".format("Runs started from a neighbour", total['warm'], total['warm'] + total['cold']))
+    print("{:<36s}: {:d}".format("Stages not done", failed))
+    print("-----------------------------------------------------------")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+#!/usr/bin/env python
+###########################################################################
+# VERSION = '1.0.0'
+# Author : Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+# Written on Sat Oct 17 12:41:37 PM IST 2026
+###########################################################################
+# Purpose : This script runs the vc-relax -> SCF -> BANDS/DOS/PDOS pipeline
+#           as a dependency graph, running independent stages concurrently
+#           within a fixed core budget.
+###########################################################################
+
+import argparse
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+
+import telemetry
+
+VERSION = '1.0.0'
+AUTHOR = 'Rajesh Prashanth A <rajeshprasanth@rediffmail.com>'
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Command used to launch a Quantum Espresso binary on a number of cores
+DEFAULT_LAUNCHER = 'mpirun -np {cores} {binary}'
+
+# Launcher and binaries that replace Quantum Espresso by fake_qe.py
+FAKE_LAUNCHER = '{binary}'
+FAKE_BINARIES = {name: '{:s} {:s} {:s}'.format(shlex.quote(sys.executable), shlex.quote(os.path.join(UTILS_DIR, 'fake_qe.py')), name)
+                 for name in ('pw.x', 'bands.x', 'dos.x', 'projwfc.x')}
+
+
+class Stage:
+    """
+    One node of a workflow: a Quantum Espresso run or an in-process Python action.
+
+    A run stage has a binary, an input file fed on stdin and an output file
+    receiving stdout/stderr. An action stage calls a Python function and
+    does not hold any cores.
+
+    Parameters:
+        name (str): Unique name of the stage.
+        binary (str): Quantum Espresso binary, e.g. 'pw.x'.
+        input_path (str): Input file of the binary.
+        output_path (str): Output file of the binary.
+        action (callable): Python function run instead of a binary.
+        depends (list): Names of the stages that must be done first.
+        after (list): Names of the stages that must have finished first,
+            whether done, failed or skipped (ordering only).
+        min_cores (int): Smallest core count the stage may be started with.
+        max_cores (int): Largest useful core count (default: no limit).
+        inputs (list): Further files the stage reads (checked on resume).
+        outputs (list): Further files the stage writes (checked on resume).
+    """
+
+    def __init__(self, name, binary=None, input_path=None, output_path=None, action=None, depends=(), min_cores=1, max_cores=None, inputs=(), outputs=(), after=()):
+        if (binary is None) == (action is None):
+            raise ValueError("Stage '{:s}' needs exactly one of binary or action".format(name))
+        self.name = name
+        self.binary = binary
+        self.input_path = input_path
+        self.output_path = output_path
+        self.action = action
+        self.depends = list(depends)
+        self.after = list(after)
+        self.min_cores = min_cores
+        self.max_cores = max_cores
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.status = 'pending'
+        self.cores = 0
+        self.returncode = None
+        self.error = None
+        self.start_time = None
+        self.end_time = None
+
+    @property
+    def wall_time(self):
+        if self.start_time is None or self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+
+class Workflow:
+    """
+    Dependency graph of stages scheduled against a core budget.
+
+    Whenever cores are free, all stages whose dependencies are done are
+    started, the free cores being split evenly between them. A failed stage
+    marks every stage depending on it as skipped; independent branches keep
+    running.
+
+    Parameters:
+        total_cores (int): Core budget shared by the concurrent runs.
+        launcher (str): Launch command with {cores} and {binary} fields.
+        binaries (dict): Binary name -> command, e.g. {'pw.x': '/opt/qe/bin/pw.x'}.
+        workdir (str): Working directory of the launched binaries.
+        poll_interval (float): Seconds between checks of running binaries.
+        cache (cache.Cache): Skip runs recorded there as completed with the
+            same input and an unchanged output file (default: no cache).
+        force (bool): Run every stage even if the cache or the checkpoint
+            file has it as completed.
+        executor (callable): Hand the run stages to this executor (see
+            executors.py) in waves of ready stages, instead of launching them
+            here; e.g. to submit them as array jobs.
+        state (state.StateStore): Checkpoint file recording every finished
+            stage; stages it has as completed are not run again, unless a
+            stage they depend on ran after them (default: no checkpoint).
+        plan (bool): Launch pw.x runs with the ranks, k-point pools and
+            diagonalization group planned by parallel.py for their cores.
+    """
+
+    def __init__(self, total_cores=4, launcher=DEFAULT_LAUNCHER, binaries=None, workdir='.', poll_interval=0.5, cache=None, force=False, executor=None, state=None, plan=False):
+        self.total_cores = total_cores
+        self.launcher = launcher
+        self.binaries = dict(binaries or {})
+        self.workdir = workdir
+        self.poll_interval = poll_interval
+        self.cache = cache
+        self.force = force
+        self.executor = executor
+        self.state = state
+        self.plan = plan
+        self.stages = {}
+
+    def add(self, stage):
+        if stage.name in self.stages:
+            raise ValueError("Duplicate stage name '{:s}'".format(stage.name))
+        if stage.min_cores > self.total_cores:
+            raise ValueError("Stage '{:s}' needs {:d} cores, budget is {:d}".format(stage.name, stage.min_cores, self.total_cores))
+        self.stages[stage.name] = stage
+        return stage
+
+    def check(self):
+        """
+        Raise ValueError on unknown dependencies or dependency cycles.
+        """
+        for stage in self.stages.values():
+            for name in stage.depends + stage.after:
+                if name not in self.stages:
+                    raise ValueError("Stage '{:s}' depends on unknown stage '{:s}'".format(stage.name, name))
+
+        # Kahn's algorithm: whatever cannot be ordered is part of a cycle
+        remaining = {name: set(stage.depends + stage.after) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, depends in remaining.items() if not depends]
+            if not ready:
+                raise ValueError("Dependency cycle between stages: {:s}".format(', '.join(sorted(remaining))))
+            for name in ready:
+                del remaining[name]
+            for depends in remaining.values():
+                depends.difference_update(ready)
+
+    def command(self, stage, cores):
+        """
+        Return the argument list launching a stage on a number of cores.
+        """
+        binary = self.binaries.get(stage.binary, stage.binary)
+        options = []
+        if self.plan:
+            from parallel import launch_options
+            cores, options = launch_options(stage.binary, stage.input_path, cores)
+        return shlex.split(self.launcher.format(cores=cores, binary=binary)) + options
+
+    def allocate(self, ready, free_cores):
+        """
+        Split the free cores between ready run stages.
+
+        Parameters:
+            ready (list): Run stages whose dependencies are done, in order.
+            free_cores (int): Cores not used by running stages.
+
+        Returns:
+            list: (stage, cores) pairs to start now.
+        """
+        allocation = []
+        for index, stage in enumerate(ready):
+            share = free_cores // (len(ready) - index)
+            cores = max(stage.min_cores, share)
+            if stage.max_cores is not None:
+                cores = min(cores, stage.max_cores)
+            if cores > free_cores or cores < stage.min_cores:
+                continue
+            allocation.append((stage, cores))
+            free_cores -= cores
+        return allocation
+
+    def _start(self, stage, cores):
+        stage.cores = cores
+        stage.status = 'running'
+        stage.start_time = time.time()
+        with open(stage.input_path, 'r') as stdin, open(stage.output_path, 'w') as stdout:
+            process = subprocess.Popen(self.command(stage, cores), stdin=stdin, stdout=stdout, stderr=subprocess.STDOUT, cwd=self.workdir)
+        print("Started  {:<16s} {:<10s} on {:d} core(s) (pid: {:d})".format(stage.name, stage.binary, cores, process.pid))
+        return process
+
+    def _poll(self, process):
+        """
+        Reap a launched process if it has exited.
+
+        Returns:
+            tuple: (exit status, resource usage of the process and the
+            children it waited for), or None while it runs.
+        """
+        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        if pid == 0:
+            return None
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return process.returncode, rusage
+
+    def _finish(self, stage, returncode=0, error=None):
+        stage.end_time = time.time()
+        stage.returncode = returncode
+        stage.error = error
+        stage.status = 'done' if returncode == 0 and error is None else 'failed'
+        if self.state is not None:
+            self.state.record(stage)
+        print("Finished {:<16s} {:<10s} status: {:s} ({:.1f} seconds)".format(stage.name, stage.binary or 'python', stage.status, stage.wall_time))
+        if error is not None:
+            print("  {:s}".format(error))
+
+    def _run_batch(self, stages):
+        """
+        Hand ready run stages to the executor and take over their statuses.
+        """
+        start_time = time.time()
+        for stage in stages:
+            stage.status = 'running'
+            stage.start_time = start_time
+        statuses = self.executor(stages)
+        for stage in stages:
+            status = statuses.get(stage.name, 'failed')
+            if status in ('done', 'failed'):
+                self._finish(stage, returncode=0 if status == 'done' else 1)
+                if self.cache is not None and stage.status == 'done':
+                    self.cache.record_run(stage.binary, stage.input_path, stage.output_path)
+            else:
+                # Not run (dry run) or still queued: dependents cannot start
+                stage.end_time = time.time()
+                stage.status = status
+                print("Finished {:<16s} {:<10s} status: {:s}".format(stage.name, stage.binary, status))
+
+    def _skip_dependents(self):
+        changed = True
+        while changed:
+            changed = False
+            for stage in self.stages.values():
+                if stage.status == 'pending' and any(self.stages[name].status in ('failed', 'skipped') for name in stage.depends):
+                    stage.status = 'skipped'
+                    changed = True
+
+    def run(self):
+        """
+        Run all stages, honouring dependencies and the core budget.
+
+        Returns:
+            dict: Final status ('done', 'failed' or 'skipped'; with an
+            executor also 'submitted', or 'pending' behind such stages) per stage name.
+        """
+        self.check()
+        # Ready stages already looked up in the checkpoint file
+        checked = set()
+        running = {}
+        free_cores = self.total_cores
+
+        while True:
+            self._skip_dependents()
+            ready = [stage for stage in self.stages.values()
+                     if stage.status == 'pending' and all(self.stages[name].status == 'done' for name in stage.depends)
+                     and all(self.stages[name].status in ('done', 'failed', 'skipped') for name in stage.after)]
+
+            # Stages completed by an earlier, interrupted run of this workflow
+            resumed = [stage for stage in ready if self.state is not None and not self.force
+                       and stage.name not in checked and self.state.completed(stage)]
+            checked.update(stage.name for stage in ready)
+            for stage in resumed:
+                stage.status = 'done'
+                print("Resumed  {:<16s} {:<10s} (completed in an earlier run)".format(stage.name, stage.binary or 'python'))
+            if resumed:
+                continue
+
+            # Python actions are cheap and hold no cores: run them right away
+            actions = [stage for stage in ready if stage.action is not None]
+            for stage in actions:
+                stage.status = 'running'
+                stage.start_time = time.time()
+                try:
+                    stage.action()
+                    self._finish(stage)
+                except Exception as error:
+                    self._finish(stage, error='{:s}: {:s}'.format(type(error).__name__, str(error)))
+            if actions:
+                continue
+
+            # Runs completed earlier with the same input need no cores either
+            cached = [stage for stage in ready if self.cache is not None and not self.force
+                      and self.cache.run_completed(stage.binary, stage.input_path, stage.output_path)]
+            for stage in cached:
+                stage.start_time = time.time()
+                self._finish(stage)
+                print("  (completed earlier, skipped: {:s})".format(stage.output_path))
+            if cached:
+                continue
+
+            if self.executor is not None:
+                if not ready:
+                    break
+                self._run_batch(ready)
+                continue
+
+            for stage, cores in self.allocate(ready, free_cores):
+                try:
+                    running[stage.name] = self._start(stage, cores)
+                    free_cores -= cores
+                except OSError as error:
+                    self._finish(stage, error='{:s}: {:s}'.format(type(error).__name__, str(error)))
+
+            if not running:
+                if any(stage.status == 'pending' for stage in self.stages.values()):
+                    continue
+                break
+
+            time.sleep(self.poll_interval)
+            for name, process in list(running.items()):
+                result = self._poll(process)
+                if result is not None:
+                    stage = self.stages[name]
+                    self._finish(stage, returncode=result[0])
+                    telemetry.record_stage(stage, result[1])
+                    if self.cache is not None and stage.status == 'done':
+                        self.cache.record_run(stage.binary, stage.input_path, stage.output_path)
+                    free_cores += stage.cores
+                    del running[name]
+
+        return {name: stage.status for name, stage in self.stages.items()}
+
+
+def build_pipeline(poscar_path, output_dir, system_name, scf_template, vcrelax_template=None, **workflow_options):
+    """
+    Build the vc-relax -> SCF -> BANDS/DOS/PDOS workflow of one structure.
+
+    The vc-relax stage is the convergence-driven loop of relax.relax. The SCF run is shared through gen_post; its outdir is copied for the
+    bands branch and the DOS/PDOS branch so both can run at the same time.
+
+    Parameters:
+        poscar_path (str): Path to the POSCAR file.
+        output_dir (str): Directory for all inputs, outputs and outdirs.
+        system_name (str): Name of the system (prefix and outdir).
+        scf_template (str): Path to the SCF template file.
+        vcrelax_template (str): Path to the vc-relax template file. Without it
+            the POSCAR is taken as already relaxed.
+        **workflow_options: Passed on to Workflow.
+
+    Returns:
+        Workflow: The workflow, ready to run.
+    """
+    import gen_post
+
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    workflow = Workflow(workdir=output_dir, **workflow_options)
+
+    def path(suffix):
+        return os.path.join(output_dir, system_name + suffix)
+
+    def vcrelax():
+        from relax import relax
+        relaxed_poscar, converged, steps = relax(vcrelax_template, poscar_path, output_dir, system_name, cores=workflow.total_cores, launcher=workflow.launcher, binaries=workflow.binaries,
+                                                 cache=workflow.cache, force=workflow.force, executor=workflow.executor, state=workflow.state, plan=workflow.plan)
+        shutil.copyfile(relaxed_poscar, scf_poscar)
+
+    scf_poscar = os.path.abspath(poscar_path)
+    post_depends = []
+    if vcrelax_template is not None:
+        # The convergence-driven relax loop runs alone, so it gets the whole budget
+        scf_poscar = path('.vcrelax_out.poscar')
+        workflow.add(Stage('vcrelax', action=vcrelax, inputs=[poscar_path, vcrelax_template], outputs=[scf_poscar]))
+        post_depends = ['vcrelax']
+
+    paths = gen_post.get_paths(output_dir, system_name)
+    scf_outdir = os.path.join(output_dir, system_name)
+
+    def copy_outdir(branch):
+        shutil.copytree(scf_outdir, scf_outdir + gen_post.BRANCH_OUTDIRS[branch], dirs_exist_ok=True)
+
+    def out(key):
+        return paths[key][:-len('.in')] + '.out'
+
+    workflow.add(Stage('gen_post', action=lambda: gen_post.generate_input(scf_template, scf_poscar, output_dir, system_name, separate_outdirs=True), depends=post_depends,
+                       inputs=[scf_template, scf_poscar], outputs=list(paths.values())))
+    workflow.add(Stage('scf', binary='pw.x', input_path=paths['scf'], output_path=out('scf'), depends=['gen_post']))
+    workflow.add(Stage('copy_bands', action=lambda: copy_outdir('bands'), depends=['scf']))
+    workflow.add(Stage('copy_dos', action=lambda: copy_outdir('dos'), depends=['scf']))
+    workflow.add(Stage('bands_nscf', binary='pw.x', input_path=paths['bands_nscf'], output_path=out('bands_nscf'), depends=['copy_bands']))
+    workflow.add(Stage('bands', binary='bands.x', input_path=paths['bands'], output_path=out('bands'), depends=['bands_nscf']))
+    workflow.add(Stage('nscf', binary='pw.x', input_path=paths['nscf'], output_path=out('nscf'), depends=['copy_dos']))
+    workflow.add(Stage('dos', binary='dos.x', input_path=paths['dos'], output_path=out('dos'), depends=['nscf']))
+    workflow.add(Stage('pdos', binary='projwfc.x', input_path=paths['pdos'], output_path=out('pdos'), depends=['nscf']))
+    return workflow
+
+
+def main():
+    """
+    Main function to parse command line arguments and run the workflow.
+    """
+    parser = argparse.ArgumentParser(description="Run the vc-relax, SCF, BANDS, DOS and PDOS calculations of a structure as a concurrent workflow.")
+    parser.add_argument("-p", "--poscar", help="Path to the POSCAR file", metavar="POSCAR", required=True)
+    parser.add_argument("-o", "--output-dir", help="Directory for all inputs and outputs", metavar="Output_dir", required=True)
+    parser.add_argument("-sn", "--system-name", help="Name of the system (prefix and outdir)", metavar="System_name", required=True)
+    parser.add_argument("-t", "--scf-template", help="Path to the SCF template file", metavar="Template_filename", required=True)
+    parser.add_argument("-r", "--vcrelax-template", help="Path to the vc-relax template file (omit if the POSCAR is already relaxed)", metavar="Template_filename", default=None)
+    parser.add_argument("-n", "--cores", type=int, default=4, help="Total number of cores shared by the concurrent runs (default: 4)")
+    parser.add_argument("-l", "--launcher", default=None, help="Launch command with {{cores}} and {{binary}} fields (default: '{:s}', or 'srun -n {{cores}} {{binary}}' for array jobs)".format(DEFAULT_LAUNCHER))
+    parser.add_argument("-b", "--binary", action="append", default=[], metavar="NAME=COMMAND", help="Command to use for a binary, e.g. pw.x=/opt/qe/bin/pw.x (repeatable)")
+    parser.add_argument("--fake", action="store_true", help="Replace Quantum Espresso by fake_qe.py")
+    parser.add_argument("-c", "--cache", nargs="?", const="", default=None, metavar="Cache_dir", help="Skip runs that already completed with the same input (default directory: $PWTK_CACHE_DIR or ~/.cache/pwtk)")
+    parser.add_argument("-f", "--force", action="store_true", help="Rerun every stage even if the cache or the checkpoint file has it as completed")
+    parser.add_argument("--telemetry", default=None, metavar="Log_filename", help="Append timing and resource records of every run to this JSON-lines file (default: $PWTK_TELEMETRY)")
+    parser.add_argument("-s", "--state", default=None, metavar="State_filename", help="Checkpoint file used to resume an interrupted workflow (default: <output dir>/<system name>.state.json)")
+    parser.add_argument("--no-resume", action="store_true", help="Forget the checkpoint file and run every stage again")
+    parser.add_argument("--plan", action="store_true", help="Launch pw.x with the ranks, k-point pools (-nk) and diagonalization group (-nd) planned for its cores (see parallel.py)")
+    parser.add_argument("-e", "--executor", choices=['local', 'array', 'dry-run'], default=None, help="Run the stages in waves through this back end instead of the built-in scheduler")
+    parser.add_argument("--cores-per-job", type=int, default=None, help="Cores of every run with --executor (default: budget split; 4 for array jobs)")
+    parser.add_argument("--array-dir", default=None, help="Directory of the array job scripts (default: <output dir>/array)")
+    parser.add_argument("--submit-command", default='sbatch', help="Command submitting array scripts (default: %(default)s)")
+    parser.add_argument("--module", action="append", default=None, help="Environment module loaded by array scripts (repeatable, default: qe-7.3)")
+    parser.add_argument("--directive", action="append", default=[], help="Extra #SBATCH option of array scripts, e.g. --partition=short (repeatable)")
+    parser.add_argument("-v", "--version", action="version", version="%(prog)s {version}, Author: {author}".format(version=VERSION, author=AUTHOR), help="Show program's version number and author")
+    args = parser.parse_args()
+
+    launcher = args.launcher
+    binaries = {}
+    if args.fake:
+        launcher = FAKE_LAUNCHER
+        binaries.update(FAKE_BINARIES)
+    for item in args.binary:
+        name, _, command = item.partition('=')
+        binaries[name] = command
+
+    cache = None
+    if args.cache is not None:
+        from cache import Cache
+        cache = Cache(args.cache or None)
+
+    if args.telemetry:
+        telemetry.configure(args.telemetry)
+
+    from state import StateStore
+    state = StateStore(args.state or os.path.join(args.output_dir, args.system_name + '.state.json'))
+    if args.no_resume:
+        state.forget()
+
+    executor = None
+    if args.executor is not None:
+        from executors import make_executor
+        options = {'plan': args.plan}
+        if args.executor == 'array':
+            options.update({'submit_command': args.submit_command, 'directives': args.directive})
+            if args.module is not None:
+                options['modules'] = args.module
+        executor = make_executor(args.executor, os.path.abspath(args.output_dir), args.cores, args.cores_per_job, launcher, binaries,
+                                 script_dir=args.array_dir, **options)
+
+    workflow = build_pipeline(args.poscar, args.output_dir, args.system_name, args.scf_template, args.vcrelax_template, total_cores=args.cores,
+                              launcher=launcher or DEFAULT_LAUNCHER, binaries=binaries, cache=cache, force=args.force, executor=executor, state=state, plan=args.plan)
+
+    start_time = time.time()
+    print("-----------------------------------------------------------")
+    statuses = workflow.run()
+    print("-----------------------------------------------------------")
+    for name, status in statuses.items():
+        print("{:<16s}: {:s}".format(name, status))
+    print("Total time spent                    : {:.1f} seconds".format(time.time() - start_time))
+    print("-----------------------------------------------------------")
+
+    if any(status != 'done' for status in statuses.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()